@@ -1,3 +1,98 @@
-from django.contrib import admin
+import json
 
-# Register your models here.
+from django.contrib import admin, messages
+from django.core.exceptions import PermissionDenied
+from django.http import HttpResponse
+from django.shortcuts import get_object_or_404, redirect
+from django.urls import path, reverse
+from django.utils.html import format_html, format_html_join
+
+from .models import RequestProfile, Team, TeamAlias
+from .profiling import arm_profiling, armed_profiling
+
+
+@admin.register(RequestProfile)
+class RequestProfileAdmin(admin.ModelAdmin):
+    change_list_template = "admin/board/requestprofile/change_list.html"
+    list_display = ("created_at", "method", "path", "view_name", "status_code", "duration_ms", "query_count", "trigger")
+    list_filter = ("trigger", "view_name", "status_code")
+    search_fields = ("path", "view_name", "username")
+    exclude = ("collapsed_stacks", "queries")
+    readonly_fields = (
+        "method", "path", "view_name", "status_code", "username", "trigger", "duration_ms",
+        "sample_interval_ms", "sample_count", "query_count", "created_at", "stacks_link", "top_stacks", "query_list",
+    )
+
+    def has_add_permission(self, request):
+        return False
+
+    def get_urls(self):
+        return [
+            path("arm/", self.admin_site.admin_view(self.arm_view), name="board_requestprofile_arm"),
+            path(
+                "<int:profile_id>/stacks/",
+                self.admin_site.admin_view(self.stacks_view),
+                name="board_requestprofile_stacks",
+            ),
+        ] + super().get_urls()
+
+    def changelist_view(self, request, extra_context=None):
+        extra_context = {**(extra_context or {}), "armed_profiling": armed_profiling()}
+        return super().changelist_view(request, extra_context)
+
+    def arm_view(self, request):
+        if not self.has_change_permission(request):
+            raise PermissionDenied
+        if request.method == "POST":
+            prefix = request.POST.get("prefix") or "/"
+            try:
+                count = max(1, min(int(request.POST.get("count", 1)), 50))
+            except ValueError:
+                count = 1
+            arm_profiling(prefix, count)
+            messages.success(request, f"'{prefix}' 로 시작하는 다음 요청 {count}개를 프로파일합니다.")
+        return redirect("admin:board_requestprofile_changelist")
+
+    def stacks_view(self, request, profile_id):
+        if not self.has_view_permission(request):
+            raise PermissionDenied
+        profile = get_object_or_404(RequestProfile, pk=profile_id)
+        response = HttpResponse(profile.collapsed_stacks, content_type="text/plain; charset=utf-8")
+        response["Content-Disposition"] = f'attachment; filename="profile-{profile.pk}.folded"'
+        return response
+
+    @admin.display(description="collapsed stacks")
+    def stacks_link(self, obj):
+        url = reverse("admin:board_requestprofile_stacks", args=[obj.pk])
+        return format_html('<a href="{}">다운로드 (flamegraph.pl / speedscope)</a>', url)
+
+    @admin.display(description="상위 스택")
+    def top_stacks(self, obj):
+        lines = [line.rsplit(" ", 1) for line in obj.collapsed_stacks.splitlines()[:15]]
+        rows = format_html_join(
+            "", "<tr><td>{}</td><td><code>{}</code></td></tr>",
+            ((count, stack.rsplit(";", 1)[-1]) for stack, count in lines),
+        )
+        return format_html("<table>{}</table>", rows)
+
+    @admin.display(description="SQL")
+    def query_list(self, obj):
+        queries = json.loads(obj.queries or "[]")
+        rows = format_html_join(
+            "", "<tr><td>{}</td><td><code>{}</code></td></tr>",
+            ((query["ms"], query["sql"]) for query in queries),
+        )
+        return format_html("<table>{}</table>", rows)
+
+
+class TeamAliasInline(admin.TabularInline):
+    model = TeamAlias
+    extra = 1
+
+
+@admin.register(Team)
+class TeamAdmin(admin.ModelAdmin):
+    # 같은 팀의 한글/영문 표기를 별칭으로 옮겨 붙이면 시그널이 그 이름의 경기 FK 를 옮긴다.
+    list_display = ("name", "english_name", "created_at")
+    search_fields = ("name", "english_name", "aliases__name")
+    inlines = [TeamAliasInline]
@@ -0,0 +1,97 @@
+from functools import partial
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib import auth
+from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY, get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.middleware import AuthenticationMiddleware
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.utils.crypto import constant_time_compare
+from django.utils.functional import SimpleLazyObject
+from django.utils.module_loading import import_string
+
+
+USER_CACHE_TIMEOUT = getattr(settings, "BOARD_USER_CACHE_TIMEOUT", 300)
+
+
+def user_cache_key(user_id):
+    return f"board:user:{user_id}"
+
+
+def invalidate_cached_user(user_id):
+    cache.delete(user_cache_key(user_id))
+
+
+def cached_user(user_id):
+    # User 와 Profile 을 select_related 로 한 번에 읽어 캐시에 둔다. 프로필이 없는 회원도
+    # "없음" 이 함께 캐시되므로 hasattr(user, "profile") 이 다시 쿼리하지 않는다.
+    key = user_cache_key(user_id)
+    user = cache.get(key)
+    if user is None:
+        user = get_user_model().objects.select_related("profile").filter(pk=user_id).first()
+        if user is not None:
+            cache.set(key, user, USER_CACHE_TIMEOUT)
+    return user
+
+
+def _uses_model_backend(backend_path):
+    return issubclass(import_string(backend_path), ModelBackend)
+
+
+def _verify_session_hash(request, user):
+    # django.contrib.auth.get_user 와 같은 규칙으로 세션의 비밀번호 해시를 확인한다.
+    session_hash = request.session.get(HASH_SESSION_KEY)
+    session_auth_hash = user.get_session_auth_hash()
+    if session_hash and constant_time_compare(session_hash, session_auth_hash):
+        return True
+    if session_hash and any(
+        constant_time_compare(session_hash, fallback_hash)
+        for fallback_hash in user.get_session_auth_fallback_hash()
+    ):
+        request.session.cycle_key()
+        request.session[HASH_SESSION_KEY] = session_auth_hash
+        return True
+    request.session.flush()
+    return False
+
+
+def load_user(request):
+    try:
+        user_id = get_user_model()._meta.pk.to_python(request.session[SESSION_KEY])
+        backend_path = request.session[BACKEND_SESSION_KEY]
+    except KeyError:
+        return AnonymousUser()
+    if backend_path not in settings.AUTHENTICATION_BACKENDS:
+        return AnonymousUser()
+    if not _uses_model_backend(backend_path):
+        return auth.get_user(request)
+
+    user = cached_user(user_id)
+    if user is None or not user.is_active:
+        return AnonymousUser()
+    if not _verify_session_hash(request, user):
+        return AnonymousUser()
+    return user
+
+
+def get_cached_user(request):
+    if not hasattr(request, "_cached_user"):
+        request._cached_user = load_user(request)
+    return request._cached_user
+
+
+async def aget_cached_user(request):
+    if not hasattr(request, "_acached_user"):
+        request._acached_user = await sync_to_async(load_user)(request)
+    return request._acached_user
+
+
+class CachedAuthenticationMiddleware(AuthenticationMiddleware):
+    # django.contrib.auth 의 AuthenticationMiddleware 대신 사용한다. 세션이 캐시 기반
+    # (cached_db 등)이면 캐시가 따뜻한 로그인 요청은 인증 관련 쿼리를 하나도 하지 않는다.
+    def process_request(self, request):
+        super().process_request(request)
+        request.user = SimpleLazyObject(lambda: get_cached_user(request))
+        request.auser = partial(aget_cached_user, request)
@@ -0,0 +1,288 @@
+import json
+import math
+import statistics
+import time
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from .models import Comment, InfoPost, LinkPost, Post, Profile, SoccerMatch
+
+
+BENCHMARK_USERNAME = "benchmark@example.com"
+DEFAULT_LATENCY_TOLERANCE = 1.5
+
+# 데이터 양과 상관없이 요청 하나가 넘으면 안 되는 쿼리 수. 새 N+1 이 생기면 여기서 걸린다.
+QUERY_BUDGETS = {
+    "home": 3,
+    "post_list": 4,
+    "post_list_page": 4,
+    "post_search": 4,
+    "post_detail": 7,
+    "post_comments_json": 3,
+    "link_list": 4,
+    "ai_list": 4,
+    "popular_list": 2,
+    "menu4": 2,
+    "menu4_trending": 2,
+    "menu5": 7,
+    "secret_detail": 10,
+    "menu6": 4,
+    "menu7": 4,
+    "menu8": 4,
+    "menu9": 4,
+    "menu10": 4,
+    "menu11": 4,
+    "match_list": 7,
+    "match_list_results": 4,
+    "match_fragment_results": 2,
+    "match_fragment_bets": 1,
+    "match_fragment_standings": 1,
+    "team_detail": 4,
+    "head_to_head_json": 4,
+    "post_like_json": 14,
+    "info_like": 11,
+    "link_like": 4,
+    "match_like": 5,
+    "match_bet": 6,
+}
+
+
+class Scenario:
+    def __init__(self, name, path, method="get", login=False, data=None, content_type=None):
+        self.name = name
+        self.path = path
+        self.method = method
+        self.login = login
+        self.data = data
+        self.content_type = content_type
+
+    def request(self, client, fixtures, iteration):
+        path = self.path(fixtures, iteration) if callable(self.path) else self.path
+        data = self.data(fixtures, iteration) if callable(self.data) else self.data
+        kwargs = {"content_type": self.content_type} if self.content_type else {}
+        return path, getattr(client, self.method)(path, data, **kwargs)
+
+
+def _pending_match(fixtures, iteration):
+    # 예측은 경기당 한 번만 가능하므로 반복마다 다른 예정 경기를 고른다.
+    match_ids = fixtures["pending_match_ids"]
+    return match_ids[iteration % len(match_ids)]
+
+
+def default_scenarios():
+    return [
+        Scenario("home", reverse("board:home")),
+        Scenario("post_list", reverse("board:post_list")),
+        Scenario("post_list_page", reverse("board:post_list") + "?page=50"),
+        Scenario("post_search", reverse("board:post_list") + "?q=word42"),
+        Scenario("post_detail", lambda f, i: reverse("board:post_detail", args=[f["post_id"]])),
+        Scenario("post_comments_json", lambda f, i: reverse("board:post_comments_json", args=[f["post_id"]])),
+        Scenario("link_list", reverse("board:link_list")),
+        Scenario("ai_list", reverse("board:ai_list")),
+        Scenario("popular_list", reverse("board:popular_list")),
+        Scenario("menu4", reverse("board:menu4")),
+        Scenario("menu4_trending", reverse("board:menu4") + "?sort=trending"),
+        Scenario("menu5", reverse("board:menu5"), login=True),
+        Scenario("secret_detail", lambda f, i: reverse("board:secret_detail", args=[f["secret_id"]]), login=True),
+        Scenario("menu6", reverse("board:menu6")),
+        Scenario("menu7", reverse("board:menu7")),
+        Scenario("menu8", reverse("board:menu8")),
+        Scenario("menu9", reverse("board:menu9")),
+        Scenario("menu10", reverse("board:menu10")),
+        Scenario("menu11", reverse("board:menu11")),
+        Scenario("match_list", reverse("board:match_list")),
+        Scenario("match_list_results", reverse("board:match_list") + "?tab=results&result_page=2"),
+        Scenario("match_fragment_results", reverse("board:match_fragment", args=["results"]) + "?result_page=2"),
+        Scenario("match_fragment_bets", reverse("board:match_fragment", args=["bets"])),
+        Scenario("match_fragment_standings", reverse("board:match_fragment", args=["standings"])),
+        Scenario("team_detail", lambda f, i: reverse("board:team_detail", args=[f["team_ids"][0]]) + "?page=2"),
+        Scenario("head_to_head_json", lambda f, i: reverse("board:head_to_head_json", args=f["team_ids"])),
+        Scenario(
+            "post_like_json",
+            lambda f, i: reverse("board:post_like_json", args=[f["post_id"]]),
+            method="post",
+            login=True,
+        ),
+        Scenario("info_like", lambda f, i: reverse("board:info_like", args=[f["info_id"]]), method="post", login=True),
+        Scenario("link_like", lambda f, i: reverse("board:link_like", args=[f["link_id"]]), method="post", login=True),
+        Scenario(
+            "match_like",
+            lambda f, i: reverse("board:match_like", args=[_pending_match(f, i)]),
+            method="post",
+            login=True,
+            data={"replace_oldest": True},
+            content_type="application/json",
+        ),
+        Scenario(
+            "match_bet",
+            lambda f, i: reverse("board:match_bet", args=[_pending_match(f, i)]),
+            method="post",
+            login=True,
+            data={"bet": SoccerMatch.OUTCOME_HOME_WIN},
+            content_type="application/json",
+        ),
+    ]
+
+
+def prepare_fixtures():
+    user, _ = User.objects.get_or_create(username=BENCHMARK_USERNAME)
+    Profile.objects.get_or_create(user=user, defaults={"nickname": "benchmark"})
+    # 운영 DB 에서 예측 권한은 is_superuser = 2 로 표시되어 있다(_can_set_match_bet 참고).
+    with connection.cursor() as cursor:
+        cursor.execute("UPDATE auth_user SET is_superuser = 2 WHERE id = %s", [user.id])
+
+    post = Post.objects.filter(category='common').order_by("-comment_count", "-id").first()
+    secret = Post.objects.filter(category='secret').order_by("-comment_count", "-id").first()
+    info = InfoPost.objects.order_by("-id").first()
+    link = LinkPost.objects.order_by("-id").first()
+    pending_match_ids = list(
+        SoccerMatch.objects.filter(result__isnull=True, bet__isnull=True, match_date__gt=timezone.now())
+        .order_by("match_date")
+        .values_list("id", flat=True)[:500]
+    )
+    team_pair = (
+        SoccerMatch.objects.filter(home_club__isnull=False, away_club__isnull=False)
+        .order_by("id")
+        .values_list("home_club_id", "away_club_id")
+        .first()
+    )
+    missing = [
+        name for name, value in [
+            ("post", post), ("secret", secret), ("info", info), ("link", link), ("match", pending_match_ids),
+            ("team", team_pair),
+        ]
+        if not value
+    ]
+    if missing:
+        raise ValueError(f"벤치마크 데이터가 부족합니다: {', '.join(missing)}")
+    return {
+        "user": user,
+        "post_id": post.id,
+        "secret_id": secret.id,
+        "info_id": info.id,
+        "link_id": link.id,
+        "pending_match_ids": pending_match_ids,
+        "team_ids": team_pair,
+    }
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    index = max(math.ceil(fraction * len(ordered)) - 1, 0)
+    return ordered[index]
+
+
+def dataset_summary():
+    return {
+        "users": User.objects.count(),
+        "posts": Post.objects.count(),
+        "comments": Comment.objects.count(),
+        "likes": Post.likes.through.objects.count(),
+        "infoposts": InfoPost.objects.count(),
+        "links": LinkPost.objects.count(),
+        "matches": SoccerMatch.objects.count(),
+    }
+
+
+def run_benchmark(iterations=20, warmup=2, scenarios=None, only=None, log=None):
+    log = log or (lambda message: None)
+    scenarios = scenarios or default_scenarios()
+    if only:
+        scenarios = [scenario for scenario in scenarios if scenario.name in only]
+
+    fixtures = prepare_fixtures()
+    anonymous = Client()
+    member = Client()
+    member.force_login(fixtures["user"])
+    cache.clear()
+
+    results = {}
+    iteration_counter = 0
+    for scenario in scenarios:
+        client = member if scenario.login else anonymous
+        timings = []
+        queries = []
+        statuses = {}
+        path = None
+        for run in range(warmup + iterations):
+            with CaptureQueriesContext(connection) as captured:
+                start = time.perf_counter()
+                path, response = scenario.request(client, fixtures, iteration_counter)
+                elapsed = time.perf_counter() - start
+            iteration_counter += 1
+            if run < warmup:
+                # 첫 요청(캐시 미스)의 쿼리 수도 예산 검사에 포함한다.
+                queries.append(len(captured))
+                continue
+            timings.append(elapsed * 1000)
+            queries.append(len(captured))
+            statuses[str(response.status_code)] = statuses.get(str(response.status_code), 0) + 1
+
+        results[scenario.name] = {
+            "path": path,
+            "method": scenario.method.upper(),
+            "p50_ms": round(percentile(timings, 0.5), 3),
+            "p95_ms": round(percentile(timings, 0.95), 3),
+            "mean_ms": round(statistics.fmean(timings), 3) if timings else 0.0,
+            "queries": round(statistics.median(queries)) if queries else 0,
+            "max_queries": max(queries, default=0),
+            "query_budget": QUERY_BUDGETS.get(scenario.name),
+            "status_codes": statuses,
+        }
+        log(
+            f"{scenario.name:<20} p50 {results[scenario.name]['p50_ms']:>8.2f}ms  "
+            f"p95 {results[scenario.name]['p95_ms']:>8.2f}ms  queries {results[scenario.name]['max_queries']}"
+        )
+
+    return {
+        "generated_at": timezone.now().isoformat(),
+        "database": connection.vendor,
+        "iterations": iterations,
+        "dataset": dataset_summary(),
+        "results": results,
+    }
+
+
+def compare_report(report, baseline=None, tolerance=DEFAULT_LATENCY_TOLERANCE):
+    problems = []
+    baseline_results = (baseline or {}).get("results", {})
+    for name, result in report["results"].items():
+        budget = result.get("query_budget")
+        if budget is not None and result["max_queries"] > budget:
+            problems.append(f"{name}: 쿼리 {result['max_queries']}개가 예산 {budget}개를 넘었습니다.")
+        errors = {code: count for code, count in result["status_codes"].items() if int(code) >= 500}
+        if errors:
+            problems.append(f"{name}: 서버 오류 응답 {errors}")
+
+        previous = baseline_results.get(name)
+        if not previous:
+            continue
+        if result["max_queries"] > previous["max_queries"]:
+            problems.append(
+                f"{name}: 쿼리 수가 기준선 {previous['max_queries']}개에서 {result['max_queries']}개로 늘었습니다."
+            )
+        if previous["p95_ms"] and result["p95_ms"] > previous["p95_ms"] * tolerance:
+            problems.append(
+                f"{name}: p95 {result['p95_ms']:.2f}ms 가 기준선 {previous['p95_ms']:.2f}ms 의 "
+                f"{tolerance}배를 넘었습니다."
+            )
+    return problems
+
+
+def load_report(path):
+    with open(path, encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+def write_report(report, path):
+    with open(path, "w", encoding="utf-8") as handle:
+        json.dump(report, handle, ensure_ascii=False, indent=2)
+        handle.write("\n")
@@ -0,0 +1,108 @@
+import hashlib
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.middleware.csrf import get_token
+from django.utils.cache import patch_vary_headers
+
+
+PAGE_CACHE_TIMEOUT = getattr(settings, "BOARD_PAGE_CACHE_TIMEOUT", 60)
+GENERATION_TIMEOUT = None
+
+BOARD_POST = "post:common"
+BOARD_SECRET = "post:secret"
+BOARD_THREAD = "info:thread"
+BOARD_AI = "info:ai"
+BOARD_LINK = "link"
+BOARD_MATCH = "match"
+
+# 사이드바(추천썰/인기모음)가 붙는 목록 페이지들이 공통으로 의존하는 게시판
+SIDEBAR_BOARDS = (BOARD_POST, BOARD_LINK)
+
+
+def post_board(category):
+    return BOARD_SECRET if category == "secret" else BOARD_POST
+
+
+def info_board(category):
+    return BOARD_AI if category == "ai" else BOARD_THREAD
+
+
+def _generation_key(board):
+    return f"board:gen:{board}"
+
+
+def get_board_generations(boards):
+    keys = [_generation_key(board) for board in boards]
+    found = cache.get_many(keys)
+    generations = []
+    for key in keys:
+        generation = found.get(key)
+        if generation is None:
+            cache.add(key, 1, GENERATION_TIMEOUT)
+            generation = cache.get(key, 1)
+        generations.append(generation)
+    return generations
+
+
+def bump_board_generation(*boards):
+    for board in boards:
+        key = _generation_key(board)
+        try:
+            cache.incr(key)
+        except ValueError:
+            # 키가 없으면 기존 캐시는 어차피 참조되지 않으므로 새 세대로 시작한다.
+            if not cache.add(key, 2, GENERATION_TIMEOUT):
+                cache.incr(key)
+
+
+def _page_cache_key(request, boards):
+    generations = get_board_generations(boards)
+    stamp = ",".join(f"{board}={generation}" for board, generation in zip(boards, generations))
+    raw = f"{request.method}:{request.get_full_path()}:{stamp}"
+    return "board:page:" + hashlib.md5(raw.encode("utf-8")).hexdigest()
+
+
+def _is_cacheable_request(request):
+    if request.method not in ("GET", "HEAD"):
+        return False
+    return not request.user.is_authenticated
+
+
+# 로그아웃 방문자의 GET 응답 전체를 경로+쿼리 기준으로 캐시한다.
+# 캐시 키에 의존 게시판들의 세대 번호가 포함되므로, 게시판에 쓰기가 생기면
+# bump_board_generation() 한 번으로 관련 페이지가 모두 무효화된다.
+def cache_anonymous_page(*boards, timeout=None):
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapped(request, *args, **kwargs):
+            if not _is_cacheable_request(request):
+                return view_func(request, *args, **kwargs)
+
+            # 캐시된 HTML에는 CSRF 토큰을 넣지 않고, 스크립트가 쿠키에서 읽도록 한다.
+            get_token(request)
+            key = _page_cache_key(request, boards)
+            cached = cache.get(key)
+            if cached is not None:
+                content, content_type = cached
+                response = HttpResponse(content, content_type=content_type)
+                response["X-Board-Cache"] = "hit"
+                patch_vary_headers(response, ("Cookie",))
+                return response
+
+            response = view_func(request, *args, **kwargs)
+            if response.status_code == 200 and not response.streaming and not response.cookies:
+                cache.set(
+                    key,
+                    (response.content, response.get("Content-Type")),
+                    PAGE_CACHE_TIMEOUT if timeout is None else timeout,
+                )
+                response["X-Board-Cache"] = "miss"
+            patch_vary_headers(response, ("Cookie",))
+            return response
+
+        return wrapped
+
+    return decorator
@@ -0,0 +1,100 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.db.models import Count, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import dateformat, timezone
+
+from .models import Comment, Post
+
+
+COMMENT_PAGE_SIZE = 20
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+
+def encode_cursor(comment):
+    micros = (comment.created_at - _EPOCH) // timedelta(microseconds=1)
+    return f"{micros}-{comment.id}"
+
+
+def decode_cursor(cursor):
+    try:
+        micros, comment_id = cursor.split("-", 1)
+        return _EPOCH + timedelta(microseconds=int(micros)), int(comment_id)
+    except (AttributeError, ValueError, OverflowError):
+        return None
+
+
+def comment_page(post, cursor=None, limit=COMMENT_PAGE_SIZE):
+    # 최상위 댓글만 (post_id, depth, created_at) 인덱스 순서로 한 페이지 가져온다.
+    comments = post.comments.filter(depth=0).order_by("-created_at", "-id")
+    position = decode_cursor(cursor) if cursor else None
+    if position:
+        created_at, comment_id = position
+        comments = comments.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=comment_id))
+
+    page = list(comments[:limit + 1])
+    next_cursor = encode_cursor(page[limit - 1]) if len(page) > limit else None
+    page = page[:limit]
+    attach_replies(page)
+    return page, next_cursor
+
+
+def attach_replies(roots):
+    # 페이지에 있는 스레드들의 답글을 경로 순서대로 한 번에 읽어 붙인다.
+    by_thread = {root.id: root for root in roots}
+    for root in roots:
+        root.thread_replies = []
+    if not by_thread:
+        return roots
+
+    replies = Comment.objects.filter(thread_id__in=by_thread, depth__gt=0).order_by("thread_id", "path")
+    for reply in replies:
+        by_thread[reply.thread_id].thread_replies.append(reply)
+    return roots
+
+
+def resolve_parent(post, parent_id):
+    if not parent_id:
+        return None
+    try:
+        return post.comments.filter(id=int(parent_id)).first()
+    except (TypeError, ValueError):
+        return None
+
+
+def comment_payload(comment, show_author=True):
+    payload = {
+        "id": comment.id,
+        "author": comment.author if show_author else "",
+        "content": comment.content,
+        "created_at": dateformat.format(timezone.localtime(comment.created_at), "Y-m-d H:i"),
+        "depth": comment.depth,
+        "reply_count": comment.reply_count,
+    }
+    if hasattr(comment, "thread_replies"):
+        payload["replies"] = [comment_payload(reply, show_author) for reply in comment.thread_replies]
+    return payload
+
+
+def rebuild_comment_counts():
+    # 시그널 없이 대량으로 넣은 댓글(bulk_create) 뒤에 Post.comment_count 를 다시 맞춘다.
+    counts = (
+        Comment.objects.filter(post=OuterRef("pk"))
+        .order_by()
+        .values("post")
+        .annotate(total=Count("id"))
+        .values("total")
+    )
+    return Post.objects.update(comment_count=Coalesce(Subquery(counts), 0))
+
+
+def rebuild_reply_counts():
+    replies = (
+        Comment.objects.filter(thread_id=OuterRef("pk"), depth__gt=0)
+        .order_by()
+        .values("thread_id")
+        .annotate(total=Count("id"))
+        .values("total")
+    )
+    return Comment.objects.filter(depth=0).update(reply_count=Coalesce(Subquery(replies), 0))
@@ -0,0 +1,115 @@
+from django.core.paginator import Paginator
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F
+from django.utils.functional import cached_property
+
+from .models import BoardCounter
+
+
+POPULAR_LINK_CATEGORIES = ['best', 'xart', 'movie', 'itnews', 'ground', 'stock']
+
+LIKED_COMMON_POSTS = "post:common:liked"
+RECOMMENDED_LINKS = "link:recommended"
+FAVORITE_MATCHES = "match:favorites"
+
+
+def post_counter(category):
+    return f"post:{category}"
+
+
+def info_counter(category):
+    return f"info:{category}"
+
+
+def link_counter(category):
+    return f"link:{category}"
+
+
+def counter_names(instance):
+    # 한 행이 기여하는 카운터 이름들. 저장 전/후를 비교해 증감을 계산한다.
+    from .models import InfoPost, LinkPost, Post
+
+    if isinstance(instance, Post):
+        return {post_counter(instance.category)}
+    if isinstance(instance, InfoPost):
+        return {info_counter(instance.category)}
+    if isinstance(instance, LinkPost):
+        names = {link_counter(instance.category)}
+        if instance.is_recommended and instance.category in POPULAR_LINK_CATEGORIES:
+            names.add(RECOMMENDED_LINKS)
+        return names
+    return set()
+
+
+def get_counter(name):
+    value = BoardCounter.objects.filter(name=name).values_list("value", flat=True).first()
+    return max(value or 0, 0)
+
+
+def increment_counter(name, delta=1):
+    if not delta:
+        return
+    updated = BoardCounter.objects.filter(name=name).update(value=F("value") + delta)
+    if updated:
+        return
+    try:
+        with transaction.atomic():
+            BoardCounter.objects.create(name=name, value=delta)
+    except IntegrityError:
+        BoardCounter.objects.filter(name=name).update(value=F("value") + delta)
+
+
+def apply_counter_changes(old_names, new_names):
+    for name in old_names - new_names:
+        increment_counter(name, -1)
+    for name in new_names - old_names:
+        increment_counter(name, 1)
+
+
+def compute_counter_values(Post, InfoPost, LinkPost, MatchFavoriteSlot=None):
+    values = {}
+    for row in Post.objects.values("category").annotate(total=Count("id")):
+        values[post_counter(row["category"])] = row["total"]
+    for row in InfoPost.objects.values("category").annotate(total=Count("id")):
+        values[info_counter(row["category"])] = row["total"]
+    for row in LinkPost.objects.values("category").annotate(total=Count("id")):
+        values[link_counter(row["category"])] = row["total"]
+    values[RECOMMENDED_LINKS] = LinkPost.objects.filter(
+        category__in=POPULAR_LINK_CATEGORIES,
+        is_recommended=True,
+    ).count()
+    values[LIKED_COMMON_POSTS] = (
+        Post.likes.through.objects.filter(post__category='common')
+        .values("post_id")
+        .distinct()
+        .count()
+    )
+    if MatchFavoriteSlot is not None:
+        values[FAVORITE_MATCHES] = MatchFavoriteSlot.objects.filter(match__isnull=False).count()
+    return values
+
+
+def rebuild_counters(Post=None, InfoPost=None, LinkPost=None, Counter=None, MatchFavoriteSlot=None):
+    if Post is None:
+        from .models import InfoPost, LinkPost, MatchFavoriteSlot, Post
+        Counter = BoardCounter
+
+    values = compute_counter_values(Post, InfoPost, LinkPost, MatchFavoriteSlot)
+    with transaction.atomic():
+        Counter.objects.exclude(name__in=values).delete()
+        for name, value in values.items():
+            Counter.objects.update_or_create(name=name, defaults={"value": value})
+    return values
+
+
+class CountedPaginator(Paginator):
+    # 검색이 없는 목록은 미리 유지해 둔 카운터로 전체 개수를 대신해 COUNT(*)를 피한다.
+    def __init__(self, object_list, per_page, counter=None, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.counter = counter
+
+    @cached_property
+    def count(self):
+        if self.counter is None:
+            return super().count
+        return get_counter(self.counter)
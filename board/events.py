@@ -0,0 +1,169 @@
+import asyncio
+import itertools
+import json
+import logging
+import threading
+from collections import deque, namedtuple
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+
+logger = logging.getLogger("board.events")
+
+EVENT_QUEUE_SIZE = getattr(settings, "BOARD_EVENT_QUEUE_SIZE", 64)
+EVENT_HISTORY_SIZE = getattr(settings, "BOARD_EVENT_HISTORY_SIZE", 200)
+EVENT_MAX_SUBSCRIBERS = getattr(settings, "BOARD_EVENT_MAX_SUBSCRIBERS", 500)
+EVENT_HEARTBEAT = getattr(settings, "BOARD_EVENT_HEARTBEAT", 15)
+EVENT_MAX_AGE = getattr(settings, "BOARD_EVENT_MAX_AGE", 300)
+EVENT_RETRY_MS = getattr(settings, "BOARD_EVENT_RETRY_MS", 3000)
+
+Event = namedtuple("Event", ["id", "type", "data"])
+
+# 따라잡을 수 없을 때 보내는 이벤트. 클라이언트는 받은 즉시 연결을 닫고 새로고침을 안내한다.
+RESYNC = Event(None, "resync", {})
+
+
+class Subscription:
+    def __init__(self, channel, loop, size):
+        self.channel = channel
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize=size)
+        self.lagged = False
+
+    def offer(self, event):
+        # 구독한 이벤트 루프 스레드에서만 불린다.
+        if self.lagged:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # 읽지 못하고 쌓이기만 하는 연결은 밀린 이벤트를 버리고 resync 하나만 남긴다.
+            self.lagged = True
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESYNC)
+
+
+class LocalEventBroker:
+    # 프로세스 안에서만 전달하는 브로커. 워커가 여럿이면 같은 publish/subscribe/unsubscribe 를 가진
+    # 구현(Redis pub/sub 등)을 BOARD_EVENT_BROKER 로 지정한다.
+    def __init__(self, queue_size=EVENT_QUEUE_SIZE, history_size=EVENT_HISTORY_SIZE, max_subscribers=EVENT_MAX_SUBSCRIBERS):
+        self.queue_size = queue_size
+        self.history_size = history_size
+        self.max_subscribers = max_subscribers
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._last_id = 0
+        self._subscribers = {}
+        self._history = {}
+        self._evicted = {}
+
+    def subscriber_count(self):
+        with self._lock:
+            return sum(len(subscribers) for subscribers in self._subscribers.values())
+
+    def publish(self, channel, event_type, data):
+        # 요청 스레드, 시그널, 이벤트 루프 어디서 불러도 된다. 전달은 각 구독자의 루프에 맡긴다.
+        with self._lock:
+            event = Event(next(self._ids), event_type, data)
+            self._last_id = event.id
+            history = self._history.setdefault(channel, deque(maxlen=self.history_size))
+            if len(history) == history.maxlen:
+                self._evicted[channel] = history[0].id
+            history.append(event)
+            subscribers = list(self._subscribers.get(channel, ()))
+        for subscription in subscribers:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.offer, event)
+            except RuntimeError:
+                # 루프가 이미 닫혔다. 스트림의 finally 가 곧 구독을 정리한다.
+                pass
+        return event.id
+
+    def subscribe(self, channel, last_event_id=None):
+        # 구독자가 가득 차면 None 을 돌려준다. last_event_id 가 있으면 그 뒤 이벤트를 먼저 채워 둔다.
+        subscription = Subscription(channel, asyncio.get_running_loop(), self.queue_size)
+        with self._lock:
+            if sum(len(subscribers) for subscribers in self._subscribers.values()) >= self.max_subscribers:
+                return None
+            self._subscribers.setdefault(channel, set()).add(subscription)
+            if last_event_id is not None:
+                missed = self._missed_events(channel, last_event_id)
+                for event in missed if missed is not None else [RESYNC]:
+                    subscription.offer(event)
+        return subscription
+
+    def _missed_events(self, channel, last_event_id):
+        if last_event_id > self._last_id or last_event_id < self._evicted.get(channel, 0):
+            # 다른 프로세스(재시작 전)가 준 id 이거나, 기록에서 이미 밀려난 구간이다.
+            return None
+        return [event for event in self._history.get(channel, ()) if event.id > last_event_id]
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.channel)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    global _broker
+    with _broker_lock:
+        if _broker is None:
+            broker_path = getattr(settings, "BOARD_EVENT_BROKER", None)
+            _broker = import_string(broker_path)() if broker_path else LocalEventBroker()
+        return _broker
+
+
+def publish_event(channel, event_type, data):
+    try:
+        return get_broker().publish(channel, event_type, data)
+    except Exception:
+        # 실시간 알림은 부가 기능이라 실패해도 글쓰기/좋아요 요청을 막지 않는다.
+        logger.exception("Failed to publish %s event on %s", event_type, channel)
+        return None
+
+
+def parse_last_event_id(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def format_event(event):
+    lines = []
+    if event.id is not None:
+        lines.append(f"id: {event.id}")
+    lines.append(f"event: {event.type}")
+    lines.append(f"data: {json.dumps(event.data, ensure_ascii=False, separators=(',', ':'))}")
+    return "\n".join(lines) + "\n\n"
+
+
+async def event_stream(broker, subscription, heartbeat=EVENT_HEARTBEAT, max_age=EVENT_MAX_AGE):
+    # max_age 가 지나면 스스로 닫는다. EventSource 가 retry 뒤 Last-Event-ID 로 다시 붙으므로
+    # 놓치는 이벤트 없이 연결이 워커 사이에 고르게 다시 퍼진다.
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + max_age
+    try:
+        yield f"retry: {EVENT_RETRY_MS}\n\n"
+        while True:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                event = await asyncio.wait_for(subscription.queue.get(), min(heartbeat, remaining))
+            except asyncio.TimeoutError:
+                # 프록시가 유휴 연결을 끊지 않도록 주석 줄을 보낸다.
+                yield ": ping\n\n"
+                continue
+            yield format_event(event)
+            if event is RESYNC:
+                break
+    finally:
+        broker.unsubscribe(subscription)
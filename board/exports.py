@@ -0,0 +1,133 @@
+import csv
+import json
+import zlib
+
+from asgiref.sync import sync_to_async
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import Comment, InfoPost, LinkPost, Post, SoccerMatch
+
+
+# 분석용 야간 덤프 대상. 키는 명령 인자와 URL 에 그대로 쓴다.
+EXPORT_TABLES = {
+    "posts": Post,
+    "comments": Comment,
+    "infoposts": InfoPost,
+    "links": LinkPost,
+    "matches": SoccerMatch,
+}
+EXPORT_FORMATS = {"jsonl": "application/x-ndjson", "csv": "text/csv"}
+EXPORT_BATCH_SIZE = 1000
+# gzip 헤더(wbits 31)로 조각마다 압축해 내보낸다.
+GZIP_WBITS = 31
+
+
+def export_fields(model):
+    # id 가 첫 컬럼이다. 좋아요 같은 M2M 은 덤프하지 않는다.
+    return [field.attname for field in model._meta.concrete_fields]
+
+
+def parse_since(value):
+    # "2026-10-01" 또는 ISO 시각. 시간대가 없으면 현재 시간대로 본다.
+    since = parse_datetime(value) or parse_datetime(f"{value}T00:00:00")
+    if since is None:
+        raise ValueError(f"시각을 읽을 수 없습니다: {value}")
+    return timezone.make_aware(since) if timezone.is_naive(since) else since
+
+
+def _export_queryset(model, since=None):
+    rows = model.objects.order_by("id").values_list(*export_fields(model))
+    if since is not None:
+        rows = rows.filter(created_at__gt=since)
+    return rows
+
+
+def fetch_batch(rows, last_id, batch_size):
+    return list(rows.filter(id__gt=last_id)[:batch_size])
+
+
+def export_rows(model, since_id=None, since=None, batch_size=EXPORT_BATCH_SIZE):
+    # MySQL 드라이버는 iterator() 에도 결과를 통째로 받아오므로, id 기준으로 batch_size 씩 끊어 읽는다.
+    # 한 번에 메모리에 있는 행은 batch_size 개뿐이고, 각 조회는 PK 범위 한 번이다.
+    rows = _export_queryset(model, since)
+    last_id = since_id or 0
+    while True:
+        batch = fetch_batch(rows, last_id, batch_size)
+        yield from batch
+        if len(batch) < batch_size:
+            return
+        last_id = batch[-1][0]
+
+
+async def aexport_batches(model, since_id=None, since=None, batch_size=EXPORT_BATCH_SIZE):
+    # export_rows 의 async 판. batch 조회만 스레드에서 하고, 이벤트 루프는 batch 사이에 응답을 흘려보낸다.
+    rows = _export_queryset(model, since)
+    last_id = since_id or 0
+    while True:
+        batch = await sync_to_async(fetch_batch)(rows, last_id, batch_size)
+        if batch:
+            yield batch
+        if len(batch) < batch_size:
+            return
+        last_id = batch[-1][0]
+
+
+def _plain(value):
+    return value.isoformat() if hasattr(value, "isoformat") else value
+
+
+class _Echo:
+    # csv.writer 가 쓴 한 줄을 버퍼에 모으지 않고 그대로 돌려받는다.
+    def write(self, value):
+        return value
+
+
+def _lines(fields, rows, export_format, header=True):
+    if export_format == "csv":
+        writer = csv.writer(_Echo())
+        if header:
+            yield writer.writerow(fields)
+        for row in rows:
+            yield writer.writerow([_plain(value) for value in row])
+        return
+    for row in rows:
+        yield json.dumps(dict(zip(fields, map(_plain, row))), ensure_ascii=False) + "\n"
+
+
+def _gzip(chunks):
+    compressor = zlib.compressobj(wbits=GZIP_WBITS)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def export_stream(model, rows, export_format="jsonl", compress=False):
+    # rows(export_rows) 를 한 줄씩 UTF-8 바이트로 바꿔 내보낸다. export_board 명령과 WSGI 의 덤프 URL 이 쓴다.
+    chunks = (line.encode("utf-8") for line in _lines(export_fields(model), rows, export_format))
+    return _gzip(chunks) if compress else chunks
+
+
+async def aexport_stream(model, batches, export_format="jsonl", compress=False):
+    # aexport_batches 를 batch 하나당 한 조각씩 UTF-8(필요하면 gzip) 바이트로 바꿔 내보낸다. ASGI 의 덤프 URL 이 쓴다.
+    fields = export_fields(model)
+    compressor = zlib.compressobj(wbits=GZIP_WBITS) if compress else None
+    header = True
+    async for batch in batches:
+        data = "".join(_lines(fields, batch, export_format, header)).encode("utf-8")
+        header = False
+        if compressor is not None:
+            data = compressor.compress(data)
+        if data:
+            yield data
+    if header and export_format == "csv":
+        data = "".join(_lines(fields, [], export_format)).encode("utf-8")
+        yield compressor.compress(data) if compressor is not None else data
+    if compressor is not None:
+        yield compressor.flush()
+
+
+def export_filename(table, export_format, compress=False):
+    return f"{table}.{export_format}" + (".gz" if compress else "")
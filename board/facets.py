@@ -0,0 +1,141 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Q
+from django.utils import timezone
+
+from .models import MatchFacet, SoccerMatch
+
+
+FACET_CACHE_KEY = "board:match:facets"
+FACET_CACHE_TIMEOUT = getattr(settings, "BOARD_FACET_CACHE_TIMEOUT", 3600)
+FACET_FIELDS = {"league", "year", "score"}
+# 필터 버튼 순서와 표시 이름. 여기 없는 리그는 뒤에 이름 순으로 붙는다.
+LEAGUE_ORDER = ["프리미어리그", "라리가", "분데스리가", "대표"]
+LEAGUE_LABELS = {"대표": "대표팀"}
+
+
+def facet_key(league, year, score):
+    # 경기 한 건이 속하는 (리그, 연도, 결과 여부). 연도가 없는 경기는 match_list 에 나오지 않는다.
+    if year is None:
+        return None
+    return league, year, bool(score)
+
+
+def match_facet_key(match):
+    return facet_key(match.league, match.year, match.score)
+
+
+def _increment_facet(key, delta):
+    league, year, is_result = key
+    field = "result_count" if is_result else "scheduled_count"
+    rows = MatchFacet.objects.filter(league=league, year=year)
+    changes = {field: F(field) + delta, "updated_at": timezone.now()}
+    if rows.update(**changes) or delta < 0:
+        return
+    try:
+        with transaction.atomic():
+            MatchFacet.objects.create(league=league, year=year, **{field: delta})
+    except IntegrityError:
+        rows.update(**changes)
+
+
+def apply_facet_change(old_key, new_key):
+    if old_key == new_key:
+        return
+    if old_key is not None:
+        _increment_facet(old_key, -1)
+    if new_key is not None:
+        _increment_facet(new_key, 1)
+    invalidate_facets()
+
+
+def invalidate_facets():
+    cache.delete(FACET_CACHE_KEY)
+
+
+def _stored_facets():
+    return list(
+        MatchFacet.objects.filter(Q(scheduled_count__gt=0) | Q(result_count__gt=0))
+        .order_by("-year", "league")
+        .values_list("league", "year", "scheduled_count", "result_count", "updated_at")
+    )
+
+
+def match_facets():
+    # [(league, year, scheduled_count, result_count, updated_at)] 을 캐시에서 읽는다. 필터 바는 쿼리가 없다.
+    # 캐시가 비었을 때(FACET_CACHE_TIMEOUT 마다) 전체 경기 수와 맞춰 보고, 다르면 수집기가 직접 넣은 행이
+    # 있다는 뜻이므로 다시 센다. 새 리그/시즌 버튼도 이때 생긴다.
+    facets = cache.get(FACET_CACHE_KEY)
+    if facets is None:
+        facets = _stored_facets()
+        total = sum(facet[2] + facet[3] for facet in facets)
+        if total != SoccerMatch.objects.filter(year__isnull=False).count():
+            rebuild_facets()
+            facets = _stored_facets()
+        cache.set(FACET_CACHE_KEY, facets, FACET_CACHE_TIMEOUT)
+    return facets
+
+
+def check_facet_count(facet, is_result, count):
+    # facet 수는 필터 바에만 쓰고 페이지네이션은 실제 COUNT 를 쓴다. 둘이 다르면 그 (리그, 연도) 한 칸만
+    # 다시 센다. 전체 재계산과 페이지 캐시 무효화는 쓰기 쪽(시그널, sync_league_standings 등)이 맡는다.
+    if facet is None or facet[3 if is_result else 2] == count:
+        return False
+    refresh_facet(facet[0], facet[1])
+    return True
+
+
+def refresh_facet(league, year):
+    has_score = Q(score__isnull=False) & ~Q(score="")
+    counts = SoccerMatch.objects.filter(league=league, year=year).aggregate(
+        result_count=Count("id", filter=has_score),
+        scheduled_count=Count("id", filter=~has_score),
+    )
+    MatchFacet.objects.update_or_create(league=league, year=year, defaults=counts)
+    invalidate_facets()
+
+
+def _league_sort_key(league):
+    return (LEAGUE_ORDER.index(league), "") if league in LEAGUE_ORDER else (len(LEAGUE_ORDER), league)
+
+
+def facet_filters(facets, year, league):
+    # 요청의 year/league 를 facet 에 있는 값으로 맞추고 필터 바에 쓸 목록을 돌려준다.
+    # 반환값: (연도, 리그, 연도 목록, 리그 목록, 선택한 리그·연도의 facet)
+    years = sorted({facet[1] for facet in facets}, reverse=True) or [timezone.localdate().year]
+    if year not in years:
+        year = years[0]
+    by_league = {facet[0]: facet for facet in facets if facet[1] == year}
+    leagues = sorted(by_league, key=_league_sort_key) or LEAGUE_ORDER[:1]
+    if league not in leagues:
+        league = leagues[0]
+    choices = [{"label": LEAGUE_LABELS.get(value, value), "value": value} for value in leagues]
+    return year, league, years, choices, by_league.get(league)
+
+
+def rebuild_facets(SoccerMatch=SoccerMatch, MatchFacet=MatchFacet):
+    # 수집기가 soccer_matches 에 직접 쓴 변경은 시그널이 없으므로 GROUP BY 한 번으로 다시 센다.
+    has_score = Q(score__isnull=False) & ~Q(score="")
+    rows = (
+        SoccerMatch.objects.filter(year__isnull=False)
+        .order_by()
+        .values("league", "year")
+        .annotate(
+            result_count=Count("id", filter=has_score),
+            scheduled_count=Count("id", filter=~has_score),
+        )
+    )
+    with transaction.atomic():
+        MatchFacet.objects.all().delete()
+        MatchFacet.objects.bulk_create(
+            MatchFacet(
+                league=row["league"],
+                year=row["year"],
+                scheduled_count=row["scheduled_count"],
+                result_count=row["result_count"],
+            )
+            for row in rows
+        )
+    cache.delete(FACET_CACHE_KEY)
+    return len(rows)
@@ -96,10 +96,13 @@ class SignUpForm(forms.ModelForm):
             raise ValidationError("이미 사용 중인 닉네임입니다.")
         return nickname
 
-    def save(self, commit=True):
+    def save(self, commit=True, password_hash=None):
         user = super().save(commit=False)
         user.username = self.cleaned_data['email']
-        user.set_password(self.cleaned_data['password'])
+        if password_hash:
+            user.password = password_hash
+        else:
+            user.set_password(self.cleaned_data['password'])
         if commit:
             user.save()
             Profile.objects.create(user=user, nickname=self.cleaned_data['nickname'])
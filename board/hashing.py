@@ -0,0 +1,123 @@
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import user_login_failed
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.hashers import make_password, verify_password
+from django.contrib.auth.models import User
+from django.utils.module_loading import import_string
+
+from .metrics import SECONDS_BUCKETS, Histogram, registry
+
+
+logger = logging.getLogger("board.hashing")
+
+HASHING_WORKERS = getattr(settings, "BOARD_HASHING_WORKERS", 2)
+HASHING_QUEUE_LIMIT = getattr(settings, "BOARD_HASHING_QUEUE_LIMIT", 32)
+HASH_OPERATIONS = ("verify", "make")
+
+HASH_QUEUE_TIME = registry.register(Histogram(
+    "board_auth_hash_queue_seconds",
+    "Time password hashing jobs waited for a pool worker.",
+    "operation",
+    SECONDS_BUCKETS,
+    labels=lambda: list(HASH_OPERATIONS),
+))
+HASH_DURATION = registry.register(Histogram(
+    "board_auth_hash_seconds",
+    "Password hashing time in the pool.",
+    "operation",
+    SECONDS_BUCKETS,
+    labels=lambda: list(HASH_OPERATIONS),
+))
+
+
+class HashingBusy(Exception):
+    pass
+
+
+# PBKDF2(hashlib)는 계산 중 GIL 을 놓으므로 스레드 풀로도 코어를 나눠 쓴다.
+# 워커 수를 작게 묶어 두어 로그인 폭주가 페이지 요청용 CPU 를 전부 가져가지 못하게 한다.
+_executor = None
+_executor_lock = threading.Lock()
+_pending = 0
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=HASHING_WORKERS, thread_name_prefix="board-hash")
+        return _executor
+
+
+async def run_hashing(operation, func, *args):
+    global _pending
+    with _executor_lock:
+        if _pending >= HASHING_QUEUE_LIMIT:
+            logger.warning("Password hashing queue is full (%s pending)", _pending)
+            raise HashingBusy()
+        _pending += 1
+
+    submitted = time.perf_counter()
+
+    def job():
+        started = time.perf_counter()
+        registry.observe(HASH_QUEUE_TIME.name, operation, started - submitted)
+        try:
+            return func(*args)
+        finally:
+            registry.observe(HASH_DURATION.name, operation, time.perf_counter() - started)
+
+    # 기다리던 요청이 취소돼도 작업은 풀에 남아 있으므로, 작업이 끝나거나 취소될 때 자리를 돌려준다.
+    try:
+        future = _get_executor().submit(job)
+    except BaseException:
+        _release_slot()
+        raise
+    future.add_done_callback(_release_slot)
+    return await asyncio.wrap_future(future)
+
+
+def _release_slot(future=None):
+    global _pending
+    with _executor_lock:
+        _pending -= 1
+
+
+async def amake_password(password):
+    return await run_hashing("make", make_password, password)
+
+
+def _model_backend_path():
+    for path in settings.AUTHENTICATION_BACKENDS:
+        if issubclass(import_string(path), ModelBackend):
+            return path
+    return None
+
+
+async def aauthenticate_member(request, username, password):
+    # ModelBackend.authenticate 와 같은 판단을 하되, 해시 계산만 풀에서 돌린다.
+    # 없는 회원이어도 verify_password 가 해시를 한 번 계산해 응답 시간 차이를 줄인다.
+    backend_path = _model_backend_path()
+    user = await User.objects.select_related("profile").filter(username=username).afirst()
+    encoded = user.password if user is not None else None
+    is_correct, must_update = await run_hashing("verify", verify_password, password, encoded)
+
+    if is_correct and user.is_active and backend_path:
+        if must_update:
+            user.password = await amake_password(password)
+            await user.asave(update_fields=["password"])
+        user.backend = backend_path
+        return user
+
+    await sync_to_async(user_login_failed.send)(
+        sender=__name__, credentials={"username": username}, request=request,
+    )
+    return None
+
@@ -0,0 +1,241 @@
+from array import array
+from bisect import bisect_left
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .caching import BOARD_LINK, BOARD_MATCH, bump_board_generation, info_board, post_board
+from .counters import FAVORITE_MATCHES, POPULAR_LINK_CATEGORIES, RECOMMENDED_LINKS, get_counter, increment_counter
+from .events import publish_event
+from .models import InfoPost, LinkPost, MatchFavoriteSlot, Post, SoccerMatch
+from .rankings import refresh_post_ranking
+
+
+LIKED_SET_TIMEOUT = getattr(settings, "BOARD_LIKED_SET_TIMEOUT", 600)
+
+# 좋아요 종류별 (모델, through 테이블의 글 FK 컬럼).
+LIKE_TARGETS = {
+    "post": (Post, "post_id"),
+    "info": (InfoPost, "infopost_id"),
+}
+
+
+def liked_set_key(kind, user_id):
+    return f"board:liked:{kind}:{user_id}"
+
+
+def invalidate_liked_set(kind, *user_ids):
+    if user_ids:
+        cache.delete_many([liked_set_key(kind, user_id) for user_id in user_ids])
+
+
+class LikedSet:
+    # 회원이 좋아요한 글 id 를 정렬된 8바이트 정수 배열로 들고 이분 탐색한다.
+    # 캐시에는 배열의 바이트열만 넣으므로 좋아요 천 개가 8KB 남짓이다.
+    __slots__ = ("ids",)
+
+    def __init__(self, ids):
+        self.ids = ids
+
+    def __contains__(self, owner_id):
+        index = bisect_left(self.ids, owner_id)
+        return index < len(self.ids) and self.ids[index] == owner_id
+
+    def __len__(self):
+        return len(self.ids)
+
+
+def liked_set(kind, user_id):
+    key = liked_set_key(kind, user_id)
+    packed = cache.get(key)
+    ids = array("q")
+    if packed is None:
+        model, owner_field = LIKE_TARGETS[kind]
+        ids.extend(
+            model.likes.through.objects.filter(user_id=user_id)
+            .order_by(owner_field)
+            .values_list(owner_field, flat=True)
+        )
+        cache.set(key, ids.tobytes(), LIKED_SET_TIMEOUT)
+    else:
+        ids.frombytes(packed)
+    return LikedSet(ids)
+
+
+def mark_liked(objects, kind, user):
+    # 목록 한 페이지의 좋아요 여부를 캐시 조회 한 번으로 채운다.
+    liked = liked_set(kind, user.pk) if user.is_authenticated else ()
+    for obj in objects:
+        obj.is_liked = obj.pk in liked
+    return objects
+
+
+def recount_likes(kind, owner_ids=None):
+    # likes.add/remove 나 bulk_create 처럼 토글을 거치지 않은 변경 뒤에 like_count 를 다시 센다.
+    model, owner_field = LIKE_TARGETS[kind]
+    counts = (
+        model.likes.through.objects.filter(**{owner_field: OuterRef("pk")})
+        .order_by()
+        .values(owner_field)
+        .annotate(total=Count("id"))
+        .values("total")
+    )
+    rows = model.objects.all() if owner_ids is None else model.objects.filter(id__in=owner_ids)
+    return rows.update(like_count=Coalesce(Subquery(counts), 0))
+
+
+# through 테이블을 직접 다루므로 m2m_changed / post_save 시그널이 돌지 않는다.
+# 시그널이 하던 랭킹·카운터·캐시 갱신은 여기서 직접 호출한다.
+# 좋아요 한 번의 DB 쓰기와 캐시 갱신은 동기 함수 하나로 묶어 sync_to_async 로 한 번만 스레드에 넘긴다.
+# 좋아요 토글은 게시판 세대를 올리지 않는다. 캐시된 목록의 좋아요 수는 PAGE_CACHE_TIMEOUT 만큼 늦을 수 있고,
+# 열려 있는 페이지는 SSE like 이벤트가 data-like-count 를 바로 고친다.
+
+
+def _toggle_like(kind, owner_id, user_id):
+    # 지우기를 먼저 시도해 이미 누른 경우는 DELETE 한 번으로 끝낸다. 지운 행이 없을 때만 INSERT 한다.
+    # like_count 는 실제로 지우거나 넣은 쪽만 F() 로 옮기고, 두 문장을 한 트랜잭션으로 묶어 중간에 실패해도 어긋나지 않는다.
+    model, owner_field = LIKE_TARGETS[kind]
+    through = model.likes.through
+    row = {owner_field: owner_id, "user_id": user_id}
+    with transaction.atomic():
+        deleted, _ = through.objects.filter(**row).delete()
+        if deleted:
+            model.objects.filter(id=owner_id, like_count__gt=0).update(like_count=F("like_count") - 1)
+            is_liked = False
+        else:
+            try:
+                with transaction.atomic():
+                    through.objects.create(**row)
+            except IntegrityError:
+                # 같은 회원의 동시 클릭이 먼저 넣었고 카운터도 그쪽에서 올렸다.
+                pass
+            else:
+                model.objects.filter(id=owner_id).update(like_count=F("like_count") + 1)
+            is_liked = True
+    invalidate_liked_set(kind, user_id)
+    return is_liked
+
+
+def _toggle_post_like(post, user_id):
+    is_liked = _toggle_like("post", post["id"], user_id)
+    return is_liked, refresh_post_ranking(post["id"])
+
+
+def _toggle_info_like(info, user_id):
+    is_liked = _toggle_like("info", info["id"], user_id)
+    like_count = InfoPost.objects.filter(id=info["id"]).values_list("like_count", flat=True).first()
+    return is_liked, like_count or 0
+
+
+async def atoggle_post_like(post_id, user_id):
+    post = await Post.objects.filter(id=post_id).values("id", "category").afirst()
+    if post is None:
+        return None
+    is_liked, like_count = await sync_to_async(_toggle_post_like)(post, user_id)
+    publish_event(post_board(post["category"]), "like", {"id": post_id, "like_count": like_count})
+    return is_liked, like_count
+
+
+async def atoggle_info_like(info_id, user_id):
+    info = await InfoPost.objects.filter(id=info_id).values("id", "category").afirst()
+    if info is None:
+        return None
+    is_liked, like_count = await sync_to_async(_toggle_info_like)(info, user_id)
+    publish_event(info_board(info["category"]), "like", {"id": info_id, "like_count": like_count})
+    return is_liked, like_count
+
+
+async def atoggle_link_recommendation(link_id):
+    # 읽은 값이 그대로일 때만 뒤집는 조건부 UPDATE 라 동시 클릭에도 카운터가 어긋나지 않는다.
+    link = await LinkPost.objects.filter(id=link_id).values("category", "is_recommended").afirst()
+    if link is None:
+        return None
+    is_recommended = not link["is_recommended"]
+    updated = await LinkPost.objects.filter(
+        id=link_id, is_recommended=link["is_recommended"],
+    ).aupdate(is_recommended=is_recommended)
+    if not updated:
+        return link["is_recommended"]
+    await sync_to_async(_apply_recommendation)(link["category"], is_recommended)
+    return is_recommended
+
+
+def _apply_recommendation(category, is_recommended):
+    # 추천 목록은 링크 게시판 페이지 캐시에 들어 있으므로 카운터와 함께 세대를 올린다.
+    if category in POPULAR_LINK_CATEGORIES:
+        increment_counter(RECOMMENDED_LINKS, 1 if is_recommended else -1)
+    bump_board_generation(BOARD_LINK)
+
+
+FAVORITE_CLAIM_ATTEMPTS = 5
+
+
+def _slot_age(slot):
+    # liked_at 이 비어 있는(옮겨 온) 칸을 가장 오래된 것으로 본다.
+    return (slot["liked_at"] is not None, slot["liked_at"] or 0, slot["slot"])
+
+
+def _favorites_changed(delta):
+    # 카운터와 세대 번호는 캐시 I/O 라 이벤트 루프 밖에서 한 번에 바꾼다.
+    if delta:
+        increment_counter(FAVORITE_MATCHES, delta)
+    bump_board_generation(BOARD_MATCH)
+
+
+async def afavorite_count():
+    return await sync_to_async(get_counter)(FAVORITE_MATCHES)
+
+
+async def atoggle_match_favorite(match, replace_oldest, limit):
+    # 반환값: (상태, 제거된 경기 id). 상태는 "removed", "added", "full", "busy" 중 하나다.
+    # 칸을 읽은 뒤 "그 칸이 읽은 그대로일 때만" 바꾸는 조건부 UPDATE 로 처리하므로 행 잠금이 없다.
+    # 다른 요청이 먼저 칸을 바꿨으면 UPDATE 가 0행이 되고, 칸을 다시 읽어 재시도한다.
+    for _ in range(FAVORITE_CLAIM_ATTEMPTS):
+        slots = [
+            slot async for slot in MatchFavoriteSlot.objects.filter(slot__lt=limit)
+            .order_by("slot")
+            .values("slot", "match_id", "liked_at")
+        ]
+        current = next((slot for slot in slots if slot["match_id"] == match.id), None)
+        if current is not None:
+            released = await MatchFavoriteSlot.objects.filter(
+                slot=current["slot"], match_id=match.id,
+            ).aupdate(match=None, liked_at=None)
+            if released:
+                await sync_to_async(_favorites_changed)(-1)
+            return "removed", None
+
+        empty = next((slot for slot in slots if slot["match_id"] is None), None)
+        if empty is None and not replace_oldest:
+            return "full", None
+        target = empty or min(slots, key=_slot_age)
+        try:
+            claimed = await MatchFavoriteSlot.objects.filter(
+                slot=target["slot"], match_id=target["match_id"],
+            ).aupdate(match_id=match.id, liked_at=timezone.now())
+        except IntegrityError:
+            # 같은 경기를 동시에 누른 요청이 다른 칸에 먼저 넣었다.
+            return "added", None
+        if not claimed:
+            continue
+        await sync_to_async(_favorites_changed)(1 if empty is not None else 0)
+        return "added", target["match_id"]
+    # 재시도할 때마다 다른 요청이 먼저 칸을 바꿨다. 칸이 찬 것과는 다른 상황이므로 따로 알린다.
+    return "busy", None
+
+
+async def aset_match_bet(match_id, bet):
+    # 아직 끝나지 않았고 예측도 없는 경기에만 걸리는 조건부 UPDATE 한 번으로 처리한다.
+    updated = await SoccerMatch.objects.filter(
+        id=match_id,
+        result__isnull=True,
+        bet__isnull=True,
+    ).aupdate(bet=bet)
+    if updated:
+        await sync_to_async(bump_board_generation)(BOARD_MATCH)
+    return bool(updated)
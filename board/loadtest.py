@@ -0,0 +1,245 @@
+import asyncio
+import json
+import random
+import re
+import time
+from urllib.parse import quote, urlsplit
+
+from django.urls import Resolver404, resolve
+
+from .benchmarks import percentile
+from .models import InfoPost, LinkPost, Post, SoccerMatch
+
+
+LOG_REQUEST = re.compile(r'"(?P<method>[A-Z]+) (?P<path>\S+) HTTP/[\d.]+"')
+SKIPPED_PREFIXES = ("/static/", "/media/", "/favicon")
+SAMPLE_SIZE = 1000
+
+# 운영 트래픽 비율을 흉내 낸 기본 요청 구성(가중치)
+SYNTHETIC_MIX = [
+    ("home", 20),
+    ("list", 25),
+    ("detail", 25),
+    ("search", 10),
+    ("menu", 8),
+    ("matches", 5),
+    ("like", 5),
+    ("bet", 2),
+]
+SEARCH_WORDS = ['경기', '축구', '주식', '영화', '맛집', '개발', '날씨']
+MENU_PATHS = ["/menu3/", "/ai-news/", "/popular/", "/menu4/", "/menu6/", "/menu7/", "/menu8/", "/menu9/"]
+
+
+class ReplayRequest:
+    def __init__(self, method, path, body=None):
+        self.method = method
+        self.path = path
+        self.body = body
+
+    @property
+    def route(self):
+        try:
+            return resolve(urlsplit(self.path).path).view_name
+        except Resolver404:
+            return "unresolved"
+
+
+def parse_access_log(lines):
+    # nginx combined 로그와 runserver 로그 모두 "METHOD PATH HTTP/x" 부분만 읽는다.
+    requests = []
+    for line in lines:
+        match = LOG_REQUEST.search(line)
+        if not match or match["path"].startswith(SKIPPED_PREFIXES):
+            continue
+        requests.append(ReplayRequest(match["method"], match["path"]))
+    return requests
+
+
+def _recent_ids(queryset):
+    return list(queryset.order_by("-id").values_list("id", flat=True)[:SAMPLE_SIZE])
+
+
+def synthetic_requests(count, seed=0):
+    rng = random.Random(seed)
+    post_ids = _recent_ids(Post.objects.filter(category='common')) or [1]
+    match_ids = _recent_ids(SoccerMatch.objects.filter(result__isnull=True)) or [1]
+    info_ids = _recent_ids(InfoPost.objects.all())
+    link_ids = _recent_ids(LinkPost.objects.all())
+    kinds = [kind for kind, _ in SYNTHETIC_MIX]
+    weights = [weight for _, weight in SYNTHETIC_MIX]
+
+    requests = []
+    for kind in rng.choices(kinds, weights, k=count):
+        if kind == "home":
+            requests.append(ReplayRequest("GET", "/"))
+        elif kind == "list":
+            page = min(int(rng.paretovariate(1.5)), 500)
+            requests.append(ReplayRequest("GET", f"/board/?page={page}"))
+        elif kind == "detail":
+            requests.append(ReplayRequest("GET", f"/board/{rng.choice(post_ids)}/"))
+        elif kind == "search":
+            requests.append(ReplayRequest("GET", f"/board/?q={rng.choice(SEARCH_WORDS)}"))
+        elif kind == "menu":
+            requests.append(ReplayRequest("GET", rng.choice(MENU_PATHS)))
+        elif kind == "matches":
+            requests.append(ReplayRequest("GET", rng.choice(["/matches/", "/matches/?tab=results"])))
+        elif kind == "like":
+            targets = [f"/board/{rng.choice(post_ids)}/like/json/"]
+            if info_ids:
+                targets.append(f"/info/{rng.choice(info_ids)}/like/")
+            if link_ids:
+                targets.append(f"/link/{rng.choice(link_ids)}/like/")
+            requests.append(ReplayRequest("POST", rng.choice(targets)))
+        else:
+            body = json.dumps({"bet": rng.choice([0, 1, 2])}).encode()
+            requests.append(ReplayRequest("POST", f"/match/{rng.choice(match_ids)}/bet/", body))
+    return requests
+
+
+class HttpConnection:
+    # 외부 의존성 없이 asyncio 스트림으로 HTTP/1.1 keep-alive 요청을 보내는 최소 클라이언트.
+    def __init__(self, host, port, headers, timeout):
+        self.host = host
+        self.port = port
+        self.headers = headers
+        self.timeout = timeout
+        self.reader = None
+        self.writer = None
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except OSError:
+                pass
+        self.reader = self.writer = None
+
+    async def request(self, method, path, body=None):
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        body = body or b""
+        # 한글 검색어 같은 비 ASCII 경로는 퍼센트 인코딩한다(이미 인코딩된 %XX 는 그대로 둔다).
+        path = quote(path, safe="/?&=%:;,+@!$'()*~")
+        lines = [f"{method} {path} HTTP/1.1", f"Host: {self.host}:{self.port}", f"Content-Length: {len(body)}"]
+        if body:
+            lines.append("Content-Type: application/json")
+        lines.extend(f"{name}: {value}" for name, value in self.headers.items())
+        self.writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body)
+        await self.writer.drain()
+        return await asyncio.wait_for(self._read_response(), self.timeout)
+
+    async def _read_response(self):
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionError("server closed the connection")
+        status = int(status_line.split()[1])
+        headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            while True:
+                size = int((await self.reader.readline()).split(b";")[0], 16)
+                await self.reader.readexactly(size + 2)
+                if size == 0:
+                    break
+        elif "content-length" in headers:
+            await self.reader.readexactly(int(headers["content-length"]))
+        else:
+            await self.reader.read()
+            headers["connection"] = "close"
+
+        if headers.get("connection", "").lower() == "close":
+            await self.close()
+        return status
+
+
+class RouteStats:
+    def __init__(self):
+        self.latencies = []
+        self.statuses = {}
+        self.errors = 0
+
+    def record(self, status, elapsed):
+        self.latencies.append(elapsed * 1000)
+        key = str(status) if status else "error"
+        self.statuses[key] = self.statuses.get(key, 0) + 1
+        if not status or status >= 500:
+            self.errors += 1
+
+
+async def _worker(queue, connection, stats):
+    while True:
+        try:
+            request = queue.get_nowait()
+        except asyncio.QueueEmpty:
+            break
+        start = time.perf_counter()
+        try:
+            status = await connection.request(request.method, request.path, request.body)
+        except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError, IndexError):
+            await connection.close()
+            status = None
+        stats.setdefault(request.route, RouteStats()).record(status, time.perf_counter() - start)
+    await connection.close()
+
+
+async def replay(requests, base_url, concurrency=10, headers=None, timeout=10):
+    parts = urlsplit(base_url)
+    if parts.scheme != "http":
+        raise ValueError("http:// 주소만 지원합니다.")
+    port = parts.port or 80
+    queue = asyncio.Queue()
+    for request in requests:
+        queue.put_nowait(request)
+
+    stats = {}
+    start = time.perf_counter()
+    await asyncio.gather(*[
+        _worker(queue, HttpConnection(parts.hostname, port, headers or {}, timeout), stats)
+        for _ in range(concurrency)
+    ])
+    return build_report(stats, time.perf_counter() - start, concurrency)
+
+
+def build_report(stats, elapsed, concurrency):
+    routes = {}
+    total = 0
+    errors = 0
+    for route, route_stats in sorted(stats.items()):
+        count = len(route_stats.latencies)
+        total += count
+        errors += route_stats.errors
+        routes[route] = {
+            "requests": count,
+            "throughput_rps": round(count / elapsed, 2) if elapsed else 0.0,
+            "p50_ms": round(percentile(route_stats.latencies, 0.5), 2),
+            "p95_ms": round(percentile(route_stats.latencies, 0.95), 2),
+            "p99_ms": round(percentile(route_stats.latencies, 0.99), 2),
+            "error_rate": round(route_stats.errors / count, 4) if count else 0.0,
+            "status_codes": route_stats.statuses,
+        }
+    return {
+        "concurrency": concurrency,
+        "elapsed_seconds": round(elapsed, 3),
+        "requests": total,
+        "throughput_rps": round(total / elapsed, 2) if elapsed else 0.0,
+        "error_rate": round(errors / total, 4) if total else 0.0,
+        "routes": routes,
+    }
+
+
+def cookie_headers(cookie):
+    # 로그인 세션으로 좋아요/예측 요청을 보내려면 쿠키와 같은 CSRF 토큰을 헤더에도 넣는다.
+    if not cookie:
+        return {}
+    headers = {"Cookie": cookie}
+    match = re.search(r"(?:^|;\s*)csrftoken=([^;]+)", cookie)
+    if match:
+        headers["X-CSRFToken"] = match.group(1)
+    return headers
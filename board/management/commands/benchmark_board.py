@@ -0,0 +1,73 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from board.benchmarks import (
+    DEFAULT_LATENCY_TOLERANCE,
+    compare_report,
+    load_report,
+    run_benchmark,
+    write_report,
+)
+from board.models import Post
+from board.seeding import BoardSeeder
+
+
+# scale 1.0 기준 데이터 양
+DATASET_SIZES = {
+    "users": 2_000,
+    "posts": 100_000,
+    "comments": 300_000,
+    "likes": 400_000,
+    "infoposts": 30_000,
+    "info_likes": 60_000,
+    "links": 60_000,
+}
+MATCH_SEASONS = (2026, 2027)
+
+
+class Command(BaseCommand):
+    help = "테스트 DB 에 데이터를 채운 뒤 모든 공개 URL 의 지연 시간과 쿼리 수를 측정합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--scale", type=float, default=1.0, help="기본 데이터 양에 곱할 배수")
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--iterations", type=int, default=20)
+        parser.add_argument("--warmup", type=int, default=2)
+        parser.add_argument("--output", default="benchmark-report.json")
+        parser.add_argument("--baseline", help="비교할 이전 보고서(JSON) 경로")
+        parser.add_argument("--tolerance", type=float, default=DEFAULT_LATENCY_TOLERANCE,
+                            help="기준선 대비 허용하는 p95 배수")
+        parser.add_argument("--only", nargs="*", help="측정할 시나리오 이름")
+        parser.add_argument("--match-seasons", nargs="*", type=int, default=list(MATCH_SEASONS),
+                            help="경기 데이터를 만들 시즌(연도) 목록")
+        parser.add_argument("--keepdb", action="store_true", help="테스트 DB 를 지우지 않고 다시 씁니다.")
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        old_name = connection.settings_dict["NAME"]
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, keepdb=options["keepdb"], serialize=False)
+        try:
+            if not Post.objects.exists():
+                sizes = {name: int(size * options["scale"]) for name, size in DATASET_SIZES.items()}
+                self.stdout.write(f"데이터 생성 중: {sizes}")
+                BoardSeeder(seed=options["seed"], log=self.stdout.write).seed(match_seasons=options["match_seasons"], **sizes)
+
+            report = run_benchmark(
+                iterations=options["iterations"],
+                warmup=options["warmup"],
+                only=options["only"],
+                log=self.stdout.write,
+            )
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=options["keepdb"])
+            teardown_test_environment()
+
+        write_report(report, options["output"])
+        self.stdout.write(f"보고서를 저장했습니다: {options['output']}")
+
+        baseline = load_report(options["baseline"]) if options["baseline"] else None
+        problems = compare_report(report, baseline, options["tolerance"])
+        if problems:
+            raise CommandError("성능 기준을 통과하지 못했습니다:\n" + "\n".join(problems))
+        self.stdout.write(self.style.SUCCESS("모든 시나리오가 기준을 통과했습니다."))
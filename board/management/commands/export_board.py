@@ -0,0 +1,82 @@
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from board.exports import (
+    EXPORT_BATCH_SIZE,
+    EXPORT_FORMATS,
+    EXPORT_TABLES,
+    export_filename,
+    export_rows,
+    export_stream,
+    parse_since,
+)
+
+
+class Command(BaseCommand):
+    help = "게시판/경기 테이블을 JSONL 또는 CSV 파일로 내보냅니다. 테이블 크기와 상관없이 batch 단위로 씁니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("tables", nargs="*", help="내보낼 테이블 (기본: 전부)")
+        parser.add_argument("--format", choices=list(EXPORT_FORMATS), default="jsonl")
+        parser.add_argument("--gzip", action="store_true", help="파일을 gzip 으로 압축합니다.")
+        parser.add_argument(
+            "--since-id",
+            action="append",
+            default=[],
+            metavar="[TABLE=]ID",
+            help="이 id 보다 큰 행만 내보냅니다. id 는 테이블마다 다르므로 posts=123 처럼 테이블을 붙이고, "
+            "테이블을 하나만 내보낼 때만 숫자만 쓸 수 있습니다. 여러 번 줄 수 있습니다.",
+        )
+        parser.add_argument("--since", help="이 시각(created_at) 이후에 만든 행만 내보냅니다.")
+        parser.add_argument("--output-dir", default=".")
+        parser.add_argument("--batch-size", type=int, default=EXPORT_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        try:
+            since = parse_since(options["since"]) if options["since"] else None
+        except ValueError as error:
+            raise CommandError(str(error))
+        unknown = set(options["tables"]) - set(EXPORT_TABLES)
+        if unknown:
+            raise CommandError(f"알 수 없는 테이블: {', '.join(sorted(unknown))} (가능: {', '.join(EXPORT_TABLES)})")
+        tables = options["tables"] or list(EXPORT_TABLES)
+        since_ids = self.parse_since_ids(options["since_id"], tables)
+        os.makedirs(options["output_dir"], exist_ok=True)
+
+        for table in tables:
+            model = EXPORT_TABLES[table]
+            progress = {"rows": 0, "last_id": since_ids.get(table)}
+
+            def counted(rows):
+                for row in rows:
+                    progress["rows"] += 1
+                    progress["last_id"] = row[0]
+                    yield row
+
+            rows = export_rows(model, since_ids.get(table), since, options["batch_size"])
+            path = os.path.join(options["output_dir"], export_filename(table, options["format"], options["gzip"]))
+            with open(path, "wb") as output:
+                for chunk in export_stream(model, counted(rows), options["format"], options["gzip"]):
+                    output.write(chunk)
+            # 다음 증분 덤프는 마지막 id 를 --since-id 테이블=id 로 넘기면 된다.
+            self.stdout.write(self.style.SUCCESS(
+                f"{table}: {progress['rows']}건 -> {path} (다음 증분: --since-id {table}={progress['last_id'] or 0})"
+            ))
+
+    def parse_since_ids(self, values, tables):
+        since_ids = {}
+        for value in values:
+            table, separator, raw_id = value.rpartition("=")
+            if not separator:
+                # 숫자만 주면 어느 테이블의 id 인지 알 수 없으므로 테이블이 하나일 때만 받는다.
+                if len(tables) != 1:
+                    raise CommandError("테이블을 여럿 내보낼 때는 --since-id posts=123 처럼 테이블마다 적어 주세요.")
+                table = tables[0]
+            if table not in tables:
+                raise CommandError(f"--since-id 의 테이블 {table} 은 내보낼 테이블이 아닙니다.")
+            try:
+                since_ids[table] = int(raw_id)
+            except ValueError:
+                raise CommandError(f"--since-id 값을 읽을 수 없습니다: {value}")
+        return since_ids
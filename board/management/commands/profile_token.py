@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from board.profiling import TOKEN_MAX_AGE, make_profile_token
+
+
+class Command(BaseCommand):
+    help = "요청 프로파일링용 X-Board-Profile 헤더 값을 서명해 출력합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path_prefix", nargs="?", default="/", help="프로파일을 허용할 경로 접두어")
+
+    def handle(self, *args, **options):
+        token = make_profile_token(options["path_prefix"])
+        self.stdout.write(f"X-Board-Profile: {token}")
+        self.stdout.write(f"({TOKEN_MAX_AGE // 60}분 동안 유효합니다.)")
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from board.counters import rebuild_counters
+
+
+class Command(BaseCommand):
+    help = "게시판 목록 페이지네이션에 쓰는 카운터를 실제 행 수로 다시 계산합니다."
+
+    def handle(self, *args, **options):
+        values = rebuild_counters()
+        for name, value in sorted(values.items()):
+            self.stdout.write(f"{name}: {value}")
+        self.stdout.write(self.style.SUCCESS(f"{len(values)}개 카운터를 다시 계산했습니다."))
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from board.caching import BOARD_MATCH, bump_board_generation
+from board.facets import rebuild_facets
+
+
+class Command(BaseCommand):
+    help = "해외축구 리그/연도 필터와 탭별 경기 수를 soccer_matches 에서 다시 계산합니다."
+
+    def handle(self, *args, **options):
+        total = rebuild_facets()
+        bump_board_generation(BOARD_MATCH)
+        self.stdout.write(self.style.SUCCESS(f"리그/연도 {total}개를 다시 계산했습니다."))
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from board.counters import rebuild_counters
+from board.rankings import rebuild_rankings, refresh_trending_scores
+
+
+class Command(BaseCommand):
+    help = "추천 랭킹의 트렌딩 점수를 배치로 다시 계산합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rebuild",
+            action="store_true",
+            help="좋아요 수까지 through 테이블에서 전부 다시 집계합니다.",
+        )
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        if options["rebuild"]:
+            total = rebuild_rankings(batch_size=options["batch_size"])
+            rebuild_counters()
+            self.stdout.write(self.style.SUCCESS(f"랭킹 {total}건을 다시 만들었습니다."))
+            return
+
+        updated = refresh_trending_scores(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"트렌딩 점수 {updated}건을 갱신했습니다."))
@@ -0,0 +1,61 @@
+import asyncio
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from board.loadtest import cookie_headers, parse_access_log, replay, synthetic_requests
+
+
+class Command(BaseCommand):
+    help = "접근 로그나 합성 요청을 로컬 서버에 동시에 재생해 경로별 처리량과 지연 시간을 측정합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+        parser.add_argument("--log", help="재생할 접근 로그 파일. 없으면 합성 요청을 만듭니다.")
+        parser.add_argument("--requests", type=int, default=1000, help="합성 요청 수")
+        parser.add_argument("--concurrency", type=int, default=10)
+        parser.add_argument("--repeat", type=int, default=1, help="요청 목록을 반복할 횟수")
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--timeout", type=float, default=10.0)
+        parser.add_argument("--cookie", help="로그인 세션 쿠키 (예: 'sessionid=...; csrftoken=...')")
+        parser.add_argument("--output", help="보고서를 저장할 JSON 경로")
+
+    def handle(self, *args, **options):
+        if options["concurrency"] <= 0:
+            raise CommandError("--concurrency 는 1 이상이어야 합니다.")
+
+        if options["log"]:
+            with open(options["log"], encoding="utf-8", errors="replace") as handle:
+                requests = parse_access_log(handle)
+        else:
+            requests = synthetic_requests(options["requests"], seed=options["seed"])
+        requests = requests * options["repeat"]
+        if not requests:
+            raise CommandError("재생할 요청이 없습니다.")
+
+        self.stdout.write(f"{len(requests)}개 요청을 동시 {options['concurrency']}개로 재생합니다.")
+        try:
+            report = asyncio.run(replay(
+                requests,
+                options["base_url"],
+                concurrency=options["concurrency"],
+                headers=cookie_headers(options["cookie"]),
+                timeout=options["timeout"],
+            ))
+        except ValueError as error:
+            raise CommandError(str(error))
+
+        for route, result in report["routes"].items():
+            self.stdout.write(
+                f"{route:<28} {result['requests']:>6}건 {result['throughput_rps']:>8.1f} req/s  "
+                f"p50 {result['p50_ms']:>8.1f}ms  p95 {result['p95_ms']:>8.1f}ms  "
+                f"p99 {result['p99_ms']:>8.1f}ms  오류 {result['error_rate']:.1%}"
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f"전체 {report['requests']}건, {report['throughput_rps']:.1f} req/s, 오류율 {report['error_rate']:.1%}"
+        ))
+
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as handle:
+                json.dump(report, handle, ensure_ascii=False, indent=2)
+                handle.write("\n")
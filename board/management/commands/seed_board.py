@@ -0,0 +1,63 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from board.caching import (
+    BOARD_AI,
+    BOARD_LINK,
+    BOARD_MATCH,
+    BOARD_POST,
+    BOARD_SECRET,
+    BOARD_THREAD,
+    bump_board_generation,
+)
+from board.seeding import DISTRIBUTIONS, BoardSeeder
+
+
+class Command(BaseCommand):
+    help = "운영 규모를 재현하기 위한 합성 데이터를 bulk_create 로 빠르게 생성합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=10_000)
+        parser.add_argument("--posts", type=int, default=1_000_000)
+        parser.add_argument("--comments", type=int, default=3_000_000)
+        parser.add_argument("--likes", type=int, default=5_000_000)
+        parser.add_argument("--infoposts", type=int, default=200_000)
+        parser.add_argument("--info-likes", type=int, default=500_000)
+        parser.add_argument("--links", type=int, default=300_000)
+        parser.add_argument("--seasons", type=int, nargs="*", default=[2026, 2027], help="생성할 경기 시즌(연도)")
+        parser.add_argument("--seed", type=int, default=0, help="같은 값이면 같은 데이터가 만들어집니다.")
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument("--distribution", choices=DISTRIBUTIONS, default="zipf",
+                            help="댓글/좋아요가 게시글에 몰리는 분포")
+        parser.add_argument("--zipf-exponent", type=float, default=1.1)
+        parser.add_argument("--secret-ratio", type=float, default=0.1)
+        parser.add_argument("--reply-ratio", type=float, default=0.3)
+
+    def handle(self, *args, **options):
+        if options["batch_size"] <= 0:
+            raise CommandError("--batch-size 는 1 이상이어야 합니다.")
+
+        started = time.perf_counter()
+        seeder = BoardSeeder(
+            seed=options["seed"],
+            batch_size=options["batch_size"],
+            distribution=options["distribution"],
+            zipf_exponent=options["zipf_exponent"],
+            secret_ratio=options["secret_ratio"],
+            reply_ratio=options["reply_ratio"],
+            log=self.stdout.write,
+        )
+        seeder.seed(
+            users=options["users"],
+            posts=options["posts"],
+            comments=options["comments"],
+            likes=options["likes"],
+            infoposts=options["infoposts"],
+            info_likes=options["info_likes"],
+            links=options["links"],
+            match_seasons=options["seasons"],
+        )
+        bump_board_generation(BOARD_POST, BOARD_SECRET, BOARD_THREAD, BOARD_AI, BOARD_LINK, BOARD_MATCH)
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(f"데이터 생성을 마쳤습니다 ({elapsed:.1f}초)."))
@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand
+
+from board.caching import BOARD_MATCH, bump_board_generation
+from board.facets import rebuild_facets
+from board.ratings import update_ratings
+from board.standings import rebuild_standings, sync_score_columns, sync_standings
+from board.teams import sync_match_teams
+
+
+class Command(BaseCommand):
+    help = (
+        "외부 수집기가 바꾼 경기 결과를 리그 순위표와 레이팅, 리그/연도 필터(facet)에 반영합니다. "
+        "수집기가 soccer_matches 에 쓴 뒤(또는 cron 으로 주기적으로) 실행하세요."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rebuild",
+            action="store_true",
+            help="순위표와 원장을 경기 결과에서 전부 다시 만듭니다.",
+        )
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        # 일정/결과 탭(status)은 DB 가 score 에서 계산하므로, 수집기가 score 만 바꾼 행의 골 컬럼만 맞춘다.
+        fixed = sync_score_columns(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"경기 {fixed}건의 골 컬럼을 다시 계산했습니다."))
+        # 순위표와 레이팅은 팀 FK 로 세므로, 수집기가 넣어 팀 FK 가 빈 경기부터 별칭으로 잇는다.
+        linked = sync_match_teams()
+        self.stdout.write(self.style.SUCCESS(f"경기 팀 {linked}건을 연결했습니다."))
+        if options["rebuild"]:
+            total = rebuild_standings(batch_size=options["batch_size"])
+            self.stdout.write(self.style.SUCCESS(f"팀 순위 {total}건을 다시 만들었습니다."))
+        else:
+            changed = sync_standings(batch_size=options["batch_size"])
+            self.stdout.write(self.style.SUCCESS(f"경기 {changed}건의 결과를 순위표에 반영했습니다."))
+
+        # 수집기가 넣은 새 리그/시즌은 시그널이 없으므로 필터 버튼도 여기서 다시 센다.
+        facets = rebuild_facets()
+        self.stdout.write(self.style.SUCCESS(f"리그/연도 {facets}개를 다시 계산했습니다."))
+
+        # 레이팅은 순위표 원장을 읽으므로 원장을 맞춘 뒤 바뀐 라운드만 이어서 계산한다.
+        rounds = update_ratings()
+        bump_board_generation(BOARD_MATCH)
+        self.stdout.write(self.style.SUCCESS(f"{rounds}개 라운드의 레이팅을 계산했습니다."))
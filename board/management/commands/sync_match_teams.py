@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from board.caching import BOARD_MATCH, bump_board_generation
+from board.teams import sync_match_teams
+
+
+class Command(BaseCommand):
+    help = "외부 수집기가 넣은 경기의 팀 이름을 별칭으로 풀어 팀 FK 를 채웁니다."
+
+    def handle(self, *args, **options):
+        linked = sync_match_teams()
+        if linked:
+            bump_board_generation(BOARD_MATCH)
+        self.stdout.write(self.style.SUCCESS(f"경기 팀 {linked}건을 연결했습니다."))
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from board.caching import BOARD_MATCH, bump_board_generation
+from board.ratings import update_ratings
+
+
+class Command(BaseCommand):
+    help = "새 경기 결과가 들어온 라운드부터 팀 Elo/Poisson 레이팅을 다시 계산합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rebuild",
+            action="store_true",
+            help="모든 리그의 레이팅을 첫 라운드부터 다시 계산합니다.",
+        )
+
+    def handle(self, *args, **options):
+        rounds = update_ratings(rebuild=options["rebuild"])
+        if rounds:
+            bump_board_generation(BOARD_MATCH)
+        self.stdout.write(self.style.SUCCESS(f"{rounds}개 라운드의 레이팅을 계산했습니다."))
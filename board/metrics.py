@@ -0,0 +1,127 @@
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.urls import URLPattern, URLResolver, get_resolver
+
+
+FLUSH_INTERVAL = getattr(settings, "BOARD_METRICS_FLUSH_INTERVAL", 10)
+KEY_PREFIX = "board:metrics"
+
+SECONDS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+
+def _known_view_names():
+    names = ["unknown"]
+
+    def walk(patterns, namespace):
+        for pattern in patterns:
+            if isinstance(pattern, URLResolver):
+                child = pattern.namespace
+                walk(pattern.url_patterns, f"{namespace}:{child}" if namespace and child else child or namespace)
+            elif isinstance(pattern, URLPattern) and pattern.name:
+                names.append(f"{namespace}:{pattern.name}" if namespace else pattern.name)
+
+    walk(get_resolver().url_patterns, "")
+    return names
+
+
+class Histogram:
+    def __init__(self, name, help_text, label, buckets, unit_scale=1_000_000, labels=_known_view_names):
+        self.name = name
+        self.help_text = help_text
+        self.label = label
+        self.buckets = buckets
+        # 캐시 incr는 정수만 받으므로 합계는 unit_scale 배 한 정수로 저장한다.
+        self.unit_scale = unit_scale
+        self.labels = labels
+
+    def series_keys(self, label_value):
+        base = f"{KEY_PREFIX}:{self.name}:{label_value}"
+        bucket_keys = [f"{base}:le:{bound}" for bound in self.buckets]
+        return bucket_keys, f"{base}:sum", f"{base}:count"
+
+
+class MetricsRegistry:
+    # 요청마다 캐시에 쓰지 않도록 프로세스 안에서 모았다가 주기적으로 공유 캐시에 더한다.
+    # 여러 워커 프로세스의 값은 캐시 백엔드(memcached/redis)에서 합쳐진다.
+    def __init__(self):
+        self.histograms = {}
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+
+    def register(self, histogram):
+        self.histograms[histogram.name] = histogram
+        return histogram
+
+    def observe(self, name, label_value, value, flush=True):
+        # flush=False 면 메모리에만 쌓는다. 이벤트 루프에서 부르는 쪽은 flush_due() 를 보고 따로 비운다.
+        histogram = self.histograms[name]
+        bucket_keys, sum_key, count_key = histogram.series_keys(label_value)
+        with self._lock:
+            for bound, key in zip(histogram.buckets, bucket_keys):
+                if value <= bound:
+                    self._pending[key] = self._pending.get(key, 0) + 1
+            self._pending[sum_key] = self._pending.get(sum_key, 0) + int(value * histogram.unit_scale)
+            self._pending[count_key] = self._pending.get(count_key, 0) + 1
+            due = time.monotonic() - self._last_flush >= FLUSH_INTERVAL
+        if due and flush:
+            self.flush()
+
+    def flush_due(self):
+        return time.monotonic() - self._last_flush >= FLUSH_INTERVAL
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._last_flush = time.monotonic()
+        for key, delta in pending.items():
+            try:
+                cache.incr(key, delta)
+            except ValueError:
+                if not cache.add(key, delta, None):
+                    cache.incr(key, delta)
+
+    def render(self):
+        self.flush()
+        lines = []
+        for histogram in self.histograms.values():
+            lines.append(f"# HELP {histogram.name} {histogram.help_text}")
+            lines.append(f"# TYPE {histogram.name} histogram")
+            label_values = histogram.labels()
+            keys = []
+            for label_value in label_values:
+                bucket_keys, sum_key, count_key = histogram.series_keys(label_value)
+                keys.extend(bucket_keys + [sum_key, count_key])
+            values = cache.get_many(keys)
+            for label_value in label_values:
+                bucket_keys, sum_key, count_key = histogram.series_keys(label_value)
+                count = values.get(count_key)
+                if not count:
+                    continue
+                label = f'{histogram.label}="{label_value}"'
+                for bound, key in zip(histogram.buckets, bucket_keys):
+                    lines.append(f'{histogram.name}_bucket{{{label},le="{bound}"}} {values.get(key, 0)}')
+                lines.append(f'{histogram.name}_bucket{{{label},le="+Inf"}} {count}')
+                lines.append(f"{histogram.name}_sum{{{label}}} {values.get(sum_key, 0) / histogram.unit_scale}")
+                lines.append(f"{histogram.name}_count{{{label}}} {count}")
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+REQUEST_DURATION = registry.register(
+    Histogram("board_request_duration_seconds", "View response time.", "view", SECONDS_BUCKETS)
+)
+DB_DURATION = registry.register(
+    Histogram("board_db_duration_seconds", "Database time per request.", "view", SECONDS_BUCKETS)
+)
+TEMPLATE_DURATION = registry.register(
+    Histogram("board_template_duration_seconds", "Template render time per request.", "view", SECONDS_BUCKETS)
+)
+DB_QUERIES = registry.register(
+    Histogram("board_db_queries", "Database queries per request.", "view", QUERY_COUNT_BUCKETS, unit_scale=1)
+)
@@ -0,0 +1,134 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.template.base import Template
+
+from .metrics import DB_DURATION, DB_QUERIES, REQUEST_DURATION, TEMPLATE_DURATION, registry
+
+
+_current_timing = ContextVar("board_request_timing", default=None)
+_template_timer_installed = False
+
+
+class RequestTiming:
+    def __init__(self):
+        self.query_count = 0
+        self.db_seconds = 0.0
+        self.template_seconds = 0.0
+        self.template_depth = 0
+
+    def db_wrapper(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_seconds += time.perf_counter() - start
+            self.query_count += 1
+
+
+def _time_query(execute, sql, params, many, context):
+    timing = _current_timing.get()
+    if timing is None:
+        return execute(sql, params, many, context)
+    return timing.db_wrapper(execute, sql, params, many, context)
+
+
+def install_query_timer(connection, **kwargs):
+    # 연결은 스레드마다 따로라서 요청마다 붙이지 않고 연결마다 한 번 붙여 둔다.
+    # 어느 요청의 쿼리인지는 sync_to_async 가 스레드로 복사해 가는 contextvar 로 가린다.
+    if _time_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_time_query)
+
+
+def install_template_timer():
+    # include 로 중첩된 렌더링은 바깥 렌더링 시간에 포함되므로 최상위 한 번만 잰다.
+    global _template_timer_installed
+    if _template_timer_installed:
+        return
+    original_render = Template.render
+
+    @wraps(original_render)
+    def timed_render(self, context):
+        timing = _current_timing.get()
+        if timing is None:
+            return original_render(self, context)
+        timing.template_depth += 1
+        start = time.perf_counter()
+        try:
+            return original_render(self, context)
+        finally:
+            timing.template_depth -= 1
+            if timing.template_depth == 0:
+                timing.template_seconds += time.perf_counter() - start
+
+    Template.render = timed_render
+    _template_timer_installed = True
+
+
+def _server_timing_header(timing, total_seconds):
+    return ", ".join([
+        f'db;dur={timing.db_seconds * 1000:.1f};desc="{timing.query_count} queries"',
+        f"tpl;dur={timing.template_seconds * 1000:.1f}",
+        f"total;dur={total_seconds * 1000:.1f}",
+    ])
+
+
+class PerformanceMiddleware:
+    # ASGI 에서는 비동기 경로로 돌아 async 뷰(좋아요, SSE) 앞뒤로 스레드를 오가지 않는다.
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        install_template_timer()
+        connection_created.connect(install_query_timer, dispatch_uid="board_query_timer")
+        for connection in connections.all(initialized_only=True):
+            install_query_timer(connection)
+
+    @contextmanager
+    def _measure(self):
+        timing = RequestTiming()
+        token = _current_timing.set(timing)
+        try:
+            yield timing
+        finally:
+            _current_timing.reset(token)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        start = time.perf_counter()
+        with self._measure() as timing:
+            response = self.get_response(request)
+        self._finish(request, response, timing, time.perf_counter() - start)
+        if registry.flush_due():
+            registry.flush()
+        return response
+
+    async def __acall__(self, request):
+        start = time.perf_counter()
+        with self._measure() as timing:
+            response = await self.get_response(request)
+        self._finish(request, response, timing, time.perf_counter() - start)
+        # flush 는 캐시에 블로킹으로 쓰므로 이벤트 루프 밖 스레드에서 돌린다.
+        if registry.flush_due():
+            await sync_to_async(registry.flush)()
+        return response
+
+    def _finish(self, request, response, timing, total_seconds):
+        # 스트리밍 응답은 본문을 만들기 전까지만 잰다. 여기서는 메모리 집계만 하고 flush 는 호출한 쪽이 한다.
+        response["Server-Timing"] = _server_timing_header(timing, total_seconds)
+        match = getattr(request, "resolver_match", None)
+        view_name = match.view_name if match else "unknown"
+        registry.observe(REQUEST_DURATION.name, view_name, total_seconds, flush=False)
+        registry.observe(DB_DURATION.name, view_name, timing.db_seconds, flush=False)
+        registry.observe(TEMPLATE_DURATION.name, view_name, timing.template_seconds, flush=False)
+        registry.observe(DB_QUERIES.name, view_name, timing.query_count, flush=False)
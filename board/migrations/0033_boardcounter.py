@@ -0,0 +1,49 @@
+# Generated by Django 5.2.9 on 2026-10-19 15:22
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+POPULAR_LINK_CATEGORIES = ['best', 'xart', 'movie', 'itnews', 'ground', 'stock']
+
+
+def backfill_board_counters(apps, schema_editor):
+    Post = apps.get_model('board', 'Post')
+    InfoPost = apps.get_model('board', 'InfoPost')
+    LinkPost = apps.get_model('board', 'LinkPost')
+    BoardCounter = apps.get_model('board', 'BoardCounter')
+    values = {}
+    for prefix, model in (('post', Post), ('info', InfoPost), ('link', LinkPost)):
+        for row in model.objects.values('category').annotate(total=Count('id')):
+            values[f"{prefix}:{row['category']}"] = row['total']
+    values['link:recommended'] = LinkPost.objects.filter(
+        category__in=POPULAR_LINK_CATEGORIES,
+        is_recommended=True,
+    ).count()
+    values['post:common:liked'] = (
+        Post.likes.through.objects.filter(post__category='common')
+        .values('post_id')
+        .distinct()
+        .count()
+    )
+    BoardCounter.objects.bulk_create(BoardCounter(name=name, value=value) for name, value in values.items())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('board', '0032_soccermatch_result_bet'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BoardCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=64, unique=True)),
+                ('value', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.RunPython(backfill_board_counters, migrations.RunPython.noop),
+    ]
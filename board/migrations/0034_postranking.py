@@ -0,0 +1,56 @@
+# Generated by Django 5.2.9 on 2026-10-19 15:24
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+from django.utils import timezone
+
+
+TRENDING_GRAVITY = 1.8
+
+
+def backfill_post_rankings(apps, schema_editor):
+    Post = apps.get_model('board', 'Post')
+    PostRanking = apps.get_model('board', 'PostRanking')
+    now = timezone.now()
+    rows = (
+        Post.objects.annotate(total_likes=Count('likes'))
+        .filter(total_likes__gt=0)
+        .values_list('id', 'category', 'created_at', 'total_likes')
+    )
+    rankings = []
+    for post_id, category, created_at, like_count in rows.iterator(chunk_size=500):
+        age_hours = max((now - created_at).total_seconds() / 3600, 0)
+        rankings.append(PostRanking(
+            post_id=post_id,
+            category=category,
+            like_count=like_count,
+            trending_score=like_count / (age_hours + 2) ** TRENDING_GRAVITY,
+            post_created_at=created_at,
+        ))
+    PostRanking.objects.bulk_create(rankings, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('board', '0033_boardcounter'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostRanking',
+            fields=[
+                ('post', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='ranking', serialize=False, to='board.post')),
+                ('category', models.CharField(max_length=20)),
+                ('like_count', models.PositiveIntegerField(default=0)),
+                ('trending_score', models.FloatField(default=0)),
+                ('post_created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['category', '-like_count', '-post'], name='board_rank_likes_idx'), models.Index(fields=['category', '-trending_score'], name='board_rank_trending_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_post_rankings, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,78 @@
+# Generated by Django 5.2.9 on 2026-10-19 15:26
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import CharField, Count, F, OuterRef, Subquery, Value
+from django.db.models.functions import Cast, Coalesce, LPad
+
+
+def backfill_comment_counts(apps, schema_editor):
+    Post = apps.get_model('board', 'Post')
+    Comment = apps.get_model('board', 'Comment')
+    counts = (
+        Comment.objects.filter(post=OuterRef('pk'))
+        .order_by()
+        .values('post')
+        .annotate(total=Count('id'))
+        .values('total')
+    )
+    Post.objects.update(comment_count=Coalesce(Subquery(counts), 0))
+
+
+def backfill_comment_paths(apps, schema_editor):
+    # 기존 댓글은 모두 최상위 댓글이므로 자기 id가 곧 스레드와 경로가 된다.
+    Comment = apps.get_model('board', 'Comment')
+    Comment.objects.update(
+        thread_id=F('id'),
+        path=LPad(Cast('id', output_field=CharField()), 10, Value('0')),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('board', '0034_postranking'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='comment_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='depth',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='parent',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='replies', to='board.comment'),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='path',
+            field=models.CharField(blank=True, default='', max_length=121),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='reply_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='thread_id',
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+        migrations.RunPython(backfill_comment_counts, migrations.RunPython.noop),
+        migrations.RunPython(backfill_comment_paths, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['post', 'depth', 'created_at'], name='board_comment_post_root_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['thread_id', 'path'], name='board_comment_thread_path_idx'),
+        ),
+    ]
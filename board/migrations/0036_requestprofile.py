@@ -0,0 +1,39 @@
+# Generated by Django 5.2.9 on 2026-10-19 15:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    replaces = [
+        ('board', '0037_requestprofile'),
+    ]
+
+    dependencies = [
+        ('board', '0035_comment_threads'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RequestProfile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('method', models.CharField(max_length=10)),
+                ('path', models.CharField(max_length=500)),
+                ('view_name', models.CharField(blank=True, max_length=100)),
+                ('status_code', models.PositiveSmallIntegerField(blank=True, null=True)),
+                ('username', models.CharField(blank=True, max_length=150)),
+                ('trigger', models.CharField(max_length=10)),
+                ('duration_ms', models.FloatField()),
+                ('sample_interval_ms', models.FloatField()),
+                ('sample_count', models.PositiveIntegerField(default=0)),
+                ('collapsed_stacks', models.TextField(blank=True)),
+                ('query_count', models.PositiveIntegerField(default=0)),
+                ('queries', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.9 on 2026-10-19 15:42
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_like_counts(apps, schema_editor):
+    for model_name, owner_field in (('Post', 'post'), ('InfoPost', 'infopost')):
+        model = apps.get_model('board', model_name)
+        through = model.likes.through
+        counts = (
+            through.objects.filter(**{owner_field: OuterRef('pk')})
+            .order_by()
+            .values(owner_field)
+            .annotate(total=Count('id'))
+            .values('total')
+        )
+        model.objects.update(like_count=Coalesce(Subquery(counts), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('board', '0036_requestprofile'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='infopost',
+            name='like_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='like_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_like_counts, migrations.RunPython.noop),
+    ]
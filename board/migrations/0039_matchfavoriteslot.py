@@ -0,0 +1,44 @@
+# Generated by Django 5.2.9 on 2026-10-19 15:50
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+FAVORITE_SLOTS = 10
+
+
+def move_favorites_to_slots(apps, schema_editor):
+    SoccerMatch = apps.get_model('board', 'SoccerMatch')
+    MatchFavoriteSlot = apps.get_model('board', 'MatchFavoriteSlot')
+    BoardCounter = apps.get_model('board', 'BoardCounter')
+    favorites = list(
+        SoccerMatch.objects.filter(is_recommended=True)
+        .order_by('-liked_at', '-id')
+        .values_list('id', 'liked_at')[:FAVORITE_SLOTS]
+    )
+    favorites.reverse()
+    slots = []
+    for slot in range(FAVORITE_SLOTS):
+        match_id, liked_at = favorites[slot] if slot < len(favorites) else (None, None)
+        slots.append(MatchFavoriteSlot(slot=slot, match_id=match_id, liked_at=liked_at))
+    MatchFavoriteSlot.objects.bulk_create(slots)
+    BoardCounter.objects.update_or_create(name='match:favorites', defaults={'value': len(favorites)})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('board', '0038_like_counts'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MatchFavoriteSlot',
+            fields=[
+                ('slot', models.PositiveSmallIntegerField(primary_key=True, serialize=False)),
+                ('liked_at', models.DateTimeField(blank=True, null=True)),
+                ('match', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='favorite_slot', to='board.soccermatch')),
+            ],
+        ),
+        migrations.RunPython(move_favorites_to_slots, migrations.RunPython.noop),
+    ]
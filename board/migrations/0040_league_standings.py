@@ -0,0 +1,95 @@
+# Generated by Django 5.2.9 on 2026-10-19 15:53
+
+import re
+from collections import defaultdict
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+SCORE_PATTERN = re.compile(r"^\s*(\d+)\s*[:\-]\s*(\d+)\s*$")
+STAT_FIELDS = ('played', 'won', 'drawn', 'lost', 'goals_for', 'goals_against', 'goal_difference', 'points')
+
+
+def backfill_league_standings(apps, schema_editor):
+    SoccerMatch = apps.get_model('board', 'SoccerMatch')
+    TeamStanding = apps.get_model('board', 'TeamStanding')
+    MatchStanding = apps.get_model('board', 'MatchStanding')
+    rows = (
+        SoccerMatch.objects.exclude(score__isnull=True)
+        .exclude(score='')
+        .exclude(year__isnull=True)
+        .order_by('id')
+        .values_list('id', 'league', 'year', 'home_team', 'away_team', 'score')
+    )
+    totals = defaultdict(lambda: dict.fromkeys(STAT_FIELDS, 0))
+    entries = []
+    for match_id, league, year, home_team, away_team, score in rows.iterator(chunk_size=500):
+        matched = SCORE_PATTERN.match(score)
+        if matched is None:
+            continue
+        home_goals, away_goals = int(matched.group(1)), int(matched.group(2))
+        entries.append(MatchStanding(
+            match_id=match_id, league=league, year=year, home_team=home_team, away_team=away_team,
+            home_goals=home_goals, away_goals=away_goals,
+        ))
+        for team, goals_for, goals_against in ((home_team, home_goals, away_goals), (away_team, away_goals, home_goals)):
+            stats = totals[(league, year, team)]
+            stats['played'] += 1
+            stats['won'] += goals_for > goals_against
+            stats['drawn'] += goals_for == goals_against
+            stats['lost'] += goals_for < goals_against
+            stats['goals_for'] += goals_for
+            stats['goals_against'] += goals_against
+            stats['goal_difference'] += goals_for - goals_against
+            stats['points'] += 3 if goals_for > goals_against else 1 if goals_for == goals_against else 0
+    MatchStanding.objects.bulk_create(entries, batch_size=500)
+    TeamStanding.objects.bulk_create(
+        (TeamStanding(league=league, year=year, team=team, **stats) for (league, year, team), stats in totals.items()),
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('board', '0039_matchfavoriteslot'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MatchStanding',
+            fields=[
+                ('match', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='standing_entry', serialize=False, to='board.soccermatch')),
+                ('league', models.CharField(max_length=20)),
+                ('year', models.PositiveSmallIntegerField()),
+                ('home_team', models.CharField(max_length=100)),
+                ('away_team', models.CharField(max_length=100)),
+                ('home_goals', models.PositiveSmallIntegerField()),
+                ('away_goals', models.PositiveSmallIntegerField()),
+            ],
+        ),
+        migrations.CreateModel(
+            name='TeamStanding',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('league', models.CharField(max_length=20)),
+                ('year', models.PositiveSmallIntegerField()),
+                ('team', models.CharField(max_length=100)),
+                ('played', models.PositiveIntegerField(default=0)),
+                ('won', models.PositiveIntegerField(default=0)),
+                ('drawn', models.PositiveIntegerField(default=0)),
+                ('lost', models.PositiveIntegerField(default=0)),
+                ('goals_for', models.PositiveIntegerField(default=0)),
+                ('goals_against', models.PositiveIntegerField(default=0)),
+                ('goal_difference', models.IntegerField(default=0)),
+                ('points', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['league', 'year', '-points', '-goal_difference', '-goals_for'], name='board_standing_table_idx')],
+                'constraints': [models.UniqueConstraint(fields=('league', 'year', 'team'), name='board_standing_team_unique')],
+            },
+        ),
+        migrations.RunPython(backfill_league_standings, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.9 on 2026-10-19 15:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('board', '0040_league_standings'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='matchstanding',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.CreateModel(
+            name='TeamRating',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('league', models.CharField(max_length=20)),
+                ('year', models.PositiveSmallIntegerField()),
+                ('round_num', models.CharField(max_length=20)),
+                ('sequence', models.PositiveIntegerField()),
+                ('team', models.CharField(max_length=100)),
+                ('elo', models.FloatField()),
+                ('attack', models.FloatField()),
+                ('defense', models.FloatField()),
+                ('goals_for_weight', models.FloatField(default=0)),
+                ('goals_against_weight', models.FloatField(default=0)),
+                ('games_weight', models.FloatField(default=0)),
+                ('computed_at', models.DateTimeField()),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('league', 'sequence', 'team'), name='board_rating_round_team_unique')],
+            },
+        ),
+    ]
@@ -0,0 +1,79 @@
+# Generated by Django 5.2.9 on 2026-10-19 15:59
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+TEAM_SIDES = (('home_team', 'home_club'), ('away_team', 'away_club'))
+
+
+def backfill_match_teams(apps, schema_editor):
+    SoccerMatch = apps.get_model('board', 'SoccerMatch')
+    Team = apps.get_model('board', 'Team')
+    TeamAlias = apps.get_model('board', 'TeamAlias')
+    for name_field, club_field in TEAM_SIDES:
+        empty = SoccerMatch.objects.filter(**{f'{club_field}__isnull': True})
+        names = list(empty.order_by().values_list(name_field, flat=True).distinct())
+        for name in names:
+            if not name:
+                continue
+            alias = TeamAlias.objects.select_related('team').filter(name=name).first()
+            if alias is None:
+                team, _ = Team.objects.get_or_create(name=name)
+                TeamAlias.objects.create(name=name, team=team)
+            else:
+                team = alias.team
+            empty.filter(**{name_field: name}).update(**{club_field: team})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('board', '0041_team_ratings'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Team',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('english_name', models.CharField(blank=True, max_length=100)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='TeamAlias',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='soccermatch',
+            name='away_club',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='away_matches', to='board.team'),
+        ),
+        migrations.AddField(
+            model_name='soccermatch',
+            name='home_club',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='home_matches', to='board.team'),
+        ),
+        migrations.AddIndex(
+            model_name='soccermatch',
+            index=models.Index(fields=['home_club', 'match_date'], name='board_match_home_club_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='soccermatch',
+            index=models.Index(fields=['away_club', 'match_date'], name='board_match_away_club_idx'),
+        ),
+        migrations.AddField(
+            model_name='teamalias',
+            name='team',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='aliases', to='board.team'),
+        ),
+        migrations.RunPython(backfill_match_teams, migrations.RunPython.noop),
+    ]
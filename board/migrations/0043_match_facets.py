@@ -0,0 +1,53 @@
+# Generated by Django 5.2.9 on 2026-10-19 16:01
+
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def backfill_match_facets(apps, schema_editor):
+    SoccerMatch = apps.get_model('board', 'SoccerMatch')
+    MatchFacet = apps.get_model('board', 'MatchFacet')
+    has_score = Q(score__isnull=False) & ~Q(score='')
+    rows = (
+        SoccerMatch.objects.filter(year__isnull=False)
+        .order_by()
+        .values('league', 'year')
+        .annotate(
+            result_count=Count('id', filter=has_score),
+            scheduled_count=Count('id', filter=~has_score),
+        )
+    )
+    MatchFacet.objects.bulk_create(
+        MatchFacet(
+            league=row['league'],
+            year=row['year'],
+            scheduled_count=row['scheduled_count'],
+            result_count=row['result_count'],
+        )
+        for row in rows
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('board', '0042_teams'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MatchFacet',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('league', models.CharField(max_length=20)),
+                ('year', models.PositiveSmallIntegerField()),
+                ('scheduled_count', models.IntegerField(default=0)),
+                ('result_count', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('league', 'year'), name='board_match_facet_unique')],
+            },
+        ),
+        migrations.RunPython(backfill_match_facets, migrations.RunPython.noop),
+    ]
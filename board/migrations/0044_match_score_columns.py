@@ -0,0 +1,50 @@
+# Generated by Django 5.2.9 on 2026-10-19 16:04
+
+import re
+
+from django.db import migrations, models
+
+
+SCORE_PATTERN = re.compile(r"^\s*(\d+)\s*[:\-]\s*(\d+)\s*$")
+
+
+def backfill_score_columns(apps, schema_editor):
+    # status 는 DB 가 계산하므로 골 수만 채운다.
+    SoccerMatch = apps.get_model('board', 'SoccerMatch')
+    rows = SoccerMatch.objects.exclude(score__isnull=True).exclude(score='').order_by('id').values_list('id', 'score')
+    parsed = []
+    for match_id, score in rows.iterator(chunk_size=500):
+        matched = SCORE_PATTERN.match(score)
+        if matched is not None:
+            parsed.append(SoccerMatch(id=match_id, home_goals=int(matched.group(1)), away_goals=int(matched.group(2))))
+    SoccerMatch.objects.bulk_update(parsed, ['home_goals', 'away_goals'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('board', '0043_match_facets'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='soccermatch',
+            name='away_goals',
+            field=models.PositiveSmallIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='soccermatch',
+            name='home_goals',
+            field=models.PositiveSmallIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='soccermatch',
+            name='status',
+            field=models.GeneratedField(db_persist=True, expression=models.Case(models.When(models.Q(('score__isnull', True), ('score', ''), _connector='OR'), then=models.Value(0)), default=models.Value(1)), output_field=models.PositiveSmallIntegerField(choices=[(0, '예정'), (1, '종료')])),
+        ),
+        migrations.AddIndex(
+            model_name='soccermatch',
+            index=models.Index(fields=['league', 'year', 'status', 'match_date'], name='board_match_tab_idx'),
+        ),
+        migrations.RunPython(backfill_score_columns, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,154 @@
+# Generated by Django 5.2.9 on 2026-10-19 16:30
+
+import re
+from collections import defaultdict
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+SCORE_PATTERN = re.compile(r"^\s*(\d+)\s*[:\-]\s*(\d+)\s*$")
+STAT_FIELDS = ('played', 'won', 'drawn', 'lost', 'goals_for', 'goals_against', 'goal_difference', 'points')
+TEAM_SIDES = (('home_team', 'home_club'), ('away_team', 'away_club'))
+
+
+def clear_team_tables(apps, schema_editor):
+    # 순위표/원장/레이팅은 경기에서 다시 만들 수 있는 값이므로 팀 이름 컬럼을 FK 로 바꾸기 전에 비운다.
+    for model_name in ('TeamRating', 'TeamStanding', 'MatchStanding'):
+        apps.get_model('board', model_name).objects.all().delete()
+
+
+def link_match_teams(apps):
+    SoccerMatch = apps.get_model('board', 'SoccerMatch')
+    Team = apps.get_model('board', 'Team')
+    TeamAlias = apps.get_model('board', 'TeamAlias')
+    for name_field, club_field in TEAM_SIDES:
+        empty = SoccerMatch.objects.filter(**{f'{club_field}__isnull': True})
+        names = list(empty.order_by().values_list(name_field, flat=True).distinct())
+        for name in names:
+            if not name:
+                continue
+            alias = TeamAlias.objects.select_related('team').filter(name=name).first()
+            if alias is None:
+                team, _ = Team.objects.get_or_create(name=name)
+                TeamAlias.objects.create(name=name, team=team)
+            else:
+                team = alias.team
+            empty.filter(**{name_field: name}).update(**{club_field: team})
+
+
+def backfill_team_standings(apps, schema_editor):
+    # 별칭으로 묶은 팀 FK 기준으로 원장과 순위표를 다시 만든다. 레이팅은 sync_league_standings 가 처음부터 계산한다.
+    link_match_teams(apps)
+    SoccerMatch = apps.get_model('board', 'SoccerMatch')
+    TeamStanding = apps.get_model('board', 'TeamStanding')
+    MatchStanding = apps.get_model('board', 'MatchStanding')
+    rows = (
+        SoccerMatch.objects.exclude(score__isnull=True)
+        .exclude(score='')
+        .exclude(year__isnull=True)
+        .exclude(home_club__isnull=True)
+        .exclude(away_club__isnull=True)
+        .order_by('id')
+        .values_list('id', 'league', 'year', 'home_club_id', 'away_club_id', 'score')
+    )
+    totals = defaultdict(lambda: dict.fromkeys(STAT_FIELDS, 0))
+    entries = []
+    for match_id, league, year, home_club_id, away_club_id, score in rows.iterator(chunk_size=500):
+        matched = SCORE_PATTERN.match(score)
+        if matched is None:
+            continue
+        home_goals, away_goals = int(matched.group(1)), int(matched.group(2))
+        entries.append(MatchStanding(
+            match_id=match_id, league=league, year=year, home_club_id=home_club_id, away_club_id=away_club_id,
+            home_goals=home_goals, away_goals=away_goals,
+        ))
+        for team_id, goals_for, goals_against in (
+            (home_club_id, home_goals, away_goals),
+            (away_club_id, away_goals, home_goals),
+        ):
+            stats = totals[(league, year, team_id)]
+            stats['played'] += 1
+            stats['won'] += goals_for > goals_against
+            stats['drawn'] += goals_for == goals_against
+            stats['lost'] += goals_for < goals_against
+            stats['goals_for'] += goals_for
+            stats['goals_against'] += goals_against
+            stats['goal_difference'] += goals_for - goals_against
+            stats['points'] += 3 if goals_for > goals_against else 1 if goals_for == goals_against else 0
+    MatchStanding.objects.bulk_create(entries, batch_size=500)
+    TeamStanding.objects.bulk_create(
+        (
+            TeamStanding(league=league, year=year, team_id=team_id, **stats)
+            for (league, year, team_id), stats in totals.items()
+        ),
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('board', '0044_match_score_columns'),
+    ]
+
+    operations = [
+        migrations.RunPython(clear_team_tables, migrations.RunPython.noop),
+        migrations.RemoveConstraint(
+            model_name='teamstanding',
+            name='board_standing_team_unique',
+        ),
+        migrations.RemoveConstraint(
+            model_name='teamrating',
+            name='board_rating_round_team_unique',
+        ),
+        migrations.RemoveField(
+            model_name='matchstanding',
+            name='away_team',
+        ),
+        migrations.RemoveField(
+            model_name='matchstanding',
+            name='home_team',
+        ),
+        migrations.RemoveField(
+            model_name='teamstanding',
+            name='team',
+        ),
+        migrations.RemoveField(
+            model_name='teamrating',
+            name='team',
+        ),
+        migrations.AddField(
+            model_name='matchstanding',
+            name='away_club',
+            field=models.ForeignKey(default=None, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='board.team'),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='matchstanding',
+            name='home_club',
+            field=models.ForeignKey(default=None, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='board.team'),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='teamstanding',
+            name='team',
+            field=models.ForeignKey(default=None, on_delete=django.db.models.deletion.CASCADE, related_name='standings', to='board.team'),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='teamrating',
+            name='team',
+            field=models.ForeignKey(default=None, on_delete=django.db.models.deletion.CASCADE, related_name='ratings', to='board.team'),
+            preserve_default=False,
+        ),
+        migrations.AddConstraint(
+            model_name='teamstanding',
+            constraint=models.UniqueConstraint(fields=('league', 'year', 'team'), name='board_standing_team_unique'),
+        ),
+        migrations.AddConstraint(
+            model_name='teamrating',
+            constraint=models.UniqueConstraint(fields=('league', 'sequence', 'team'), name='board_rating_round_team_unique'),
+        ),
+        migrations.RunPython(backfill_team_standings, clear_team_tables),
+    ]
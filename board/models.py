@@ -1,4 +1,6 @@
 ﻿import hashlib
+import re
+
 from django.db import models
 from django.core.exceptions import ValidationError
 from django.contrib.auth.models import User
@@ -12,10 +14,29 @@ class Post(models.Model):
     author = models.CharField(max_length=20, default='익명')
     is_recommended = models.BooleanField(default=False)
     likes = models.ManyToManyField(User, related_name='liked_posts', blank=True)
+    like_count = models.PositiveIntegerField(default=0)
+    comment_count = models.PositiveIntegerField(default=0)
 
     def __str__(self):
         return self.title
 
+class PostRanking(models.Model):
+    post = models.OneToOneField(Post, on_delete=models.CASCADE, primary_key=True, related_name='ranking')
+    category = models.CharField(max_length=20)
+    like_count = models.PositiveIntegerField(default=0)
+    trending_score = models.FloatField(default=0)
+    post_created_at = models.DateTimeField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['category', '-like_count', '-post'], name='board_rank_likes_idx'),
+            models.Index(fields=['category', '-trending_score'], name='board_rank_trending_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.post_id} ({self.like_count})"
+
 class PostImage(models.Model):
     post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='images')
     image = models.ImageField(upload_to='post_images/')
@@ -34,10 +55,43 @@ class Profile(models.Model):
         return self.nickname
 
 class Comment(models.Model):
+    PATH_SEGMENT_WIDTH = 10
+    MAX_DEPTH = 10
+
     post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='comments')
+    parent = models.ForeignKey('self', on_delete=models.CASCADE, null=True, blank=True, related_name='replies')
     author = models.CharField(max_length=20, default='익명')
     content = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
+    # 최상위 댓글 id. 스레드 전체를 (thread_id, path) 인덱스 범위 한 번으로 읽는다.
+    thread_id = models.BigIntegerField(null=True, blank=True)
+    path = models.CharField(max_length=(PATH_SEGMENT_WIDTH + 1) * (MAX_DEPTH + 1), blank=True, default='')
+    depth = models.PositiveSmallIntegerField(default=0)
+    reply_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['post', 'depth', 'created_at'], name='board_comment_post_root_idx'),
+            models.Index(fields=['thread_id', 'path'], name='board_comment_thread_path_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        is_new = self.pk is None
+        parent = self.parent if self.parent_id else None
+        if is_new and parent is not None:
+            if parent.depth >= self.MAX_DEPTH:
+                parent = parent.parent
+                self.parent = parent
+            self.post_id = parent.post_id
+            self.thread_id = parent.thread_id
+            self.depth = parent.depth + 1
+        super().save(*args, **kwargs)
+        if is_new:
+            segment = f"{self.pk:0{self.PATH_SEGMENT_WIDTH}d}"
+            self.path = f"{parent.path}.{segment}" if parent is not None else segment
+            if self.thread_id is None:
+                self.thread_id = self.pk
+            Comment.objects.filter(pk=self.pk).update(path=self.path, thread_id=self.thread_id)
 
     def __str__(self):
         return self.content[:20]
@@ -49,6 +103,7 @@ class InfoPost(models.Model):
     author = models.CharField(max_length=20, default='익명')
     created_at = models.DateTimeField(auto_now_add=True)
     likes = models.ManyToManyField(User, related_name='liked_infoposts', blank=True)
+    like_count = models.PositiveIntegerField(default=0)
 
     def __str__(self):
         return self.title
@@ -89,7 +144,60 @@ class LinkPost(models.Model):
     def __str__(self):
         return self.title
 
+class Team(models.Model):
+    # 경기 데이터의 팀 이름(한글/영문 표기가 섞여 들어온다)을 하나로 묶는 팀.
+    name = models.CharField(max_length=100, unique=True)
+    english_name = models.CharField(max_length=100, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['name']
+
+    def __str__(self):
+        return self.name
+
+
+class TeamAlias(models.Model):
+    # soccer_matches.home_team/away_team 에 실제로 들어오는 이름 하나가 어느 팀인지.
+    name = models.CharField(max_length=100, unique=True)
+    team = models.ForeignKey(Team, on_delete=models.CASCADE, related_name='aliases')
+
+    def __str__(self):
+        return f"{self.name} -> {self.team_id}"
+
+
+# 수집기가 넣는 스코어는 "2:1" 형태이고, 가끔 "2 - 1" 처럼 들어온다.
+SCORE_PATTERN = re.compile(r"^\s*(\d+)\s*[:\-]\s*(\d+)\s*$")
+
+
+def parse_score(score):
+    matched = SCORE_PATTERN.match(score or "")
+    if matched is None:
+        return None
+    return int(matched.group(1)), int(matched.group(2))
+
+
+# score 에서 계산해 저장하는 골 수 컬럼. SoccerMatch.save() 가 채우고, 수집기가 score 만 바꾼 행은 sync_score_columns 가 맞춘다.
+# 일정/결과 탭을 나누는 status 는 DB 가 score 에서 바로 계산한다(SoccerMatch.status).
+SCORE_COLUMNS = ('home_goals', 'away_goals')
+
+
+def score_columns(score):
+    # 읽을 수 없는 스코어("연기" 등)는 골 수를 비운다.
+    home_goals, away_goals = parse_score(score) or (None, None)
+    return {
+        'home_goals': home_goals,
+        'away_goals': away_goals,
+    }
+
+
 class SoccerMatch(models.Model):
+    STATUS_SCHEDULED = 0
+    STATUS_FINISHED = 1
+    STATUS_CHOICES = [
+        (STATUS_SCHEDULED, '예정'),
+        (STATUS_FINISHED, '종료'),
+    ]
     OUTCOME_HOME_WIN = 1
     OUTCOME_DRAW = 0
     OUTCOME_AWAY_WIN = 2
@@ -111,9 +219,28 @@ class SoccerMatch(models.Model):
     home_team = models.CharField(max_length=100)
     away_team = models.CharField(max_length=100)
     score = models.CharField(max_length=20, null=True, blank=True)
+    # 스코어가 있으면 종료 경기로 본다(예전 결과 탭 기준 그대로). 수집기가 score 만 UPDATE 해도 DB 가 같이 바꾼다.
+    status = models.GeneratedField(
+        expression=models.Case(
+            models.When(models.Q(score__isnull=True) | models.Q(score=''), then=models.Value(STATUS_SCHEDULED)),
+            default=models.Value(STATUS_FINISHED),
+        ),
+        output_field=models.PositiveSmallIntegerField(choices=STATUS_CHOICES),
+        db_persist=True,
+    )
+    home_goals = models.PositiveSmallIntegerField(null=True, blank=True)
+    away_goals = models.PositiveSmallIntegerField(null=True, blank=True)
     result = models.PositiveSmallIntegerField(choices=OUTCOME_CHOICES, null=True, blank=True)
     bet = models.PositiveSmallIntegerField(choices=OUTCOME_CHOICES, null=True, blank=True)
     year = models.PositiveSmallIntegerField(null=True, blank=True)
+    # 수집기는 팀 이름 문자열만 쓴다. 팀 FK 는 TeamAlias 로 풀어 채우며(teams.py), 인덱스는 Meta 의 복합 인덱스를 쓴다.
+    home_club = models.ForeignKey(
+        Team, on_delete=models.SET_NULL, null=True, blank=True, db_index=False, related_name='home_matches',
+    )
+    away_club = models.ForeignKey(
+        Team, on_delete=models.SET_NULL, null=True, blank=True, db_index=False, related_name='away_matches',
+    )
+    # 즐겨찾기는 MatchFavoriteSlot 으로 옮겼다. 외부 수집기도 soccer_matches 에 쓰므로 컬럼만 남겨 둔다.
     is_recommended = models.BooleanField(default=False)
     liked_at = models.DateTimeField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -121,10 +248,24 @@ class SoccerMatch(models.Model):
     class Meta:
         db_table = 'soccer_matches'
         ordering = ['match_date']
+        indexes = [
+            # match_list 의 일정/결과 탭: league, year, status 로 좁히고 match_date 순으로 읽는다.
+            models.Index(fields=['league', 'year', 'status', 'match_date'], name='board_match_tab_idx'),
+            models.Index(fields=['home_club', 'match_date'], name='board_match_home_club_idx'),
+            models.Index(fields=['away_club', 'match_date'], name='board_match_away_club_idx'),
+        ]
 
     def __str__(self):
         return f"{self.home_team} vs {self.away_team}"
 
+    def save(self, *args, **kwargs):
+        for field, value in score_columns(self.score).items():
+            setattr(self, field, value)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'score' in update_fields:
+            kwargs['update_fields'] = {*update_fields, *SCORE_COLUMNS}
+        super().save(*args, **kwargs)
+
     @property
     def has_bet(self):
         return self.bet is not None
@@ -161,3 +302,136 @@ class SoccerMatch(models.Model):
     @property
     def away_win_button_class(self):
         return self._prediction_button_class(self.OUTCOME_AWAY_WIN)
+
+
+class MatchFavoriteSlot(models.Model):
+    # 전역 즐겨찾기 경기 칸. 칸 수가 최대 즐겨찾기 수이며, 가득 차면 가장 오래된 칸을 덮어쓴다.
+    slot = models.PositiveSmallIntegerField(primary_key=True)
+    match = models.OneToOneField(
+        SoccerMatch, on_delete=models.SET_NULL, null=True, blank=True, related_name='favorite_slot',
+    )
+    liked_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.slot}: {self.match_id}"
+
+
+class TeamStanding(models.Model):
+    # 리그·시즌·팀별 누적 성적. 경기 결과가 들어오거나 정정될 때 standings.py 가 증감만 반영한다.
+    # 팀은 Team FK 로 묶으므로 같은 팀의 다른 표기(별칭)는 한 줄로 합쳐진다.
+    league = models.CharField(max_length=20)
+    year = models.PositiveSmallIntegerField()
+    team = models.ForeignKey(Team, on_delete=models.CASCADE, related_name='standings')
+    played = models.PositiveIntegerField(default=0)
+    won = models.PositiveIntegerField(default=0)
+    drawn = models.PositiveIntegerField(default=0)
+    lost = models.PositiveIntegerField(default=0)
+    goals_for = models.PositiveIntegerField(default=0)
+    goals_against = models.PositiveIntegerField(default=0)
+    goal_difference = models.IntegerField(default=0)
+    points = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['league', 'year', 'team'], name='board_standing_team_unique'),
+        ]
+        indexes = [
+            models.Index(
+                fields=['league', 'year', '-points', '-goal_difference', '-goals_for'],
+                name='board_standing_table_idx',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.league} {self.year} {self.team_id} ({self.points})"
+
+
+class MatchStanding(models.Model):
+    # 경기 한 건이 순위표에 더해 둔 값. 결과가 정정되거나 별칭이 다른 팀으로 옮겨지면 이 값을 빼고 새 값을 더한다.
+    # 팀을 지우기 전에 그 팀의 경기를 다른 팀으로 옮겨야 하므로 PROTECT 다.
+    match = models.OneToOneField(SoccerMatch, on_delete=models.CASCADE, primary_key=True, related_name='standing_entry')
+    league = models.CharField(max_length=20)
+    year = models.PositiveSmallIntegerField()
+    home_club = models.ForeignKey(Team, on_delete=models.PROTECT, related_name='+')
+    away_club = models.ForeignKey(Team, on_delete=models.PROTECT, related_name='+')
+    home_goals = models.PositiveSmallIntegerField()
+    away_goals = models.PositiveSmallIntegerField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.match_id} {self.home_goals}:{self.away_goals}"
+
+
+class TeamRating(models.Model):
+    # 리그의 라운드(sequence 순)가 끝날 때마다 찍어 두는 팀별 Elo/Poisson 상태. ratings.py 가 채운다.
+    # 가중 득실/경기 수는 다음 라운드를 이어서 계산할 때 쓰는 누적값이다.
+    league = models.CharField(max_length=20)
+    year = models.PositiveSmallIntegerField()
+    round_num = models.CharField(max_length=20)
+    sequence = models.PositiveIntegerField()
+    team = models.ForeignKey(Team, on_delete=models.CASCADE, related_name='ratings')
+    elo = models.FloatField()
+    attack = models.FloatField()
+    defense = models.FloatField()
+    goals_for_weight = models.FloatField(default=0)
+    goals_against_weight = models.FloatField(default=0)
+    games_weight = models.FloatField(default=0)
+    computed_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['league', 'sequence', 'team'], name='board_rating_round_team_unique'),
+        ]
+
+    def __str__(self):
+        return f"{self.league} {self.year} {self.round_num} {self.team_id} ({self.elo:.0f})"
+
+
+class MatchFacet(models.Model):
+    # match_list 필터(리그/연도)와 탭별 경기 수. 경기가 저장/삭제될 때 facets.py 가 증감을 반영한다.
+    league = models.CharField(max_length=20)
+    year = models.PositiveSmallIntegerField()
+    scheduled_count = models.IntegerField(default=0)
+    result_count = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['league', 'year'], name='board_match_facet_unique'),
+        ]
+
+    def __str__(self):
+        return f"{self.league} {self.year} ({self.scheduled_count}/{self.result_count})"
+
+
+class BoardCounter(models.Model):
+    name = models.CharField(max_length=64, unique=True)
+    value = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name}={self.value}"
+
+
+class RequestProfile(models.Model):
+    method = models.CharField(max_length=10)
+    path = models.CharField(max_length=500)
+    view_name = models.CharField(max_length=100, blank=True)
+    status_code = models.PositiveSmallIntegerField(null=True, blank=True)
+    username = models.CharField(max_length=150, blank=True)
+    trigger = models.CharField(max_length=10)
+    duration_ms = models.FloatField()
+    sample_interval_ms = models.FloatField()
+    sample_count = models.PositiveIntegerField(default=0)
+    # flamegraph.pl / speedscope 가 읽는 collapsed stack 형식 ("a;b;c 12" 줄 목록)
+    collapsed_stacks = models.TextField(blank=True)
+    query_count = models.PositiveIntegerField(default=0)
+    queries = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.method} {self.path} ({self.duration_ms:.0f}ms)"
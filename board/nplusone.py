@@ -0,0 +1,178 @@
+import logging
+import os
+import re
+import sys
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+
+logger = logging.getLogger("board.nplusone")
+
+DEFAULT_THRESHOLD = 5
+MIDDLEWARE_PATH = "board.nplusone.NPlusOneMiddleware"
+
+_BOARD_DIR = os.path.dirname(os.path.abspath(__file__))
+_THIS_FILE = os.path.abspath(__file__)
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\bIN\s*\((?:\s*%s\s*,?)+\)", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+
+_current_tracker = ContextVar("board_nplusone_tracker", default=None)
+
+
+class NPlusOneDetected(AssertionError):
+    pass
+
+
+def fingerprint(sql):
+    # 값만 다르고 모양이 같은 쿼리를 하나로 묶는다.
+    sql = _STRING_LITERAL.sub("%s", sql)
+    sql = _NUMBER_LITERAL.sub("%s", sql)
+    sql = _IN_LIST.sub("IN (...)", sql)
+    return _WHITESPACE.sub(" ", sql).strip()
+
+
+def _is_execute_wrapper(frame):
+    # 다른 모듈이 연결에 붙인 execute_wrapper(execute, sql, params, many, context) 는 쿼리를 부른 곳이 아니다.
+    return {"execute", "many", "context"} <= frame.f_locals.keys()
+
+
+def _query_origin():
+    python_origin = None
+    template_origin = None
+    frame = sys._getframe(2)
+    while frame is not None:
+        filename = os.path.abspath(frame.f_code.co_filename)
+        if template_origin is None and frame.f_code.co_name == "render_annotated":
+            node = frame.f_locals.get("self")
+            token = getattr(node, "token", None)
+            origin = getattr(node, "origin", None)
+            if token is not None and origin is not None:
+                template_origin = f"{origin.template_name}:{token.lineno}"
+        if (
+            python_origin is None
+            and filename.startswith(_BOARD_DIR)
+            and filename != _THIS_FILE
+            and not _is_execute_wrapper(frame)
+        ):
+            relative = os.path.relpath(filename, os.path.dirname(_BOARD_DIR))
+            python_origin = f"{relative}:{frame.f_lineno} in {frame.f_code.co_name}"
+        if python_origin and template_origin:
+            break
+        frame = frame.f_back
+    return template_origin, python_origin
+
+
+class QueryTracker:
+    def __init__(self, threshold=None):
+        self.threshold = threshold or getattr(settings, "BOARD_NPLUSONE_THRESHOLD", DEFAULT_THRESHOLD)
+        self.counts = Counter()
+        self.origins = {}
+
+    def __call__(self, execute, sql, params, many, context):
+        key = fingerprint(sql)
+        self.counts[key] += 1
+        if self.counts[key] == self.threshold:
+            self.origins[key] = _query_origin()
+        return execute(sql, params, many, context)
+
+    @property
+    def problems(self):
+        return [
+            {
+                "sql": sql,
+                "count": count,
+                "template": self.origins.get(sql, (None, None))[0],
+                "code": self.origins.get(sql, (None, None))[1],
+            }
+            for sql, count in self.counts.most_common()
+            if count >= self.threshold
+        ]
+
+    def report(self):
+        lines = []
+        for problem in self.problems:
+            where = ", ".join(filter(None, [problem["template"], problem["code"]])) or "unknown"
+            lines.append(f"{problem['count']}x [{where}] {problem['sql']}")
+        return "\n".join(lines)
+
+
+def _track_query(execute, sql, params, many, context):
+    tracker = _current_tracker.get()
+    if tracker is None:
+        return execute(sql, params, many, context)
+    return tracker(execute, sql, params, many, context)
+
+
+def install_query_tracker(connection, **kwargs):
+    # 연결은 스레드마다 따로라서 연결마다 한 번 붙여 두고, 지금 요청의 tracker 는 contextvar 로 찾는다.
+    # async 뷰의 ORM 호출이 도는 스레드에도 sync_to_async 가 contextvar 를 복사해 간다.
+    if _track_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_track_query)
+
+
+connection_created.connect(install_query_tracker, dispatch_uid="board_nplusone_tracker")
+
+
+@contextmanager
+def detect_n_plus_one(threshold=None, raise_error=False):
+    for connection in connections.all():
+        install_query_tracker(connection)
+    tracker = QueryTracker(threshold)
+    token = _current_tracker.set(tracker)
+    try:
+        yield tracker
+    finally:
+        _current_tracker.reset(token)
+    if raise_error and tracker.problems:
+        raise NPlusOneDetected("반복 쿼리(N+1)가 감지되었습니다:\n" + tracker.report())
+
+
+def _is_enabled():
+    return getattr(settings, "BOARD_NPLUSONE_ENABLED", settings.DEBUG)
+
+
+class NPlusOneMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if not _is_enabled():
+            return self.get_response(request)
+        with detect_n_plus_one() as tracker:
+            response = self.get_response(request)
+        return self._report(request, response, tracker)
+
+    async def __acall__(self, request):
+        if not _is_enabled():
+            return await self.get_response(request)
+        with detect_n_plus_one() as tracker:
+            response = await self.get_response(request)
+        return self._report(request, response, tracker)
+
+    def _report(self, request, response, tracker):
+        problems = tracker.problems
+        if problems:
+            message = f"{request.method} {request.path}\n{tracker.report()}"
+            if getattr(settings, "BOARD_NPLUSONE_RAISE", False):
+                raise NPlusOneDetected("반복 쿼리(N+1)가 감지되었습니다: " + message)
+            logger.warning("N+1 query pattern: %s", message)
+            response["X-Board-NPlusOne"] = str(len(problems))
+        return response
+
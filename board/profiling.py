@@ -0,0 +1,285 @@
+import json
+import logging
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core import signing
+from django.core.cache import cache
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.template.base import Template
+from django.urls import Resolver404, get_resolver
+
+from .models import RequestProfile
+
+
+logger = logging.getLogger("board.profiling")
+
+PROFILE_HEADER = "HTTP_X_BOARD_PROFILE"
+TOKEN_SALT = "board.profiling"
+TOKEN_MAX_AGE = 60 * 60
+ARM_CACHE_KEY = "board:profile:armed"
+RATE_CACHE_KEY = "board:profile:rate"
+DEFAULT_INTERVAL = 0.005
+DEFAULT_MAX_PER_MINUTE = 6
+MAX_STACK_DEPTH = 200
+MAX_QUERIES = 500
+
+# 한 프로세스에서 동시에 하나의 요청만 프로파일해 오버헤드 상한을 둔다.
+_active = threading.Lock()
+_current_recorder = ContextVar("board_query_recorder", default=None)
+
+
+def make_profile_token(path_prefix="/"):
+    return signing.TimestampSigner(salt=TOKEN_SALT).sign(path_prefix)
+
+
+def _token_allows(token, path):
+    try:
+        prefix = signing.TimestampSigner(salt=TOKEN_SALT).unsign(token, max_age=TOKEN_MAX_AGE)
+    except signing.BadSignature:
+        return False
+    return path.startswith(prefix)
+
+
+def arm_profiling(path_prefix, count=1, timeout=600):
+    # 관리자 화면에서 "다음 요청 N개" 를 켜 둔다. 여러 워커가 같은 캐시를 본다.
+    cache.set(
+        ARM_CACHE_KEY,
+        {"prefix": path_prefix, "remaining": count, "expires_at": time.time() + timeout},
+        timeout,
+    )
+
+
+def armed_profiling():
+    return cache.get(ARM_CACHE_KEY)
+
+
+def _take_armed_slot(path):
+    armed = cache.get(ARM_CACHE_KEY)
+    if not armed or not path.startswith(armed["prefix"]):
+        return False
+    armed["remaining"] -= 1
+    remaining_seconds = int(armed["expires_at"] - time.time())
+    if armed["remaining"] > 0 and remaining_seconds > 0:
+        cache.set(ARM_CACHE_KEY, armed, remaining_seconds)
+    else:
+        cache.delete(ARM_CACHE_KEY)
+    return True
+
+
+def _within_rate_limit():
+    limit = getattr(settings, "BOARD_PROFILE_MAX_PER_MINUTE", DEFAULT_MAX_PER_MINUTE)
+    key = f"{RATE_CACHE_KEY}:{int(time.time() // 60)}"
+    cache.add(key, 0, 120)
+    try:
+        return cache.incr(key) <= limit
+    except ValueError:
+        return True
+
+
+def _frame_label(frame):
+    code = frame.f_code
+    if code.co_name == "render" and code.co_filename.endswith("template/base.py"):
+        template = frame.f_locals.get("self")
+        if isinstance(template, Template):
+            return f"template:{template.name}"
+    module = frame.f_globals.get("__name__", "?")
+    return f"{module}.{code.co_name}"
+
+
+def collapse_stack(frame):
+    labels = []
+    while frame is not None and len(labels) < MAX_STACK_DEPTH:
+        labels.append(_frame_label(frame).replace(";", ":"))
+        frame = frame.f_back
+    return ";".join(reversed(labels))
+
+
+class SamplingProfiler:
+    # 별도 스레드가 interval 마다 대상 스레드의 현재 스택만 읽는다. sys.setprofile 처럼
+    # 모든 함수 호출에 비용을 붙이지 않으므로 운영 요청에도 켤 수 있다.
+    def __init__(self, thread_id, interval=DEFAULT_INTERVAL):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="board-profiler", daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self.stacks[collapse_stack(frame)] += 1
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+
+    @property
+    def sample_count(self):
+        return sum(self.stacks.values())
+
+    def collapsed(self):
+        return "\n".join(f"{stack} {count}" for stack, count in self.stacks.most_common())
+
+
+class QueryRecorder:
+    def __init__(self):
+        self.queries = []
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            if len(self.queries) < MAX_QUERIES:
+                self.queries.append({
+                    "sql": sql,
+                    "ms": round((time.perf_counter() - start) * 1000, 3),
+                    "alias": context["connection"].alias,
+                })
+
+
+def _record_query(execute, sql, params, many, context):
+    recorder = _current_recorder.get()
+    if recorder is None:
+        return execute(sql, params, many, context)
+    return recorder(execute, sql, params, many, context)
+
+
+def install_query_recorder(connection, **kwargs):
+    # 연결은 스레드마다 따로라서 연결마다 한 번 붙여 두고, 프로파일 중인 요청은 contextvar 로 찾는다.
+    if _record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_record_query)
+
+
+connection_created.connect(install_query_recorder, dispatch_uid="board_query_recorder")
+
+
+def _is_async_view(request):
+    try:
+        match = get_resolver(getattr(request, "urlconf", None)).resolve(request.path_info)
+    except Resolver404:
+        return False
+    return iscoroutinefunction(match.func)
+
+
+class ProfilingMiddleware:
+    # 샘플러는 스레드 하나의 스택을 읽는다. ASGI 에서 동기 뷰는 요청마다 정해진 스레드(thread_sensitive)에서
+    # 돌므로 그 스레드를 샘플링한다. async 뷰는 이벤트 루프 스레드를 다른 요청과 같이 쓰므로 건너뛴다.
+    # 스트리밍 응답은 본문을 만들기 전까지만 잰다.
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        for connection in connections.all(initialized_only=True):
+            install_query_recorder(connection)
+
+    def _trigger(self, request):
+        token = request.META.get(PROFILE_HEADER)
+        if token:
+            return "header" if _token_allows(token, request.path) else None
+        if _take_armed_slot(request.path):
+            return "admin"
+        return None
+
+    async def _atrigger(self, request):
+        if request.META.get(PROFILE_HEADER):
+            return self._trigger(request)
+        # 대부분의 요청은 켜 둔 프로파일이 없으므로 캐시 조회 한 번으로 끝낸다.
+        if await cache.aget(ARM_CACHE_KEY) is None:
+            return None
+        return await sync_to_async(self._trigger)(request)
+
+    @contextmanager
+    def _profile(self, thread_id):
+        interval = getattr(settings, "BOARD_PROFILE_INTERVAL", DEFAULT_INTERVAL)
+        recorder = QueryRecorder()
+        token = _current_recorder.set(recorder)
+        try:
+            with SamplingProfiler(thread_id, interval) as profiler:
+                yield profiler, recorder
+        finally:
+            _current_recorder.reset(token)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        trigger = self._trigger(request)
+        if trigger is None or not _within_rate_limit():
+            return self.get_response(request)
+        if not _active.acquire(blocking=False):
+            return self.get_response(request)
+
+        try:
+            start = time.perf_counter()
+            with self._profile(threading.get_ident()) as (profiler, recorder):
+                response = self.get_response(request)
+            duration = time.perf_counter() - start
+        finally:
+            _active.release()
+        return self._store(request, response, trigger, duration, profiler, recorder)
+
+    async def __acall__(self, request):
+        if _is_async_view(request):
+            return await self.get_response(request)
+        trigger = await self._atrigger(request)
+        if trigger is None or not await sync_to_async(_within_rate_limit)():
+            return await self.get_response(request)
+        if not _active.acquire(blocking=False):
+            return await self.get_response(request)
+
+        try:
+            # 이 요청의 동기 코드(뷰, ORM)가 도는 스레드.
+            thread_id = await sync_to_async(threading.get_ident)()
+            start = time.perf_counter()
+            with self._profile(thread_id) as (profiler, recorder):
+                response = await self.get_response(request)
+            duration = time.perf_counter() - start
+        finally:
+            _active.release()
+        return await sync_to_async(self._store)(request, response, trigger, duration, profiler, recorder)
+
+    def _store(self, request, response, trigger, duration, profiler, recorder):
+        try:
+            profile = self._save(request, response, trigger, duration, profiler, recorder)
+        except Exception:
+            logger.exception("Failed to store request profile for %s", request.path)
+        else:
+            response["X-Board-Profile-Id"] = str(profile.pk)
+        return response
+
+    def _save(self, request, response, trigger, duration, profiler, recorder):
+        match = getattr(request, "resolver_match", None)
+        user = getattr(request, "user", None)
+        return RequestProfile.objects.create(
+            method=request.method,
+            path=request.get_full_path()[:500],
+            view_name=(match.view_name if match else "")[:100],
+            status_code=response.status_code,
+            username=user.get_username() if user is not None and user.is_authenticated else "",
+            trigger=trigger,
+            duration_ms=duration * 1000,
+            sample_interval_ms=profiler.interval * 1000,
+            sample_count=profiler.sample_count,
+            collapsed_stacks=profiler.collapsed(),
+            query_count=recorder.count,
+            queries=json.dumps(recorder.queries, ensure_ascii=False),
+        )
@@ -0,0 +1,65 @@
+from django.db.models import CharField, F, Q, Value, Window
+from django.db.models.functions import RowNumber
+
+
+RANK_ANNOTATION = "_group_rank"
+GROUP_ANNOTATION = "_group_name"
+
+
+def _order_expressions(order_by):
+    expressions = []
+    for field in order_by:
+        if isinstance(field, str):
+            expressions.append(F(field[1:]).desc() if field.startswith("-") else F(field).asc())
+        else:
+            expressions.append(field)
+    return expressions
+
+
+def top_n_per_group(queryset, partition_by, order_by, limit, groups=None):
+    # ROW_NUMBER() OVER (PARTITION BY ... ORDER BY ...) 로 그룹마다 상위 limit 개를 한 번에 읽는다.
+    # 결과는 {그룹 값: [객체, ...]} 이며 각 목록은 order_by 순서를 따른다.
+    if groups is not None:
+        queryset = queryset.filter(**{f"{partition_by}__in": groups})
+    ranked = (
+        queryset.annotate(**{
+            RANK_ANNOTATION: Window(
+                RowNumber(),
+                partition_by=[F(partition_by)],
+                order_by=_order_expressions(order_by),
+            )
+        })
+        .filter(**{f"{RANK_ANNOTATION}__lte": limit})
+        .order_by(partition_by, RANK_ANNOTATION)
+    )
+    grouped = {group: [] for group in groups or []}
+    for obj in ranked:
+        grouped.setdefault(getattr(obj, partition_by), []).append(obj)
+    return grouped
+
+
+def top_n_by_filter(queryset, blocks):
+    # 같은 테이블에서 조건/정렬이 다른 여러 블록을 UNION ALL 한 번으로 읽는다.
+    # blocks: {이름: (Q 조건, 정렬 필드 목록, 개수)}. 한 행이 여러 블록에 들어갈 수 있다.
+    grouped = {name: [] for name in blocks}
+    if len(blocks) == 1:
+        # 블록이 하나면 윈도 함수 없이 ORDER BY ... LIMIT 로 인덱스를 그대로 탄다.
+        (name, (condition, order_by, limit)), = blocks.items()
+        grouped[name] = list(queryset.filter(condition or Q()).order_by(*order_by)[:limit])
+        return grouped
+
+    parts = [
+        queryset.filter(condition or Q())
+        .annotate(**{
+            GROUP_ANNOTATION: Value(name, output_field=CharField()),
+            RANK_ANNOTATION: Window(RowNumber(), order_by=_order_expressions(order_by)),
+        })
+        .filter(**{f"{RANK_ANNOTATION}__lte": limit})
+        .order_by()
+        for name, (condition, order_by, limit) in blocks.items()
+    ]
+    for obj in parts[0].union(*parts[1:], all=True):
+        grouped[getattr(obj, GROUP_ANNOTATION)].append(obj)
+    for rows in grouped.values():
+        rows.sort(key=lambda obj: getattr(obj, RANK_ANNOTATION))
+    return grouped
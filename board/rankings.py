@@ -0,0 +1,94 @@
+from django.db import IntegrityError, transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from .models import Post, PostRanking
+
+
+TRENDING_GRAVITY = 1.8
+TRENDING_BATCH_SIZE = 500
+
+
+def trending_score(like_count, created_at, now=None):
+    # Hacker News 방식: 좋아요 수를 글 나이(시간)에 따라 감쇠시킨다.
+    now = now or timezone.now()
+    age_hours = max((now - created_at).total_seconds() / 3600, 0)
+    return like_count / (age_hours + 2) ** TRENDING_GRAVITY
+
+
+def refresh_post_ranking(post_id):
+    # 좋아요가 바뀐 글 한 건의 Post.like_count 카운터를 랭킹 테이블로 옮긴다.
+    post = Post.objects.filter(id=post_id).only("category", "created_at", "like_count").first()
+    like_count = post.like_count if post is not None else 0
+    if like_count == 0:
+        PostRanking.objects.filter(post_id=post_id).delete()
+        return 0
+
+    # 이미 랭킹에 있는 글(대부분의 좋아요)은 UPDATE 한 번으로 끝낸다. 새로 들어온 글만 INSERT 하며,
+    # INSERT 는 post_save 시그널로 좋아요 글 카운터를 올려야 하므로 create() 를 쓴다.
+    values = {
+        "category": post.category,
+        "like_count": like_count,
+        "trending_score": trending_score(like_count, post.created_at),
+        "post_created_at": post.created_at,
+    }
+    if PostRanking.objects.filter(post_id=post_id).update(updated_at=timezone.now(), **values):
+        return like_count
+    try:
+        with transaction.atomic():
+            PostRanking.objects.create(post_id=post_id, **values)
+    except IntegrityError:
+        PostRanking.objects.filter(post_id=post_id).update(updated_at=timezone.now(), **values)
+    return like_count
+
+
+def ranked_posts(category, sort="likes"):
+    posts = Post.objects.filter(ranking__category=category)
+    if sort == "trending":
+        return posts.order_by("-ranking__trending_score", "-id")
+    return posts.order_by("-ranking__like_count", "-id")
+
+
+def refresh_trending_scores(batch_size=TRENDING_BATCH_SIZE):
+    now = timezone.now()
+    updated = 0
+    batch = []
+    for ranking in PostRanking.objects.only("post_id", "like_count", "post_created_at").iterator(chunk_size=batch_size):
+        ranking.trending_score = trending_score(ranking.like_count, ranking.post_created_at, now)
+        batch.append(ranking)
+        if len(batch) >= batch_size:
+            PostRanking.objects.bulk_update(batch, ["trending_score"])
+            updated += len(batch)
+            batch = []
+    if batch:
+        PostRanking.objects.bulk_update(batch, ["trending_score"])
+        updated += len(batch)
+    return updated
+
+
+def rebuild_rankings(Post=Post, PostRanking=PostRanking, batch_size=TRENDING_BATCH_SIZE):
+    now = timezone.now()
+    rows = (
+        Post.objects.annotate(total_likes=Count("likes"))
+        .filter(total_likes__gt=0)
+        .values_list("id", "category", "created_at", "total_likes")
+    )
+    with transaction.atomic():
+        PostRanking.objects.all().delete()
+        batch = []
+        for post_id, category, created_at, like_count in rows.iterator(chunk_size=batch_size):
+            batch.append(
+                PostRanking(
+                    post_id=post_id,
+                    category=category,
+                    like_count=like_count,
+                    trending_score=trending_score(like_count, created_at, now),
+                    post_created_at=created_at,
+                )
+            )
+            if len(batch) >= batch_size:
+                PostRanking.objects.bulk_create(batch)
+                batch = []
+        if batch:
+            PostRanking.objects.bulk_create(batch)
+    return PostRanking.objects.count()
@@ -0,0 +1,278 @@
+from collections import namedtuple
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Max, Subquery
+from django.utils import timezone
+
+from .models import MatchStanding, TeamRating
+
+
+ELO_START = 1500.0
+ELO_K = 20.0
+ELO_HOME_ADVANTAGE = 60.0
+# 새 시즌이 시작되면 Elo 는 평균 쪽으로 당기고, 득실 가중치는 절반으로 줄인다.
+SEASON_CARRY = 0.75
+SEASON_DECAY = 0.5
+# 라운드가 지날 때마다 이전 득실의 가중치를 줄여 최근 경기력을 더 반영한다.
+FORM_DECAY = 0.95
+# 경기 수가 적은 팀의 공격/수비력을 리그 평균 쪽으로 당기는 가상 경기 수.
+PRIOR_GAMES = 3.0
+DEFAULT_GOALS = 1.35
+HOME_GOAL_ADVANTAGE = 1.15
+MAX_GOALS = 10
+RATING_BATCH_SIZE = 500
+RATING_CACHE_TIMEOUT = getattr(settings, "BOARD_RATING_CACHE_TIMEOUT", 3600)
+
+Round = namedtuple("Round", ["year", "round_num", "updated_at", "home", "away", "home_goals", "away_goals"])
+LeagueRatings = namedtuple("LeagueRatings", ["teams", "average_goals"])
+
+
+def average_or_default(goals, games):
+    # 전부 0:0 이면 평균이 0 이 되어 공격/수비력이 NaN 이 되므로 기본값으로 둔다.
+    average = goals / games if games else 0.0
+    return average if average > 0 else DEFAULT_GOALS
+
+
+class RatingState:
+    # 리그 한 곳의 팀별 누적 상태를 배열로 들고 라운드 단위로 한꺼번에 갱신한다. 팀은 Team id 로 센다.
+    def __init__(self):
+        self.index = {}
+        self.elo = np.empty(0)
+        self.goals_for = np.empty(0)
+        self.goals_against = np.empty(0)
+        self.games = np.empty(0)
+        self.year = None
+
+    @classmethod
+    def from_rows(cls, rows):
+        rows = list(rows)
+        state = cls()
+        for row in rows:
+            state.index[row["team"]] = len(state.index)
+            state.year = row["year"]
+        state.elo = np.array([row["elo"] for row in rows], dtype=float)
+        state.goals_for = np.array([row["goals_for_weight"] for row in rows], dtype=float)
+        state.goals_against = np.array([row["goals_against_weight"] for row in rows], dtype=float)
+        state.games = np.array([row["games_weight"] for row in rows], dtype=float)
+        return state
+
+    def team_ids(self, teams):
+        new_teams = [team for team in dict.fromkeys(teams) if team not in self.index]
+        if new_teams:
+            for team in new_teams:
+                self.index[team] = len(self.index)
+            self.elo = np.concatenate([self.elo, np.full(len(new_teams), ELO_START)])
+            zeros = np.zeros(len(new_teams))
+            self.goals_for = np.concatenate([self.goals_for, zeros])
+            self.goals_against = np.concatenate([self.goals_against, zeros])
+            self.games = np.concatenate([self.games, zeros])
+        return np.fromiter((self.index[team] for team in teams), dtype=np.intp, count=len(teams))
+
+    def average_goals(self):
+        games = self.games.sum()
+        return average_or_default(self.goals_for.sum(), games)
+
+    def strengths(self):
+        average = self.average_goals()
+        attack = (self.goals_for + PRIOR_GAMES * average) / (self.games + PRIOR_GAMES) / average
+        defense = (self.goals_against + PRIOR_GAMES * average) / (self.games + PRIOR_GAMES) / average
+        return attack, defense
+
+    def start_season(self, year):
+        if self.year is not None and year != self.year:
+            self.elo = ELO_START + (self.elo - ELO_START) * SEASON_CARRY
+            self.goals_for *= SEASON_DECAY
+            self.goals_against *= SEASON_DECAY
+            self.games *= SEASON_DECAY
+        self.year = year
+
+    def apply_round(self, round_):
+        # 라운드 안의 경기는 모두 라운드 시작 시점의 Elo 로 기대값을 구해 한 번에 더한다.
+        self.start_season(round_.year)
+        home = self.team_ids(round_.home)
+        away = self.team_ids(round_.away)
+        home_goals = np.asarray(round_.home_goals, dtype=float)
+        away_goals = np.asarray(round_.away_goals, dtype=float)
+
+        expected = 1 / (1 + 10 ** ((self.elo[away] - self.elo[home] - ELO_HOME_ADVANTAGE) / 400))
+        actual = np.sign(home_goals - away_goals) * 0.5 + 0.5
+        margin = np.log1p(np.abs(home_goals - away_goals)) + 1
+        delta = ELO_K * margin * (actual - expected)
+        np.add.at(self.elo, home, delta)
+        np.add.at(self.elo, away, -delta)
+
+        self.goals_for *= FORM_DECAY
+        self.goals_against *= FORM_DECAY
+        self.games *= FORM_DECAY
+        np.add.at(self.goals_for, home, home_goals)
+        np.add.at(self.goals_for, away, away_goals)
+        np.add.at(self.goals_against, home, away_goals)
+        np.add.at(self.goals_against, away, home_goals)
+        np.add.at(self.games, home, 1)
+        np.add.at(self.games, away, 1)
+
+    def snapshot(self, league, round_, sequence, computed_at):
+        attack, defense = self.strengths()
+        return [
+            TeamRating(
+                league=league,
+                year=round_.year,
+                round_num=round_.round_num,
+                sequence=sequence,
+                team_id=team,
+                elo=float(self.elo[i]),
+                attack=float(attack[i]),
+                defense=float(defense[i]),
+                goals_for_weight=float(self.goals_for[i]),
+                goals_against_weight=float(self.goals_against[i]),
+                games_weight=float(self.games[i]),
+                computed_at=computed_at,
+            )
+            for team, i in self.index.items()
+        ]
+
+
+def ratings_cache_key(league):
+    return f"board:ratings:{league}"
+
+
+def league_rounds(league):
+    # 원장(MatchStanding)에 이미 파싱된 골 수로 라운드를 묶는다. 라운드 순서는 시즌, 첫 경기 시각 순이다.
+    rows = (
+        MatchStanding.objects.filter(league=league)
+        .order_by("match__match_date", "match_id")
+        .values_list(
+            "year", "match__round_num", "match__match_date",
+            "home_club_id", "away_club_id", "home_goals", "away_goals", "updated_at",
+        )
+    )
+    grouped = {}
+    for year, round_num, match_date, home_club_id, away_club_id, home_goals, away_goals, updated_at in rows.iterator(
+        chunk_size=RATING_BATCH_SIZE,
+    ):
+        round_num = round_num or timezone.localdate(match_date).isoformat()
+        round_ = grouped.setdefault((year, round_num), Round(year, round_num, [], [], [], [], []))
+        round_.updated_at.append(updated_at)
+        round_.home.append(home_club_id)
+        round_.away.append(away_club_id)
+        round_.home_goals.append(home_goals)
+        round_.away_goals.append(away_goals)
+    rounds = sorted(grouped.values(), key=lambda round_: round_.year)
+    return [round_._replace(updated_at=max(round_.updated_at)) for round_ in rounds]
+
+
+def _first_stale_round(league, rounds):
+    # 저장된 라운드와 앞에서부터 비교해 처음으로 달라진(새 결과가 들어온) 라운드 위치를 돌려준다.
+    stored = list(
+        TeamRating.objects.filter(league=league)
+        .values("sequence", "year", "round_num")
+        .annotate(computed_at=Max("computed_at"))
+        .order_by("sequence")
+    )
+    for sequence, round_ in enumerate(rounds):
+        if sequence >= len(stored):
+            return sequence
+        saved = stored[sequence]
+        if (saved["year"], saved["round_num"]) != (round_.year, round_.round_num) or round_.updated_at > saved["computed_at"]:
+            return sequence
+    return len(rounds) if len(stored) > len(rounds) else None
+
+
+def update_league_ratings(league, rebuild=False):
+    rounds = league_rounds(league)
+    start = 0 if rebuild else _first_stale_round(league, rounds)
+    if start is None:
+        return 0
+
+    if start:
+        state = RatingState.from_rows(
+            TeamRating.objects.filter(league=league, sequence=start - 1)
+            .order_by("id")
+            .values("team", "year", "elo", "goals_for_weight", "goals_against_weight", "games_weight")
+        )
+    else:
+        state = RatingState()
+    computed_at = timezone.now()
+    snapshots = []
+    for sequence, round_ in enumerate(rounds[start:], start=start):
+        state.apply_round(round_)
+        snapshots.extend(state.snapshot(league, round_, sequence, computed_at))
+
+    with transaction.atomic():
+        TeamRating.objects.filter(league=league, sequence__gte=start).delete()
+        TeamRating.objects.bulk_create(snapshots, batch_size=RATING_BATCH_SIZE)
+    cache.delete(ratings_cache_key(league))
+    return len(rounds) - start
+
+
+def update_ratings(rebuild=False):
+    # 새 결과가 들어온 라운드부터만 다시 계산한다. 반환값은 다시 계산한 라운드 수.
+    leagues = MatchStanding.objects.order_by("league").values_list("league", flat=True).distinct()
+    return sum(update_league_ratings(league, rebuild) for league in leagues)
+
+
+def league_ratings(league):
+    key = ratings_cache_key(league)
+    ratings = cache.get(key)
+    if ratings is None:
+        latest = TeamRating.objects.filter(league=league).order_by("-sequence").values("sequence")[:1]
+        rows = TeamRating.objects.filter(league=league, sequence=Subquery(latest)).values_list(
+            "team", "elo", "attack", "defense", "goals_for_weight", "games_weight",
+        )
+        teams = {}
+        goals = games = 0.0
+        for team, elo, attack, defense, goals_for_weight, games_weight in rows:
+            teams[team] = (elo, attack, defense)
+            goals += goals_for_weight
+            games += games_weight
+        ratings = LeagueRatings(teams, average_or_default(goals, games))
+        cache.set(key, ratings, RATING_CACHE_TIMEOUT)
+    return ratings
+
+
+_GOALS = np.arange(MAX_GOALS + 1)
+_LOG_FACTORIALS = np.concatenate([[0.0], np.cumsum(np.log(_GOALS[1:]))])
+
+
+def _poisson(rates):
+    return np.exp(_GOALS * np.log(rates)[:, None] - rates[:, None] - _LOG_FACTORIALS)
+
+
+def outcome_probabilities(home, away, average_goals):
+    # home/away 는 (elo, attack, defense) 배열. Poisson 스코어 분포와 Elo 기대값을 반씩 섞어
+    # (승, 무, 패) 확률을 경기 수만큼 한꺼번에 구한다.
+    home_rate = average_goals * home[:, 1] * away[:, 2] * HOME_GOAL_ADVANTAGE
+    away_rate = average_goals * away[:, 1] * home[:, 2] / HOME_GOAL_ADVANTAGE
+    grid = _poisson(home_rate)[:, :, None] * _poisson(away_rate)[:, None, :]
+    win = np.tril(grid, -1).sum(axis=(1, 2))
+    draw = np.trace(grid, axis1=1, axis2=2)
+    loss = np.triu(grid, 1).sum(axis=(1, 2))
+    total = win + draw + loss
+
+    expected = 1 / (1 + 10 ** ((away[:, 0] - home[:, 0] - ELO_HOME_ADVANTAGE) / 400))
+    draw = draw / total
+    win = (win / total + (1 - draw) * expected) / 2
+    loss = 1 - draw - win
+    return np.stack([win, draw, loss], axis=1)
+
+
+def attach_probabilities(matches, ratings):
+    # 두 팀 모두 레이팅이 있는 경기에 match.probabilities = {"win", "draw", "loss"} (홈 팀 기준 %) 를 붙인다.
+    # ratings.teams 는 Team id 로 찾으므로 별칭으로 들어온 경기도 같은 레이팅을 쓴다.
+    rated = [
+        match for match in matches
+        if match.home_club_id in ratings.teams and match.away_club_id in ratings.teams
+    ]
+    for match in matches:
+        match.probabilities = None
+    if not rated:
+        return matches
+    home = np.array([ratings.teams[match.home_club_id] for match in rated])
+    away = np.array([ratings.teams[match.away_club_id] for match in rated])
+    percents = np.rint(outcome_probabilities(home, away, ratings.average_goals) * 100).astype(int)
+    for match, (win, draw, _) in zip(rated, percents):
+        match.probabilities = {"win": int(win), "draw": int(draw), "loss": int(100 - win - draw)}
+    return matches
@@ -0,0 +1,378 @@
+import bisect
+import itertools
+import random
+from collections import deque
+from datetime import datetime, timedelta
+
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from .comments import rebuild_comment_counts, rebuild_reply_counts
+from .counters import rebuild_counters
+from .facets import rebuild_facets
+from .likes import recount_likes
+from .models import Comment, InfoPost, LinkPost, Post, Profile, SoccerMatch, score_columns
+from .rankings import rebuild_rankings
+from .ratings import update_ratings
+from .standings import rebuild_standings
+from .teams import sync_match_teams
+
+
+LINK_CATEGORIES = [value for value, _ in LinkPost.CATEGORY_CHOICES]
+MATCH_LEAGUES = {
+    '프리미어리그': 20,
+    '라리가': 20,
+    '분데스리가': 18,
+    '대표': 16,
+}
+DISTRIBUTIONS = ("zipf", "uniform")
+
+KOREAN_WORDS = [
+    '오늘', '진짜', '그냥', '정말', '이번', '경기', '축구', '골', '감독', '선수',
+    '영상', '사진', '후기', '질문', '정보', '공유', '추천', '생각', '회사', '점심',
+    '저녁', '주말', '여행', '맛집', '커피', '게임', '영화', '드라마', '음악', '노래',
+    '주식', '코인', '뉴스', '인공지능', '개발', '코드', '서버', '버그', '배포', '휴가',
+    '날씨', '비', '눈', '출근', '퇴근', '친구', '가족', '고양이', '강아지', '운동',
+    '다이어트', '공부', '시험', '합격', '이사', '전세', '월세', '자동차', '자전거', '캠핑',
+]
+KOREAN_ENDINGS = ['입니다', '했어요', '인가요', '네요', '좋아요', '별로네요', 'ㅋㅋ', '대박', '맞나요', '같아요']
+TEAM_NAMES = [
+    '서울', '부산', '대구', '인천', '광주', '대전', '울산', '수원', '전주', '포항',
+    '제주', '강원', '성남', '안양', '김포', '청주', '천안', '충남', '경남', '전남',
+]
+
+
+def _next_id(model):
+    return (model.objects.aggregate(last=Max("id"))["last"] or 0) + 1
+
+
+class WeightedPicker:
+    # Zipf 분포면 순위 r 의 가중치가 1/r^s 이다. 누적 가중치를 한 번 만들어 두고 이분 탐색으로 뽑는다.
+    def __init__(self, rng, values, distribution="zipf", exponent=1.1):
+        self.rng = rng
+        self.values = list(values)
+        self.cum_weights = None
+        if distribution == "zipf" and self.values:
+            # 인기 게시글이 항상 가장 오래된 글이 되지 않도록 순위를 섞어 둔다.
+            rng.shuffle(self.values)
+            self.cum_weights = list(
+                itertools.accumulate(1 / (rank ** exponent) for rank in range(1, len(self.values) + 1))
+            )
+
+    def pick(self):
+        if self.cum_weights is None:
+            return self.rng.choice(self.values)
+        point = self.rng.random() * self.cum_weights[-1]
+        return self.values[bisect.bisect_right(self.cum_weights, point)]
+
+
+class BoardSeeder:
+    # bulk_create 로 대량의 게시판 데이터를 만든다. id 를 직접 지정하므로
+    # bulk_create 가 pk 를 돌려주지 않는 MySQL 에서도 관계 행을 같은 방식으로 만들 수 있다.
+    def __init__(
+        self,
+        seed=0,
+        batch_size=5000,
+        distribution="zipf",
+        zipf_exponent=1.1,
+        secret_ratio=0.1,
+        reply_ratio=0.3,
+        log=None,
+    ):
+        self.random = random.Random(seed)
+        self.batch_size = batch_size
+        self.distribution = distribution
+        self.zipf_exponent = zipf_exponent
+        self.secret_ratio = secret_ratio
+        self.reply_ratio = reply_ratio
+        self.log = log or (lambda message: None)
+        self.now = timezone.now()
+        self.nicknames = []
+
+    def _bulk_create(self, model, rows):
+        total = 0
+        for batch in _batched(rows, self.batch_size):
+            model.objects.bulk_create(batch, batch_size=self.batch_size)
+            total += len(batch)
+        self.log(f"{model.__name__}: {total}")
+        return total
+
+    def _picker(self, values):
+        return WeightedPicker(self.random, values, self.distribution, self.zipf_exponent)
+
+    def _created_at(self, days=365):
+        return self.now - timedelta(seconds=self.random.randint(0, days * 86400))
+
+    def author(self):
+        if self.nicknames:
+            return self.random.choice(self.nicknames)
+        return f"익명{self.random.randint(1, 500)}"
+
+    def text(self, words=8):
+        parts = [self.random.choice(KOREAN_WORDS) for _ in range(words)]
+        return " ".join(parts) + " " + self.random.choice(KOREAN_ENDINGS)
+
+    def seed_users(self, count):
+        start = _next_id(User)
+        # 비밀번호 해싱을 건너뛰도록 사용할 수 없는 비밀번호("!")로 만든다.
+        self._bulk_create(
+            User,
+            (
+                User(
+                    id=start + i,
+                    username=f"seed{start + i}@example.com",
+                    email=f"seed{start + i}@example.com",
+                    password="!",
+                    date_joined=self._created_at(days=720),
+                )
+                for i in range(count)
+            ),
+        )
+        user_ids = list(range(start, start + count))
+        self.nicknames = [f"회원{user_id}" for user_id in user_ids]
+        self._bulk_create(
+            Profile,
+            (
+                Profile(user_id=user_id, nickname=nickname, points=self.random.randint(0, 1000))
+                for user_id, nickname in zip(user_ids, self.nicknames)
+            ),
+        )
+        return user_ids
+
+    def seed_posts(self, count):
+        start = _next_id(Post)
+        self._bulk_create(
+            Post,
+            (
+                Post(
+                    id=start + i,
+                    title=self.text(4)[:200],
+                    content="\n".join(self.text(12) for _ in range(self.random.randint(1, 6))),
+                    category='secret' if self.random.random() < self.secret_ratio else 'common',
+                    views=int(self.random.paretovariate(1.2) * 10),
+                    author=self.author(),
+                    created_at=self._created_at(),
+                )
+                for i in range(count)
+            ),
+        )
+        return list(range(start, start + count))
+
+    def seed_comments(self, count, post_ids):
+        # 일부는 최근 댓글에 대한 답글로 만들어 스레드 경로(path)까지 채운다.
+        start = _next_id(Comment)
+        posts = self._picker(post_ids)
+        recent = deque(maxlen=1000)
+
+        def rows():
+            for i in range(count):
+                comment_id = start + i
+                segment = f"{comment_id:0{Comment.PATH_SEGMENT_WIDTH}d}"
+                parent = None
+                if recent and self.random.random() < self.reply_ratio:
+                    parent = self.random.choice(recent)
+                    if parent["depth"] >= Comment.MAX_DEPTH:
+                        parent = None
+                if parent is None:
+                    node = {
+                        "id": comment_id,
+                        "post_id": posts.pick(),
+                        "thread_id": comment_id,
+                        "path": segment,
+                        "depth": 0,
+                        "created_at": self._created_at(),
+                    }
+                else:
+                    node = {
+                        "id": comment_id,
+                        "post_id": parent["post_id"],
+                        "thread_id": parent["thread_id"],
+                        "path": f"{parent['path']}.{segment}",
+                        "depth": parent["depth"] + 1,
+                        "created_at": min(
+                            parent["created_at"] + timedelta(minutes=self.random.randint(1, 600)),
+                            self.now,
+                        ),
+                    }
+                recent.append(node)
+                yield Comment(
+                    id=comment_id,
+                    post_id=node["post_id"],
+                    parent_id=parent["id"] if parent else None,
+                    author=self.author(),
+                    content=self.text(self.random.randint(3, 20)),
+                    created_at=node["created_at"],
+                    thread_id=node["thread_id"],
+                    path=node["path"],
+                    depth=node["depth"],
+                )
+
+        return self._bulk_create(Comment, rows())
+
+    def seed_likes(self, through, owner_field, count, owner_ids, user_ids):
+        # 좋아요는 인기 글에 몰리도록 Zipf 로 글을 고르고, 같은 (글, 회원) 쌍은 건너뛴다.
+        owners = self._picker(owner_ids)
+        seen = set(through.objects.values_list(owner_field, "user_id"))
+
+        def rows():
+            attempts = 0
+            made = 0
+            while made < count and attempts < count * 3:
+                attempts += 1
+                pair = (owners.pick(), self.random.choice(user_ids))
+                if pair in seen:
+                    continue
+                seen.add(pair)
+                made += 1
+                yield through(**{owner_field: pair[0], "user_id": pair[1]})
+
+        return self._bulk_create(through, rows())
+
+    def seed_infoposts(self, count):
+        start = _next_id(InfoPost)
+        self._bulk_create(
+            InfoPost,
+            (
+                InfoPost(
+                    id=start + i,
+                    title=self.text(4)[:200],
+                    content=self.text(30)[:500],
+                    category=self.random.choice(['thread', 'ai']),
+                    author=self.author(),
+                    created_at=self._created_at(),
+                )
+                for i in range(count)
+            ),
+        )
+        return list(range(start, start + count))
+
+    def seed_links(self, count):
+        start = _next_id(LinkPost)
+        return self._bulk_create(
+            LinkPost,
+            (
+                LinkPost(
+                    id=start + i,
+                    category=self.random.choice(LINK_CATEGORIES),
+                    title=self.text(4)[:200],
+                    url=f"https://example.com/{start + i}",
+                    author=self.author(),
+                    is_recommended=self.random.random() < 0.2,
+                    # LinkPost.save 의 md5 계산을 건너뛰도록 고유 id 를 직접 넣는다.
+                    link_id=f"{start + i:032x}",
+                    created_at=self._created_at(),
+                )
+                for i in range(count)
+            ),
+        )
+
+    def seed_matches(self, seasons=(2026, 2027), leagues=MATCH_LEAGUES):
+        # 리그마다 홈/원정 더블 라운드로빈 한 시즌을 만든다. 지난 경기에는 스코어와 결과를 넣는다.
+        start = _next_id(SoccerMatch)
+        next_id = itertools.count(start)
+
+        def rows():
+            for year in seasons:
+                season_start = timezone.make_aware(datetime(year - 1, 8, 10, 20, 0))
+                for league, team_count in leagues.items():
+                    teams = [f"{name} {league[:2]}" for name in TEAM_NAMES[:team_count]]
+                    for round_index, pairs in enumerate(_round_robin(teams), start=1):
+                        match_day = season_start + timedelta(days=7 * (round_index - 1))
+                        for home_team, away_team in pairs:
+                            match_id = next(next_id)
+                            match_date = match_day + timedelta(hours=self.random.choice([0, 2, 24, 26]))
+                            finished = match_date < self.now
+                            home_goals = min(int(self.random.expovariate(0.7)), 7)
+                            away_goals = min(int(self.random.expovariate(0.9)), 7)
+                            score = f"{home_goals}:{away_goals}" if finished else None
+                            yield SoccerMatch(
+                                id=match_id,
+                                match_id=f"seed-{match_id}",
+                                round_num=f"{round_index}R",
+                                match_date=match_date,
+                                league=league,
+                                home_team=home_team,
+                                away_team=away_team,
+                                score=score,
+                                **score_columns(score),
+                                result=_outcome(home_goals, away_goals) if finished else None,
+                                year=year,
+                                created_at=self.now,
+                            )
+
+        return self._bulk_create(SoccerMatch, rows())
+
+    def seed(
+        self,
+        users=0,
+        posts=0,
+        comments=0,
+        likes=0,
+        infoposts=0,
+        info_likes=0,
+        links=0,
+        match_seasons=(),
+    ):
+        with transaction.atomic():
+            user_ids = self.seed_users(users) if users else list(User.objects.values_list("id", flat=True))
+            post_ids = self.seed_posts(posts) if posts else list(Post.objects.values_list("id", flat=True))
+            if comments and post_ids:
+                self.seed_comments(comments, post_ids)
+            if likes and post_ids and user_ids:
+                self.seed_likes(Post.likes.through, "post_id", likes, post_ids, user_ids)
+            info_ids = self.seed_infoposts(infoposts) if infoposts else []
+            if info_likes and info_ids and user_ids:
+                self.seed_likes(InfoPost.likes.through, "infopost_id", info_likes, info_ids, user_ids)
+            if links:
+                self.seed_links(links)
+            if match_seasons:
+                self.seed_matches(match_seasons)
+        self.finalize()
+
+    def finalize(self):
+        # bulk_create 는 시그널을 보내지 않으므로 비정규화 값은 한 번에 다시 계산한다.
+        rebuild_comment_counts()
+        rebuild_reply_counts()
+        recount_likes("post")
+        recount_likes("info")
+        rebuild_rankings()
+        rebuild_counters()
+        # 순위표와 레이팅은 팀 FK 로 세므로 경기 팀부터 잇는다.
+        sync_match_teams()
+        rebuild_standings()
+        update_ratings(rebuild=True)
+        rebuild_facets()
+        self.log("카운터/랭킹/댓글·좋아요 수/경기 팀/리그 순위/팀 레이팅/경기 필터를 다시 계산했습니다.")
+
+
+def _batched(rows, size):
+    iterator = iter(rows)
+    while True:
+        batch = list(itertools.islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def _round_robin(teams):
+    # 원형 배치(circle method)로 라운드별 대진을 만들고, 후반기는 홈/원정을 바꾼다.
+    teams = list(teams)
+    if len(teams) % 2:
+        teams.append(None)
+    half = len(teams) // 2
+    rounds = []
+    for _ in range(len(teams) - 1):
+        pairs = [(teams[i], teams[-1 - i]) for i in range(half)]
+        rounds.append([pair for pair in pairs if None not in pair])
+        teams = [teams[0], teams[-1]] + teams[1:-1]
+    return rounds + [[(away, home) for home, away in pairs] for pairs in rounds]
+
+
+def _outcome(home_goals, away_goals):
+    if home_goals > away_goals:
+        return SoccerMatch.OUTCOME_HOME_WIN
+    if home_goals < away_goals:
+        return SoccerMatch.OUTCOME_AWAY_WIN
+    return SoccerMatch.OUTCOME_DRAW
@@ -0,0 +1,335 @@
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete, pre_save
+from django.db.models import F
+from django.dispatch import receiver
+
+from .authentication import invalidate_cached_user
+from .caching import (
+    BOARD_AI,
+    BOARD_LINK,
+    BOARD_MATCH,
+    BOARD_POST,
+    BOARD_SECRET,
+    BOARD_THREAD,
+    bump_board_generation,
+    info_board,
+    post_board,
+)
+from .counters import FAVORITE_MATCHES, LIKED_COMMON_POSTS, apply_counter_changes, counter_names, increment_counter
+from .events import publish_event
+from .facets import FACET_FIELDS, apply_facet_change, facet_key, match_facet_key
+from .likes import invalidate_liked_set, recount_likes
+from .models import (
+    Comment,
+    InfoPost,
+    LinkPost,
+    MatchFavoriteSlot,
+    Post,
+    PostImage,
+    PostRanking,
+    Profile,
+    SoccerMatch,
+    Team,
+    TeamAlias,
+)
+from .rankings import refresh_post_ranking
+from .standings import record_match_result, remove_match_result
+from .teams import TEAM_NAME_FIELDS, link_match_teams, relink_alias
+
+
+@receiver(pre_save, sender=Post)
+@receiver(pre_save, sender=InfoPost)
+def remember_board_category(sender, instance, update_fields=None, **kwargs):
+    # 카테고리를 옮기면 이전 게시판의 캐시된 목록에도 글이 남아 있으므로 저장 전 값을 기억해 둔다.
+    if not instance.pk or (update_fields is not None and "category" not in update_fields):
+        instance._previous_category = None
+        return
+    instance._previous_category = (
+        sender.objects.filter(pk=instance.pk).values_list("category", flat=True).first()
+    )
+
+
+def _category_boards(instance, board_for):
+    boards = {board_for(instance.category)}
+    previous = getattr(instance, "_previous_category", None)
+    if previous is not None:
+        boards.add(board_for(previous))
+        instance._previous_category = None
+    return boards
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def invalidate_post_board(sender, instance, **kwargs):
+    bump_board_generation(*_category_boards(instance, post_board))
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+@receiver(post_save, sender=PostImage)
+@receiver(post_delete, sender=PostImage)
+def invalidate_post_children(sender, instance, **kwargs):
+    category = Post.objects.filter(id=instance.post_id).values_list("category", flat=True).first()
+    bump_board_generation(post_board(category))
+
+
+@receiver(post_save, sender=InfoPost)
+@receiver(post_delete, sender=InfoPost)
+def invalidate_info_board(sender, instance, **kwargs):
+    bump_board_generation(*_category_boards(instance, info_board))
+
+
+@receiver(post_save, sender=LinkPost)
+@receiver(post_delete, sender=LinkPost)
+def invalidate_link_board(sender, instance, **kwargs):
+    bump_board_generation(BOARD_LINK)
+
+
+@receiver(post_save, sender=SoccerMatch)
+@receiver(post_delete, sender=SoccerMatch)
+@receiver(post_save, sender=Team)
+@receiver(post_delete, sender=Team)
+@receiver(post_delete, sender=TeamAlias)
+def invalidate_match_board(sender, instance, **kwargs):
+    bump_board_generation(BOARD_MATCH)
+
+
+@receiver(m2m_changed, sender=Post.likes.through)
+def invalidate_post_likes(sender, instance, action, reverse, pk_set, **kwargs):
+    if not action.startswith("post_"):
+        return
+    if reverse and pk_set is None:
+        bump_board_generation(BOARD_POST, BOARD_SECRET)
+    elif reverse:
+        categories = set(Post.objects.filter(id__in=pk_set).values_list("category", flat=True))
+        bump_board_generation(*(post_board(category) for category in categories))
+    else:
+        bump_board_generation(post_board(instance.category))
+
+
+@receiver(m2m_changed, sender=InfoPost.likes.through)
+def invalidate_info_likes(sender, instance, action, reverse, pk_set, **kwargs):
+    if not action.startswith("post_"):
+        return
+    if reverse and pk_set is None:
+        bump_board_generation(BOARD_THREAD, BOARD_AI)
+    elif reverse:
+        categories = set(InfoPost.objects.filter(id__in=pk_set).values_list("category", flat=True))
+        bump_board_generation(*(info_board(category) for category in categories))
+    else:
+        bump_board_generation(info_board(instance.category))
+
+
+COUNTED_FIELDS = {"category", "is_recommended"}
+
+
+@receiver(pre_save, sender=Post)
+@receiver(pre_save, sender=InfoPost)
+@receiver(pre_save, sender=LinkPost)
+def remember_counter_names(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and not COUNTED_FIELDS.intersection(update_fields):
+        instance._counter_names = None
+        return
+    previous = sender.objects.filter(pk=instance.pk).first() if instance.pk else None
+    instance._counter_names = counter_names(previous) if previous else set()
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_save, sender=InfoPost)
+@receiver(post_save, sender=LinkPost)
+def update_board_counters(sender, instance, created, raw=False, **kwargs):
+    old_names = getattr(instance, "_counter_names", None)
+    if raw or old_names is None:
+        return
+    apply_counter_changes(set() if created else old_names, counter_names(instance))
+    instance._counter_names = None
+
+
+@receiver(post_delete, sender=Post)
+@receiver(post_delete, sender=InfoPost)
+@receiver(post_delete, sender=LinkPost)
+def decrement_board_counters(sender, instance, **kwargs):
+    apply_counter_changes(counter_names(instance), set())
+
+
+@receiver(m2m_changed, sender=Post.likes.through)
+def update_post_rankings(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == "pre_clear" and reverse:
+        instance._cleared_post_ids = set(instance.liked_posts.values_list("id", flat=True))
+        return
+    if not action.startswith("post_"):
+        return
+    if not reverse:
+        post_ids = {instance.pk}
+    elif pk_set is not None:
+        post_ids = pk_set
+    else:
+        post_ids = getattr(instance, "_cleared_post_ids", set())
+    if post_ids:
+        recount_likes("post", post_ids)
+    for post_id in post_ids:
+        refresh_post_ranking(post_id)
+
+
+@receiver(m2m_changed, sender=InfoPost.likes.through)
+def update_info_like_counts(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == "pre_clear" and reverse:
+        instance._cleared_info_ids = set(instance.liked_infoposts.values_list("id", flat=True))
+        return
+    if not action.startswith("post_"):
+        return
+    if not reverse:
+        info_ids = {instance.pk}
+    elif pk_set is not None:
+        info_ids = pk_set
+    else:
+        info_ids = getattr(instance, "_cleared_info_ids", set())
+    if info_ids:
+        recount_likes("info", info_ids)
+
+
+@receiver(m2m_changed, sender=Post.likes.through)
+@receiver(m2m_changed, sender=InfoPost.likes.through)
+def invalidate_liked_sets(sender, instance, action, reverse, pk_set, **kwargs):
+    kind = "post" if sender is Post.likes.through else "info"
+    if action == "pre_clear" and not reverse:
+        instance._cleared_liker_ids = set(instance.likes.values_list("id", flat=True))
+        return
+    if not action.startswith("post_"):
+        return
+    if reverse:
+        user_ids = {instance.pk}
+    elif pk_set is not None:
+        user_ids = pk_set
+    else:
+        user_ids = getattr(instance, "_cleared_liker_ids", set())
+    invalidate_liked_set(kind, *user_ids)
+
+
+@receiver(post_save, sender=PostRanking)
+def increment_liked_counter(sender, instance, created, **kwargs):
+    if created and instance.category == 'common':
+        increment_counter(LIKED_COMMON_POSTS, 1)
+
+
+@receiver(post_delete, sender=PostRanking)
+def decrement_liked_counter(sender, instance, **kwargs):
+    if instance.category == 'common':
+        increment_counter(LIKED_COMMON_POSTS, -1)
+
+
+@receiver(post_save, sender=Comment)
+def increment_comment_count(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        Post.objects.filter(id=instance.post_id).update(comment_count=F("comment_count") + 1)
+        if instance.parent_id:
+            Comment.objects.filter(id=instance.thread_id).update(reply_count=F("reply_count") + 1)
+
+
+@receiver(post_delete, sender=Comment)
+def decrement_comment_count(sender, instance, **kwargs):
+    Post.objects.filter(id=instance.post_id, comment_count__gt=0).update(comment_count=F("comment_count") - 1)
+    if instance.parent_id:
+        Comment.objects.filter(id=instance.thread_id, reply_count__gt=0).update(reply_count=F("reply_count") - 1)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user_snapshot(sender, instance, **kwargs):
+    invalidate_cached_user(instance.pk)
+
+
+@receiver(post_save, sender=Profile)
+@receiver(post_delete, sender=Profile)
+def invalidate_profile_snapshot(sender, instance, **kwargs):
+    invalidate_cached_user(instance.user_id)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_save, sender=InfoPost)
+def publish_new_post(sender, instance, created, raw=False, **kwargs):
+    if not created or raw:
+        return
+    channel = post_board(instance.category) if sender is Post else info_board(instance.category)
+    data = {"id": instance.pk, "title": instance.title, "author": instance.author}
+    transaction.on_commit(lambda: publish_event(channel, "post", data))
+
+
+@receiver(pre_delete, sender=SoccerMatch)
+def release_favorite_slot(sender, instance, **kwargs):
+    # on_delete=SET_NULL 은 시그널 없이 칸을 비우므로 카운터는 여기서 먼저 맞춘다.
+    if MatchFavoriteSlot.objects.filter(match_id=instance.pk).update(match=None, liked_at=None):
+        increment_counter(FAVORITE_MATCHES, -1)
+
+
+@receiver(post_save, sender=SoccerMatch)
+def update_match_teams(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or (update_fields is not None and not TEAM_NAME_FIELDS.intersection(update_fields)):
+        return
+    link_match_teams(instance)
+
+
+@receiver(post_save, sender=TeamAlias)
+def relink_alias_matches(sender, instance, created=False, raw=False, **kwargs):
+    # 새 별칭은 아직 이어진 경기가 없다. 팀을 옮긴 기존 별칭만 경기를 다시 잇는다.
+    if not raw and not created:
+        relink_alias(instance.name, instance.team_id)
+
+
+@receiver(pre_save, sender=SoccerMatch)
+def remember_facet_key(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and not FACET_FIELDS.intersection(update_fields):
+        instance._facet_key = False
+        return
+    previous = (
+        SoccerMatch.objects.filter(pk=instance.pk).values_list("league", "year", "score").first()
+        if instance.pk else None
+    )
+    instance._facet_key = facet_key(*previous) if previous else None
+
+
+@receiver(post_save, sender=SoccerMatch)
+def update_match_facets(sender, instance, created, raw=False, **kwargs):
+    old_key = getattr(instance, "_facet_key", False)
+    if raw or old_key is False:
+        return
+    apply_facet_change(None if created else old_key, match_facet_key(instance))
+    instance._facet_key = False
+
+
+@receiver(post_delete, sender=SoccerMatch)
+def decrement_match_facets(sender, instance, **kwargs):
+    apply_facet_change(match_facet_key(instance), None)
+
+
+STANDING_FIELDS = {"score", "league", "year", "home_team", "away_team"}
+
+
+@receiver(post_save, sender=SoccerMatch)
+def update_league_standings(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or (update_fields is not None and not STANDING_FIELDS.intersection(update_fields)):
+        return
+    record_match_result(instance)
+
+
+@receiver(pre_delete, sender=SoccerMatch)
+def revert_league_standings(sender, instance, **kwargs):
+    remove_match_result(instance.pk)
+
+
+MATCH_EVENT_FIELDS = {"score", "result"}
+
+
+@receiver(post_save, sender=SoccerMatch)
+def publish_match_score(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if created or raw or (update_fields is not None and not MATCH_EVENT_FIELDS.intersection(update_fields)):
+        return
+    data = {
+        "id": instance.pk,
+        "score": instance.score or "",
+        "result": instance.result,
+        "status_label": instance.prediction_status_label,
+        "status_class": instance.prediction_status_class,
+    }
+    transaction.on_commit(lambda: publish_event(BOARD_MATCH, "score", data))
@@ -0,0 +1,187 @@
+from collections import defaultdict
+
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .caching import BOARD_MATCH, bump_board_generation
+from .models import SCORE_COLUMNS, MatchStanding, SoccerMatch, TeamStanding, parse_score, score_columns
+
+
+WIN_POINTS = 3
+DRAW_POINTS = 1
+STANDING_BATCH_SIZE = 500
+RECORD_ATTEMPTS = 2
+
+# 팀은 이름이 아니라 Team FK 로 센다. 같은 팀의 다른 표기(별칭)로 들어온 경기도 한 팀의 성적이 된다.
+ENTRY_FIELDS = ("league", "year", "home_club_id", "away_club_id", "home_goals", "away_goals")
+STAT_FIELDS = ("played", "won", "drawn", "lost", "goals_for", "goals_against", "goal_difference", "points")
+TABLE_ORDER = ("-points", "-goal_difference", "-goals_for", "team__name")
+
+
+def standing_entry(league, year, home_club_id, away_club_id, score):
+    # 경기 한 건이 순위표에 반영할 값(ENTRY_FIELDS 순서). 끝나지 않았거나 스코어를 읽을 수 없거나
+    # 아직 팀 FK 가 비어 있으면(수집기가 넣고 sync_match_teams 전) None.
+    goals = parse_score(score)
+    if goals is None or year is None or home_club_id is None or away_club_id is None:
+        return None
+    return (league, year, home_club_id, away_club_id, *goals)
+
+
+def _team_stats(goals_for, goals_against):
+    won = goals_for > goals_against
+    drawn = goals_for == goals_against
+    return {
+        "played": 1,
+        "won": int(won),
+        "drawn": int(drawn),
+        "lost": int(not won and not drawn),
+        "goals_for": goals_for,
+        "goals_against": goals_against,
+        "goal_difference": goals_for - goals_against,
+        "points": WIN_POINTS if won else DRAW_POINTS if drawn else 0,
+    }
+
+
+def entry_stats(entry):
+    league, year, home_club_id, away_club_id, home_goals, away_goals = entry
+    return [
+        ((league, year, home_club_id), _team_stats(home_goals, away_goals)),
+        ((league, year, away_club_id), _team_stats(away_goals, home_goals)),
+    ]
+
+
+def _apply_entry(entry, sign):
+    for (league, year, team_id), stats in entry_stats(entry):
+        rows = TeamStanding.objects.filter(league=league, year=year, team_id=team_id)
+        changes = {field: F(field) + sign * value for field, value in stats.items()}
+        if rows.update(**changes) or sign < 0:
+            continue
+        try:
+            with transaction.atomic():
+                TeamStanding.objects.create(league=league, year=year, team_id=team_id, **stats)
+        except IntegrityError:
+            rows.update(**changes)
+
+
+def _record_entry(match_id, entry):
+    # 원장 행을 잠그고 이전 값과 비교해 차이만 순위표에 옮긴다. 바뀐 게 없으면 False.
+    # 같은 경기의 첫 결과가 동시에 들어오면 원장 INSERT 가 한쪽에서 실패하고, 그쪽은 통째로 되돌린 뒤 다시 읽는다.
+    for attempt in range(RECORD_ATTEMPTS):
+        try:
+            with transaction.atomic():
+                previous = (
+                    MatchStanding.objects.select_for_update()
+                    .filter(match_id=match_id)
+                    .values_list(*ENTRY_FIELDS)
+                    .first()
+                )
+                if previous == entry:
+                    return False
+                if previous is not None:
+                    _apply_entry(previous, -1)
+                if entry is None:
+                    MatchStanding.objects.filter(match_id=match_id).delete()
+                    return True
+                _apply_entry(entry, 1)
+                values = dict(zip(ENTRY_FIELDS, entry))
+                if previous is None:
+                    MatchStanding.objects.create(match_id=match_id, **values)
+                else:
+                    MatchStanding.objects.filter(match_id=match_id).update(updated_at=timezone.now(), **values)
+                return True
+        except IntegrityError:
+            if attempt + 1 == RECORD_ATTEMPTS:
+                raise
+    return False
+
+
+def record_match_result(match):
+    entry = standing_entry(match.league, match.year, match.home_club_id, match.away_club_id, match.score)
+    return _record_entry(match.pk, entry)
+
+
+def remove_match_result(match_id):
+    return _record_entry(match_id, None)
+
+
+def league_table(league, year):
+    # (league, year, -points, -goal_difference, -goals_for) 인덱스를 그대로 타는 한 번의 조회.
+    # 별칭이 다른 팀으로 옮겨져 경기가 하나도 남지 않은 팀은 0 경기 줄로 남으므로 뺀다.
+    return (
+        TeamStanding.objects.filter(league=league, year=year, played__gt=0)
+        .select_related("team")
+        .order_by(*TABLE_ORDER)
+    )
+
+
+def sync_standings(batch_size=STANDING_BATCH_SIZE, match_ids=None):
+    # 외부 수집기가 soccer_matches 에 직접 쓴 결과나 relink_alias 가 옮긴 팀 FK 는 시그널이 돌지 않는다.
+    # 스코어가 있는 경기와 원장을 한 번에 읽어 어긋난 경기만 다시 반영한다. match_ids 를 주면 그 경기만 본다.
+    rows = SoccerMatch.objects.filter((Q(score__isnull=False) & ~Q(score="")) | Q(standing_entry__isnull=False))
+    if match_ids is not None:
+        rows = rows.filter(id__in=match_ids)
+    rows = (
+        rows.order_by("id")
+        .values_list(
+            "id", "league", "year", "home_club_id", "away_club_id", "score",
+            *(f"standing_entry__{field}" for field in ENTRY_FIELDS),
+        )
+    )
+    changed = 0
+    for row in rows.iterator(chunk_size=batch_size):
+        entry = standing_entry(*row[1:6])
+        previous = row[6:] if row[6] is not None else None
+        if previous != entry and _record_entry(row[0], entry):
+            changed += 1
+    if changed:
+        bump_board_generation(BOARD_MATCH)
+    return changed
+
+
+def sync_score_columns(SoccerMatch=SoccerMatch, batch_size=STANDING_BATCH_SIZE):
+    # 수집기가 score 만 UPDATE 한 행은 home_goals/away_goals 가 예전 값으로 남는다(status 는 DB 가 계산한다).
+    # 한 번 훑어 score 에서 다시 계산한 값과 다른 행만 bulk_update 한다.
+    rows = SoccerMatch.objects.order_by("id").values_list("id", "score", *SCORE_COLUMNS)
+    stale = []
+    for match_id, score, *stored in rows.iterator(chunk_size=batch_size):
+        values = score_columns(score)
+        if stored != [values[field] for field in SCORE_COLUMNS]:
+            stale.append(SoccerMatch(id=match_id, **values))
+    SoccerMatch.objects.bulk_update(stale, SCORE_COLUMNS, batch_size=batch_size)
+    return len(stale)
+
+
+def rebuild_standings(SoccerMatch=SoccerMatch, TeamStanding=TeamStanding, MatchStanding=MatchStanding,
+                      batch_size=STANDING_BATCH_SIZE):
+    # 원장과 순위표를 soccer_matches 에서 처음부터 다시 만든다. 스코어는 여기서 한 번만 파싱한다.
+    rows = (
+        SoccerMatch.objects.exclude(score__isnull=True)
+        .exclude(score="")
+        .order_by("id")
+        .values_list("id", "league", "year", "home_club_id", "away_club_id", "score")
+    )
+    totals = defaultdict(lambda: dict.fromkeys(STAT_FIELDS, 0))
+    entries = []
+    for match_id, *fields in rows.iterator(chunk_size=batch_size):
+        entry = standing_entry(*fields)
+        if entry is None:
+            continue
+        entries.append(MatchStanding(match_id=match_id, **dict(zip(ENTRY_FIELDS, entry))))
+        for key, stats in entry_stats(entry):
+            team_totals = totals[key]
+            for field, value in stats.items():
+                team_totals[field] += value
+
+    with transaction.atomic():
+        MatchStanding.objects.all().delete()
+        TeamStanding.objects.all().delete()
+        MatchStanding.objects.bulk_create(entries, batch_size=batch_size)
+        TeamStanding.objects.bulk_create(
+            (
+                TeamStanding(league=league, year=year, team_id=team_id, **stats)
+                for (league, year, team_id), stats in totals.items()
+            ),
+            batch_size=batch_size,
+        )
+    return len(totals)
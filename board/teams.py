@@ -0,0 +1,130 @@
+from django.db import IntegrityError, transaction
+from django.db.models import Case, Count, F, Q, Sum, When
+
+from .caching import BOARD_MATCH, bump_board_generation
+from .models import MatchStanding, SoccerMatch, Team, TeamAlias
+from .standings import sync_standings
+
+
+# (경기의 팀 이름 컬럼, 팀 FK) 짝.
+TEAM_SIDES = (("home_team", "home_club"), ("away_team", "away_club"))
+TEAM_NAME_FIELDS = {"home_team", "away_team"}
+
+
+def resolve_team(name, Team=Team, TeamAlias=TeamAlias):
+    # 별칭으로 팀을 찾는다. 처음 보는 이름이면 같은 이름의 팀(없으면 새로)에 별칭을 붙인다.
+    if not name:
+        return None
+    alias = TeamAlias.objects.select_related("team").filter(name=name).first()
+    if alias is not None:
+        return alias.team
+    try:
+        with transaction.atomic():
+            team, _ = Team.objects.get_or_create(name=name)
+            TeamAlias.objects.create(name=name, team=team)
+    except IntegrityError:
+        return TeamAlias.objects.select_related("team").get(name=name).team
+    return team
+
+
+def link_match_teams(match):
+    # 저장된 경기 한 건의 팀 FK 를 이름에 맞춘다. 바뀐 경우에만 UPDATE 한다.
+    changes = {}
+    for name_field, club_field in TEAM_SIDES:
+        team = resolve_team(getattr(match, name_field))
+        if getattr(match, f"{club_field}_id") != (team.pk if team else None):
+            changes[club_field] = team
+            setattr(match, club_field, team)
+    if changes:
+        SoccerMatch.objects.filter(pk=match.pk).update(**changes)
+    return bool(changes)
+
+
+def relink_alias(name, team_id):
+    # 별칭이 다른 팀으로 옮겨지면 그 이름으로 들어온 경기의 FK 를 이름 단위 UPDATE 로 옮긴다.
+    # 순위표 원장도 팀 FK 로 세므로 옮긴 경기만 다시 반영해 두 팀의 성적을 합친다.
+    match_ids = set()
+    for name_field, club_field in TEAM_SIDES:
+        # 비어 있는 FK 는 sync_match_teams 몫이다. exclude 만 쓰면 NULL 도 걸리므로 따로 뺀다.
+        moved = SoccerMatch.objects.filter(**{name_field: name, f"{club_field}__isnull": False}).exclude(
+            **{club_field: team_id}
+        )
+        ids = list(moved.values_list("id", flat=True))
+        moved.filter(id__in=ids).update(**{club_field: team_id})
+        match_ids.update(ids)
+    if match_ids:
+        sync_standings(match_ids=match_ids)
+        bump_board_generation(BOARD_MATCH)
+    return len(match_ids)
+
+
+def sync_match_teams(SoccerMatch=SoccerMatch, Team=Team, TeamAlias=TeamAlias):
+    # 수집기가 직접 넣은 경기는 팀 FK 가 비어 있다. 비어 있는 이름만 모아 별칭으로 풀고 이름마다 한 번씩 UPDATE 한다.
+    linked = 0
+    for name_field, club_field in TEAM_SIDES:
+        empty = SoccerMatch.objects.filter(**{f"{club_field}__isnull": True})
+        names = list(empty.order_by().values_list(name_field, flat=True).distinct())
+        for name in names:
+            team = resolve_team(name, Team, TeamAlias)
+            if team is not None:
+                linked += empty.filter(**{name_field: name}).update(**{club_field: team})
+    return linked
+
+
+def _union(*querysets):
+    # OR 조건 대신 각자 (팀 FK, match_date) 인덱스를 타는 SELECT 들을 UNION ALL 로 붙인다.
+    first, *rest = [queryset.order_by() for queryset in querysets]
+    return first.union(*rest, all=True).order_by("-match_date", "-id")
+
+
+def team_matches(team):
+    return _union(
+        SoccerMatch.objects.filter(home_club=team),
+        SoccerMatch.objects.filter(away_club=team),
+    )
+
+
+def head_to_head_matches(team, opponent):
+    return _union(
+        SoccerMatch.objects.filter(home_club=team, away_club=opponent),
+        SoccerMatch.objects.filter(home_club=opponent, away_club=team),
+    )
+
+
+def head_to_head_summary(team, opponent):
+    # team 기준 통산 전적. 목록(최근 경기)과 달리 끝난 경기 전체를 순위표 원장에서 한 번에 집계한다.
+    at_home = Q(home_club=team)
+    won = Q(at_home, home_goals__gt=F("away_goals")) | Q(~at_home, away_goals__gt=F("home_goals"))
+    lost = Q(at_home, home_goals__lt=F("away_goals")) | Q(~at_home, away_goals__lt=F("home_goals"))
+    summary = MatchStanding.objects.filter(
+        Q(home_club=team, away_club=opponent) | Q(home_club=opponent, away_club=team),
+    ).aggregate(
+        played=Count("pk"),
+        won=Count("pk", filter=won),
+        drawn=Count("pk", filter=Q(home_goals=F("away_goals"))),
+        lost=Count("pk", filter=lost),
+        goals_for=Sum(Case(When(at_home, then=F("home_goals")), default=F("away_goals"))),
+        goals_against=Sum(Case(When(at_home, then=F("away_goals")), default=F("home_goals"))),
+    )
+    summary["goals_for"] = summary["goals_for"] or 0
+    summary["goals_against"] = summary["goals_against"] or 0
+    return summary
+
+
+def team_payload(team):
+    return {"id": team.id, "name": team.name, "english_name": team.english_name}
+
+
+def match_payload(match):
+    return {
+        "id": match.id,
+        "match_date": match.match_date.isoformat(),
+        "league": match.league,
+        "year": match.year,
+        "round_num": match.round_num,
+        "home_team": match.home_team,
+        "away_team": match.away_team,
+        "home_team_id": match.home_club_id,
+        "away_team_id": match.away_club_id,
+        "score": match.score or None,
+    }
@@ -0,0 +1,45 @@
+from django.conf import settings
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+from .nplusone import MIDDLEWARE_PATH, detect_n_plus_one
+
+
+class NPlusOneTestMixin:
+    def assertNoNPlusOne(self, threshold=None):
+        return detect_n_plus_one(threshold, raise_error=True)
+
+
+class NPlusOneTestRunner(DiscoverRunner):
+    # TEST_RUNNER 로 지정하면 모든 테스트 요청에 감지기를 붙이고,
+    # --fail-on-n-plus-one 이면 감지 즉시 해당 테스트를 실패시킨다.
+    def __init__(self, fail_on_n_plus_one=False, **kwargs):
+        super().__init__(**kwargs)
+        self.fail_on_n_plus_one = fail_on_n_plus_one
+        self._override = None
+
+    @classmethod
+    def add_arguments(cls, parser):
+        super().add_arguments(parser)
+        parser.add_argument(
+            "--fail-on-n-plus-one",
+            action="store_true",
+            help="N+1 쿼리가 감지되면 테스트를 실패시킵니다.",
+        )
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        middleware = list(settings.MIDDLEWARE)
+        if MIDDLEWARE_PATH not in middleware:
+            middleware.insert(0, MIDDLEWARE_PATH)
+        self._override = override_settings(
+            MIDDLEWARE=middleware,
+            BOARD_NPLUSONE_ENABLED=True,
+            BOARD_NPLUSONE_RAISE=self.fail_on_n_plus_one,
+        )
+        self._override.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        if self._override is not None:
+            self._override.disable()
+        super().teardown_test_environment(**kwargs)
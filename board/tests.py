@@ -1,9 +1,72 @@
-from django.test import SimpleTestCase
-from unittest.mock import patch
+import asyncio
+import csv
+import gzip
+import json
+import math
+import tempfile
+import threading
+import time
+from datetime import timedelta
+from unittest.mock import AsyncMock, Mock, patch
 
-from board.models import SoccerMatch
+from asgiref.sync import async_to_sync, iscoroutinefunction, sync_to_async
+from django.contrib.auth.models import AnonymousUser, Permission, User
+from django.db.models import Q
+from django.contrib.sessions.backends.cache import SessionStore
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.http import HttpResponse
+from django.template import Context, Template
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+
+from board import hashing
+from board.authentication import CachedAuthenticationMiddleware
+from board.benchmarks import compare_report, run_benchmark
+from board.caching import (
+    BOARD_LINK,
+    BOARD_MATCH,
+    BOARD_POST,
+    BOARD_SECRET,
+    bump_board_generation,
+    cache_anonymous_page,
+    get_board_generations,
+)
+from board.comments import comment_page, decode_cursor, encode_cursor
+from board.counters import FAVORITE_MATCHES, LIKED_COMMON_POSTS, RECOMMENDED_LINKS, CountedPaginator, get_counter, rebuild_counters
+from board.events import RESYNC, LocalEventBroker, event_stream
+from board.exports import export_rows
+from board.facets import FACET_CACHE_KEY, match_facets, rebuild_facets
+from board.likes import liked_set, mark_liked
+from board.loadtest import cookie_headers, parse_access_log
+from board.hashing import HashingBusy, run_hashing
+from board.metrics import Histogram, MetricsRegistry
+from board.middleware import PerformanceMiddleware
+from board.models import (
+    Comment,
+    InfoPost,
+    LinkPost,
+    MatchFavoriteSlot,
+    Post,
+    PostRanking,
+    Profile,
+    RequestProfile,
+    SoccerMatch,
+    Team,
+    TeamAlias,
+    TeamRating,
+)
+from board.nplusone import NPlusOneDetected, NPlusOneMiddleware, fingerprint
+from board.profiling import ProfilingMiddleware, arm_profiling, armed_profiling, make_profile_token
+from board.queries import top_n_by_filter, top_n_per_group
+from board.rankings import ranked_posts, trending_score
+from board.ratings import DEFAULT_GOALS, ELO_START, attach_probabilities, league_ratings, update_ratings
+from board.seeding import BoardSeeder
+from board.standings import league_table, parse_score, rebuild_standings, sync_score_columns, sync_standings
+from board.teams import sync_match_teams
 from board.templatetags.board_extras import render_post_content
-from board.views import _format_accuracy_rate, _match_bet_accuracy_stats
+from board.testing import NPlusOneTestMixin
+from board.views import _format_accuracy_rate, _get_display_name, _match_bet_accuracy_stats
 
 
 class RenderPostContentTests(SimpleTestCase):
@@ -85,3 +148,1221 @@ class MatchBetAccuracyTests(SimpleTestCase):
             _match_bet_accuracy_stats(),
             {"completed_bet_count": 5, "accuracy": "40%"},
         )
+
+
+class AnonymousPageCacheTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.factory = RequestFactory()
+        self.view = Mock(side_effect=lambda request: HttpResponse("page"))
+        self.cached_view = cache_anonymous_page("test-board")(self.view)
+
+    def _get(self, path="/board/?page=2", user=None):
+        request = self.factory.get(path)
+        request.user = user or AnonymousUser()
+        return self.cached_view(request)
+
+    def test_second_anonymous_request_is_served_from_cache(self):
+        self.assertEqual(self._get()["X-Board-Cache"], "miss")
+        response = self._get()
+
+        self.assertEqual(response["X-Board-Cache"], "hit")
+        self.assertEqual(response.content, b"page")
+        self.assertEqual(self.view.call_count, 1)
+
+    def test_query_string_is_part_of_key(self):
+        self._get("/board/?page=1")
+        self._get("/board/?page=2")
+
+        self.assertEqual(self.view.call_count, 2)
+
+    def test_bumping_generation_invalidates_page(self):
+        self._get()
+        bump_board_generation("test-board")
+        response = self._get()
+
+        self.assertEqual(response["X-Board-Cache"], "miss")
+        self.assertEqual(self.view.call_count, 2)
+
+    def test_authenticated_requests_bypass_cache(self):
+        user = Mock(is_authenticated=True)
+        self._get(user=user)
+        response = self._get(user=user)
+
+        self.assertNotIn("X-Board-Cache", response)
+        self.assertEqual(self.view.call_count, 2)
+
+
+class BoardCounterTests(TestCase):
+    def test_create_and_delete_maintain_category_counts(self):
+        post = Post.objects.create(title="제목", content="내용", category="common")
+        Post.objects.create(title="비밀", content="내용", category="secret")
+
+        self.assertEqual(get_counter("post:common"), 1)
+        self.assertEqual(get_counter("post:secret"), 1)
+
+        post.delete()
+        self.assertEqual(get_counter("post:common"), 0)
+
+    def test_category_move_invalidates_both_boards(self):
+        post = Post.objects.create(title="제목", content="내용", category="common")
+        generations = get_board_generations([BOARD_POST, BOARD_SECRET])
+
+        post.category = "secret"
+        post.save(update_fields=["category"])
+        after = get_board_generations([BOARD_POST, BOARD_SECRET])
+        self.assertNotEqual(after[0], generations[0])
+        self.assertNotEqual(after[1], generations[1])
+
+    def test_recommended_toggle_moves_link_between_counters(self):
+        link = LinkPost.objects.create(title="링크", url="https://example.com", category="best")
+        self.assertEqual(get_counter(RECOMMENDED_LINKS), 0)
+
+        link.is_recommended = True
+        link.save()
+        self.assertEqual(get_counter(RECOMMENDED_LINKS), 1)
+        self.assertEqual(get_counter("link:best"), 1)
+
+    def test_first_and_last_like_update_liked_counter(self):
+        user = User.objects.create_user("a@example.com")
+        other = User.objects.create_user("b@example.com")
+        post = Post.objects.create(title="제목", content="내용")
+
+        post.likes.add(user)
+        post.likes.add(other)
+        self.assertEqual(get_counter(LIKED_COMMON_POSTS), 1)
+
+        post.likes.remove(user, other)
+        self.assertEqual(get_counter(LIKED_COMMON_POSTS), 0)
+
+    def test_paginator_reads_counter_instead_of_counting(self):
+        Post.objects.create(title="제목", content="내용")
+        rebuild_counters()
+        paginator = CountedPaginator(Post.objects.order_by("-id"), 20, counter="post:common")
+
+        with self.assertNumQueries(1):
+            self.assertEqual(paginator.count, 1)
+
+
+class PostRankingTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("a@example.com")
+        self.other = User.objects.create_user("b@example.com")
+
+    def test_likes_maintain_ranking_row(self):
+        post = Post.objects.create(title="제목", content="내용")
+
+        post.likes.add(self.user, self.other)
+        self.assertEqual(PostRanking.objects.get(post=post).like_count, 2)
+
+        post.likes.remove(self.user, self.other)
+        self.assertFalse(PostRanking.objects.filter(post=post).exists())
+
+    def test_ranked_posts_sorted_by_like_count(self):
+        first = Post.objects.create(title="하나", content="내용")
+        second = Post.objects.create(title="둘", content="내용")
+        first.likes.add(self.user)
+        second.likes.add(self.user, self.other)
+
+        ranked = list(ranked_posts("common"))
+
+        self.assertEqual(ranked, [second, first])
+        self.assertEqual(ranked[0].like_count, 2)
+
+    def test_trending_score_decays_with_age(self):
+        now = timezone.now()
+
+        self.assertGreater(
+            trending_score(3, now - timedelta(hours=1), now),
+            trending_score(3, now - timedelta(days=1), now),
+        )
+
+
+class CommentPageTests(TestCase):
+    def setUp(self):
+        self.post = Post.objects.create(title="제목", content="내용")
+        self.comments = [Comment.objects.create(post=self.post, content=f"댓글 {i}") for i in range(5)]
+
+    def test_comment_count_is_denormalized(self):
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.comment_count, 5)
+
+        self.comments[0].delete()
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.comment_count, 4)
+
+    def test_cursor_walks_pages_newest_first(self):
+        first_page, cursor = comment_page(self.post, limit=3)
+        second_page, last_cursor = comment_page(self.post, cursor, limit=3)
+
+        self.assertEqual(first_page, self.comments[:1:-1])
+        self.assertEqual(second_page, self.comments[1::-1])
+        self.assertIsNone(last_cursor)
+
+    def test_cursor_round_trip(self):
+        comment = self.comments[0]
+
+        self.assertEqual(decode_cursor(encode_cursor(comment)), (comment.created_at, comment.id))
+        self.assertIsNone(decode_cursor("broken"))
+
+    def test_json_endpoint_returns_next_page(self):
+        response = self.client.get(f"/board/{self.post.id}/comments/json/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()["comments"]), 5)
+        self.assertIsNone(response.json()["next_cursor"])
+
+
+class CommentThreadTests(TestCase):
+    def setUp(self):
+        self.post = Post.objects.create(title="제목", content="내용")
+        self.root = Comment.objects.create(post=self.post, content="루트")
+
+    def test_reply_extends_parent_path(self):
+        reply = Comment.objects.create(post=self.post, parent=self.root, content="답글")
+        nested = Comment.objects.create(post=self.post, parent=reply, content="답답글")
+
+        self.assertEqual(reply.thread_id, self.root.id)
+        self.assertEqual(nested.depth, 2)
+        self.assertTrue(nested.path.startswith(reply.path + "."))
+
+    def test_reply_count_tracks_whole_thread(self):
+        reply = Comment.objects.create(post=self.post, parent=self.root, content="답글")
+        Comment.objects.create(post=self.post, parent=reply, content="답답글")
+        self.root.refresh_from_db()
+        self.assertEqual(self.root.reply_count, 2)
+
+        reply.delete()
+        self.root.refresh_from_db()
+        self.assertEqual(self.root.reply_count, 0)
+
+    def test_page_loads_threads_in_constant_queries(self):
+        reply = Comment.objects.create(post=self.post, parent=self.root, content="답글")
+        Comment.objects.create(post=self.post, parent=reply, content="답답글")
+        Comment.objects.create(post=self.post, parent=self.root, content="두번째 답글")
+
+        with self.assertNumQueries(2):
+            roots, _ = comment_page(self.post)
+
+        self.assertEqual(roots, [self.root])
+        self.assertEqual(
+            [comment.content for comment in roots[0].thread_replies],
+            ["답글", "답답글", "두번째 답글"],
+        )
+
+
+class PerformanceMiddlewareTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_server_timing_reports_queries_and_template(self):
+        def view(request):
+            list(Post.objects.all())
+            return HttpResponse(Template("{{ value }}").render(Context({"value": "ok"})))
+
+        request = RequestFactory().get("/board/")
+        response = PerformanceMiddleware(view)(request)
+
+        self.assertIn('desc="1 queries"', response["Server-Timing"])
+        self.assertIn("tpl;dur=", response["Server-Timing"])
+        self.assertIn("total;dur=", response["Server-Timing"])
+
+    def test_async_views_are_timed_on_the_event_loop(self):
+        async def view(request):
+            await Post.objects.acount()
+            return HttpResponse("ok")
+
+        middleware = PerformanceMiddleware(view)
+        self.assertTrue(iscoroutinefunction(middleware))
+        response = async_to_sync(middleware)(RequestFactory().get("/board/"))
+
+        self.assertIn('desc="1 queries"', response["Server-Timing"])
+
+    def test_registry_renders_cumulative_buckets(self):
+        registry = MetricsRegistry()
+        registry.register(Histogram("test_seconds", "Test.", "view", (0.1, 1), labels=lambda: ["a"]))
+        registry.observe("test_seconds", "a", 0.05)
+        registry.observe("test_seconds", "a", 0.5)
+
+        text = registry.render()
+
+        self.assertIn('test_seconds_bucket{view="a",le="0.1"} 1', text)
+        self.assertIn('test_seconds_bucket{view="a",le="1"} 2', text)
+        self.assertIn('test_seconds_count{view="a"} 2', text)
+
+    def test_metrics_endpoint_requires_staff_or_token(self):
+        self.assertEqual(self.client.get("/metrics/").status_code, 403)
+
+
+class NPlusOneDetectorTests(NPlusOneTestMixin, TestCase):
+    def test_fingerprint_ignores_literal_values(self):
+        self.assertEqual(
+            fingerprint("SELECT * FROM t WHERE id = 1 AND name = 'a'"),
+            fingerprint("SELECT *  FROM t WHERE id = 22 AND name = 'bb'"),
+        )
+        self.assertEqual(
+            fingerprint("SELECT * FROM t WHERE id IN (%s, %s)"),
+            fingerprint("SELECT * FROM t WHERE id IN (%s, %s, %s)"),
+        )
+
+    def test_repeated_queries_in_loop_are_reported(self):
+        posts = [Post.objects.create(title=f"제목 {i}", content="내용") for i in range(5)]
+
+        with self.assertRaises(NPlusOneDetected) as raised:
+            with self.assertNoNPlusOne(threshold=5):
+                for post in posts:
+                    post.images.exists()
+
+        self.assertIn("board/tests.py", str(raised.exception))
+
+    def test_single_batched_query_passes(self):
+        Post.objects.create(title="제목", content="내용")
+
+        with self.assertNoNPlusOne(threshold=2):
+            list(Post.objects.all())
+
+    @override_settings(BOARD_NPLUSONE_ENABLED=True, BOARD_NPLUSONE_THRESHOLD=3)
+    def test_middleware_reports_async_views(self):
+        posts = [Post.objects.create(title=f"제목 {i}", content="내용") for i in range(3)]
+
+        async def view(request):
+            for post in posts:
+                await post.images.aexists()
+            return HttpResponse("ok")
+
+        middleware = NPlusOneMiddleware(view)
+        self.assertTrue(iscoroutinefunction(middleware))
+        with self.assertLogs("board.nplusone", "WARNING") as logs:
+            response = async_to_sync(middleware)(RequestFactory().get("/board/"))
+
+        self.assertEqual(response["X-Board-NPlusOne"], "1")
+        self.assertIn("GET /board/", logs.output[0])
+
+
+class BenchmarkTests(TestCase):
+    def test_seeded_pages_stay_within_query_budgets(self):
+        BoardSeeder(seed=1).seed(
+            users=5, posts=60, comments=80, likes=120, infoposts=30, info_likes=20, links=40,
+            match_seasons=(2026, 2027),
+        )
+        self.assertGreater(Post.objects.get(id=Comment.objects.first().post_id).comment_count, 0)
+
+        report = run_benchmark(iterations=1, warmup=1)
+
+        self.assertEqual(compare_report(report), [])
+
+    def test_compare_report_flags_regressions_against_baseline(self):
+        baseline = {"results": {"home": {"p95_ms": 10.0, "max_queries": 5}}}
+        report = {"results": {"home": {
+            "p95_ms": 30.0, "max_queries": 6, "query_budget": 5, "status_codes": {"200": 1},
+        }}}
+
+        problems = compare_report(report, baseline, tolerance=1.5)
+
+        self.assertEqual(len(problems), 3)
+
+
+class ReplayLoadTests(SimpleTestCase):
+    def test_parse_access_log_reads_request_lines_and_skips_static(self):
+        requests = parse_access_log([
+            '1.2.3.4 - - [19/Oct/2026:10:00:00 +0900] "GET /board/?page=2 HTTP/1.1" 200 512 "-" "ua"',
+            '[19/Oct/2026 10:00:01] "POST /board/3/like/json/ HTTP/1.1" 200 40',
+            '1.2.3.4 - - [19/Oct/2026:10:00:02 +0900] "GET /static/app.css HTTP/1.1" 200 10',
+            "garbage",
+        ])
+
+        self.assertEqual([(r.method, r.path) for r in requests], [
+            ("GET", "/board/?page=2"),
+            ("POST", "/board/3/like/json/"),
+        ])
+        self.assertEqual(requests[1].route, "board:post_like_json")
+
+    def test_cookie_headers_forward_csrf_token(self):
+        headers = cookie_headers("sessionid=abc; csrftoken=xyz")
+
+        self.assertEqual(headers["X-CSRFToken"], "xyz")
+
+
+class RequestProfilingTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def view(self, request):
+        list(Post.objects.all())
+        time.sleep(0.03)
+        return HttpResponse("ok")
+
+    def test_signed_header_stores_profile_with_stacks_and_sql(self):
+        request = RequestFactory().get("/board/", HTTP_X_BOARD_PROFILE=make_profile_token("/board/"))
+
+        response = ProfilingMiddleware(self.view)(request)
+
+        profile = RequestProfile.objects.get(pk=response["X-Board-Profile-Id"])
+        self.assertEqual(profile.trigger, "header")
+        self.assertEqual(profile.query_count, 1)
+        self.assertGreater(profile.sample_count, 0)
+        self.assertIn("board.tests.view", profile.collapsed_stacks)
+
+    def test_sync_views_are_profiled_on_the_async_path(self):
+        async def get_response(request):
+            return await sync_to_async(self.view)(request)
+
+        middleware = ProfilingMiddleware(get_response)
+        self.assertTrue(iscoroutinefunction(middleware))
+        token = make_profile_token("/")
+        response = async_to_sync(middleware)(RequestFactory().get("/board/", HTTP_X_BOARD_PROFILE=token))
+
+        profile = RequestProfile.objects.get(pk=response["X-Board-Profile-Id"])
+        self.assertEqual(profile.query_count, 1)
+        self.assertGreater(profile.sample_count, 0)
+
+        response = async_to_sync(middleware)(RequestFactory().get("/events/board/", HTTP_X_BOARD_PROFILE=token))
+        self.assertNotIn("X-Board-Profile-Id", response)
+
+    def test_invalid_or_foreign_token_is_ignored(self):
+        for token in ["forged", make_profile_token("/menu5/")]:
+            ProfilingMiddleware(self.view)(RequestFactory().get("/board/", HTTP_X_BOARD_PROFILE=token))
+
+        self.assertFalse(RequestProfile.objects.exists())
+
+    def test_admin_toggle_profiles_next_requests_only(self):
+        arm_profiling("/board/", count=1)
+
+        for _ in range(2):
+            ProfilingMiddleware(self.view)(RequestFactory().get("/board/"))
+
+        self.assertEqual(RequestProfile.objects.filter(trigger="admin").count(), 1)
+
+    def test_stacks_download_requires_view_permission(self):
+        profile = RequestProfile.objects.create(
+            method="GET", path="/board/", trigger="admin", duration_ms=1, sample_interval_ms=5,
+            sample_count=1, collapsed_stacks="a;b 1", query_count=0, queries="[]",
+        )
+        staff = User.objects.create_user("staff@example.com", password="pw", is_staff=True)
+        self.client.force_login(staff)
+        url = f"/admin/board/requestprofile/{profile.pk}/stacks/"
+        self.assertEqual(self.client.get(url).status_code, 403)
+
+        staff.user_permissions.add(Permission.objects.get(codename="view_requestprofile"))
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, b"a;b 1")
+
+    def test_arming_requires_change_permission(self):
+        staff = User.objects.create_user("staff@example.com", password="pw", is_staff=True)
+        self.client.force_login(staff)
+        url = "/admin/board/requestprofile/arm/"
+        staff.user_permissions.add(Permission.objects.get(codename="view_requestprofile"))
+        self.assertEqual(self.client.post(url, {"prefix": "/board/"}).status_code, 403)
+        self.assertIsNone(armed_profiling())
+
+        staff.user_permissions.add(Permission.objects.get(codename="change_requestprofile"))
+        response = self.client.post(url, {"prefix": "/board/", "count": 2})
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(armed_profiling()["remaining"], 2)
+
+    @override_settings(BOARD_PROFILE_MAX_PER_MINUTE=1)
+    def test_rate_limit_caps_profiles_per_minute(self):
+        token = make_profile_token()
+        for _ in range(3):
+            ProfilingMiddleware(self.view)(RequestFactory().get("/board/", HTTP_X_BOARD_PROFILE=token))
+
+        self.assertEqual(RequestProfile.objects.count(), 1)
+
+
+class TopNQueryTests(TestCase):
+    def test_top_n_per_group_returns_latest_rows_per_category_in_one_query(self):
+        for i in range(4):
+            InfoPost.objects.create(title=f"thread {i}", content="내용", category='thread')
+            InfoPost.objects.create(title=f"ai {i}", content="내용", category='ai')
+
+        with self.assertNumQueries(1):
+            grouped = top_n_per_group(InfoPost.objects.all(), "category", ["-id"], 2, groups=['thread', 'ai', 'empty'])
+
+        self.assertEqual([post.title for post in grouped['thread']], ["thread 3", "thread 2"])
+        self.assertEqual([post.title for post in grouped['ai']], ["ai 3", "ai 2"])
+        self.assertEqual(grouped['empty'], [])
+
+    def test_top_n_by_filter_allows_overlapping_blocks(self):
+        for i in range(4):
+            LinkPost.objects.create(
+                category='best', title=f"link {i}", url=f"https://example.com/{i}", is_recommended=i % 2 == 0,
+            )
+
+        with self.assertNumQueries(1):
+            grouped = top_n_by_filter(LinkPost.objects.all(), {
+                "best": (Q(category='best'), ["-id"], 3),
+                "recommended": (Q(is_recommended=True), ["-id"], 5),
+            })
+
+        self.assertEqual([link.title for link in grouped["best"]], ["link 3", "link 2", "link 1"])
+        self.assertEqual([link.title for link in grouped["recommended"]], ["link 2", "link 0"])
+
+
+@override_settings(SESSION_ENGINE="django.contrib.sessions.backends.cache")
+class CachedAuthenticationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user("member@example.com", password="pw-12345")
+        Profile.objects.create(user=self.user, nickname="회원")
+        self.client.force_login(self.user)
+        self.session_key = self.client.cookies["sessionid"].value
+
+    def resolve_user(self):
+        request = RequestFactory().get("/")
+        request.session = SessionStore(self.session_key)
+        CachedAuthenticationMiddleware(lambda request: HttpResponse()).process_request(request)
+        return request.user
+
+    def test_warm_cache_resolves_user_and_nickname_without_queries(self):
+        _get_display_name(self.resolve_user())
+
+        with self.assertNumQueries(0):
+            user = self.resolve_user()
+            self.assertTrue(user.is_authenticated)
+            self.assertEqual(_get_display_name(user), "회원")
+
+    def test_profile_change_invalidates_snapshot(self):
+        self.resolve_user()
+        profile = Profile.objects.get(user=self.user)
+        profile.nickname = "새별명"
+        profile.save()
+
+        self.assertEqual(_get_display_name(self.resolve_user()), "새별명")
+
+    def test_password_change_logs_out_other_sessions(self):
+        self.resolve_user()
+        self.user.set_password("new-pw-12345")
+        self.user.save()
+
+        self.assertFalse(self.resolve_user().is_authenticated)
+
+
+class OffloadedPasswordHashingTests(TestCase):
+    def test_signup_then_login_with_pooled_hashing(self):
+        response = self.client.post("/signup/", {
+            "email": "new@example.com", "password": "pw-12345", "nickname": "새회원",
+        })
+        self.assertRedirects(response, "/", fetch_redirect_response=False)
+        user = User.objects.get(username="new@example.com")
+        self.assertTrue(user.check_password("pw-12345"))
+        self.assertEqual(user.profile.nickname, "새회원")
+
+        self.client.logout()
+        failed = self.client.post("/login/", {"email": "new@example.com", "password": "wrong"})
+        self.assertContains(failed, "이메일 또는 비밀번호가 올바르지 않습니다.")
+        response = self.client.post("/login/", {"email": "new@example.com", "password": "pw-12345"})
+        self.assertRedirects(response, "/", fetch_redirect_response=False)
+
+    def test_reset_sets_temporary_password_and_change_clears_it(self):
+        user = User.objects.create_user("member@example.com", password="old-pw")
+        Profile.objects.create(user=user, nickname="회원")
+
+        response = self.client.post("/password/reset/", {"email": "member@example.com", "nickname": "회원"})
+        temp_password = response.context["temp_password"]
+        response = self.client.post("/login/", {"email": "member@example.com", "password": temp_password})
+        self.assertRedirects(response, "/password/change/", fetch_redirect_response=False)
+
+        response = self.client.post("/password/change/", {
+            "new_password": "brand-new", "confirm_password": "brand-new",
+        })
+        self.assertRedirects(response, "/profile/", fetch_redirect_response=False)
+        user.refresh_from_db()
+        self.assertTrue(user.check_password("brand-new"))
+        self.assertFalse(user.profile.is_temporary_password)
+
+    def test_full_hashing_queue_returns_503(self):
+        with patch("board.views.aauthenticate_member", side_effect=HashingBusy):
+            response = self.client.post("/login/", {"email": "member@example.com", "password": "pw"})
+
+        self.assertEqual(response.status_code, 503)
+
+    async def test_cancelled_request_holds_slot_until_hash_finishes(self):
+        started, release = threading.Event(), threading.Event()
+
+        def slow_hash():
+            started.set()
+            release.wait(5)
+
+        task = asyncio.ensure_future(run_hashing("make", slow_hash))
+        await asyncio.to_thread(started.wait, 5)
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+        # 풀에서 아직 계산 중이므로 자리를 돌려주지 않는다.
+        self.assertEqual(hashing._pending, 1)
+        release.set()
+        for _ in range(100):
+            if hashing._pending == 0:
+                break
+            await asyncio.sleep(0.01)
+        self.assertEqual(hashing._pending, 0)
+
+
+class AsyncLikeEndpointTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user("liker@example.com", password="pw")
+        self.client.force_login(self.user)
+
+    def _match(self, match_id, **fields):
+        return SoccerMatch.objects.create(
+            match_id=match_id,
+            match_date=timezone.now(),
+            league="EPL",
+            home_team="Home",
+            away_team="Away",
+            **fields,
+        )
+
+    def test_post_like_toggles_and_refreshes_ranking(self):
+        post = Post.objects.create(title="제목", content="본문", category="common", author="작성자")
+
+        response = self.client.post(f"/board/{post.id}/like/json/")
+        self.assertEqual(response.json(), {"like_count": 1, "is_liked": True})
+        self.assertEqual(PostRanking.objects.get(post=post).like_count, 1)
+        self.assertEqual(get_counter(LIKED_COMMON_POSTS), 1)
+
+        response = self.client.post(f"/board/{post.id}/like/json/")
+        self.assertEqual(response.json(), {"like_count": 0, "is_liked": False})
+        self.assertFalse(PostRanking.objects.filter(post=post).exists())
+        self.assertEqual(self.client.post("/board/999999/like/json/").status_code, 404)
+
+    def test_like_toggles_keep_anonymous_page_cache(self):
+        post = Post.objects.create(title="제목", content="본문", category="common", author="작성자")
+        anonymous = self.client_class()
+        self.assertEqual(anonymous.get("/board/")["X-Board-Cache"], "miss")
+
+        self.client.post(f"/board/{post.id}/like/json/")
+
+        self.assertEqual(anonymous.get("/board/")["X-Board-Cache"], "hit")
+
+    def test_link_recommendation_updates_counter(self):
+        link = LinkPost.objects.create(category="best", title="링크")
+        rebuild_counters()
+
+        generations = get_board_generations([BOARD_LINK])
+        response = self.client.post(f"/link/{link.id}/like/")
+        self.assertTrue(response.json()["is_liked"])
+        self.assertEqual(get_counter(RECOMMENDED_LINKS), 1)
+        self.assertNotEqual(get_board_generations([BOARD_LINK]), generations)
+        response = self.client.post(f"/link/{link.id}/like/")
+        self.assertFalse(response.json()["is_liked"])
+        self.assertEqual(get_counter(RECOMMENDED_LINKS), 0)
+
+    def test_match_favorite_asks_before_replacing_oldest(self):
+        for index in range(10):
+            MatchFavoriteSlot.objects.filter(slot=index).update(
+                match=self._match(f"fav-{index}"), liked_at=timezone.now() + timedelta(minutes=index),
+            )
+        rebuild_counters()
+        match = self._match("new")
+
+        response = self.client.post(f"/match/{match.id}/like/", "{}", content_type="application/json")
+        self.assertTrue(response.json()["requires_confirmation"])
+
+        response = self.client.post(
+            f"/match/{match.id}/like/", '{"replace_oldest": true}', content_type="application/json",
+        )
+        data = response.json()
+        self.assertTrue(data["is_liked"])
+        self.assertEqual(data["removed_match_id"], SoccerMatch.objects.get(match_id="fav-0").id)
+        self.assertEqual(data["favorite_count"], 10)
+
+    def test_match_favorite_toggle_keeps_slot_counter(self):
+        match = self._match("toggle")
+        response = self.client.post(f"/match/{match.id}/like/", "{}", content_type="application/json")
+        self.assertEqual(response.json()["favorite_count"], 1)
+        self.assertEqual(MatchFavoriteSlot.objects.get(match=match).slot, 0)
+        self.assertEqual(get_counter(FAVORITE_MATCHES), 1)
+
+        response = self.client.post(f"/match/{match.id}/like/", "{}", content_type="application/json")
+        self.assertFalse(response.json()["is_liked"])
+        self.assertEqual(get_counter(FAVORITE_MATCHES), 0)
+
+        self.client.post(f"/match/{match.id}/like/", "{}", content_type="application/json")
+        match.delete()
+        self.assertEqual(get_counter(FAVORITE_MATCHES), 0)
+        self.assertEqual(MatchFavoriteSlot.objects.filter(match__isnull=False).count(), 0)
+
+    def test_match_favorite_reports_contention_separately_from_full(self):
+        match = self._match("busy")
+        with patch("django.db.models.query.QuerySet.aupdate", AsyncMock(return_value=0)):
+            response = self.client.post(f"/match/{match.id}/like/", "{}", content_type="application/json")
+
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json()["error"], "Busy")
+        self.assertNotIn("requires_confirmation", response.json())
+
+    def test_match_bet_is_set_once(self):
+        match = self._match("bet")
+        with patch("board.views._can_set_match_bet", return_value=True):
+            response = self.client.post(f"/match/{match.id}/bet/", '{"bet": 1}', content_type="application/json")
+            self.assertEqual(response.json()["message"], "success")
+            response = self.client.post(f"/match/{match.id}/bet/", '{"bet": 2}', content_type="application/json")
+            self.assertEqual(response.status_code, 409)
+            self.assertEqual(response.json()["error"], "Bet already set")
+        match.refresh_from_db()
+        self.assertEqual(match.bet, 1)
+
+
+class LikedSetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user("member@example.com", password="pw")
+        self.posts = [Post.objects.create(title=f"글 {index}", content="본문") for index in range(3)]
+
+    def test_toggle_keeps_counter_and_liked_set_in_sync(self):
+        self.client.force_login(self.user)
+        self.client.post(f"/board/{self.posts[2].id}/like/json/")
+        self.client.post(f"/board/{self.posts[0].id}/like/json/")
+
+        self.posts[0].refresh_from_db()
+        self.assertEqual(self.posts[0].like_count, 1)
+        liked = liked_set("post", self.user.id)
+        self.assertEqual(list(liked.ids), [self.posts[0].id, self.posts[2].id])
+
+        posts = list(Post.objects.order_by("id"))
+        with self.assertNumQueries(0):
+            mark_liked(posts, "post", self.user)
+        self.assertEqual([post.is_liked for post in posts], [True, False, True])
+
+    def test_orm_changes_recount_and_invalidate(self):
+        liked_set("post", self.user.id)
+        self.posts[1].likes.add(self.user)
+
+        self.posts[1].refresh_from_db()
+        self.assertEqual(self.posts[1].like_count, 1)
+        self.assertIn(self.posts[1].id, liked_set("post", self.user.id))
+
+        self.user.liked_posts.clear()
+        self.posts[1].refresh_from_db()
+        self.assertEqual(self.posts[1].like_count, 0)
+        self.assertEqual(len(liked_set("post", self.user.id)), 0)
+
+    def test_list_page_resolves_liked_state_without_per_row_queries(self):
+        for post in self.posts:
+            post.likes.add(self.user)
+        self.client.force_login(self.user)
+        self.client.get("/board/")
+
+        with self.assertNumQueries(7):
+            response = self.client.get("/board/")
+        self.assertContains(response, "bi bi-hand-thumbs-up-fill text-primary", count=3)
+
+
+class BoardEventStreamTests(TestCase):
+    async def test_reconnect_replays_missed_events_or_asks_for_resync(self):
+        broker = LocalEventBroker(queue_size=8, history_size=3)
+        first = broker.publish("post:common", "post", {"id": 1})
+        broker.publish("post:common", "like", {"id": 1, "like_count": 2})
+
+        subscription = broker.subscribe("post:common", last_event_id=first)
+        event = subscription.queue.get_nowait()
+        self.assertEqual((event.type, event.data), ("like", {"id": 1, "like_count": 2}))
+        self.assertTrue(subscription.queue.empty())
+
+        for index in range(3):
+            broker.publish("post:common", "post", {"id": 10 + index})
+        stale = broker.subscribe("post:common", last_event_id=first)
+        self.assertIs(stale.queue.get_nowait(), RESYNC)
+
+    async def test_slow_subscriber_is_cut_off_with_resync(self):
+        broker = LocalEventBroker(queue_size=2, max_subscribers=1)
+        subscription = broker.subscribe("match", None)
+        self.assertIsNone(broker.subscribe("match", None))
+
+        for index in range(5):
+            broker.publish("match", "score", {"id": index})
+        await asyncio.sleep(0)
+        stream = event_stream(broker, subscription, heartbeat=1, max_age=5)
+        chunks = [chunk async for chunk in stream]
+
+        self.assertEqual(chunks[0], "retry: 3000\n\n")
+        self.assertEqual(chunks[1:], ['event: resync\ndata: {}\n\n'])
+        self.assertEqual(broker.subscriber_count(), 0)
+
+    async def test_stream_endpoint_sends_missed_events(self):
+        broker = LocalEventBroker()
+        first = broker.publish("post:common", "post", {"id": 1, "title": "첫 글"})
+        second = broker.publish("post:common", "post", {"id": 2, "title": "둘째 글"})
+
+        with patch("board.views.get_broker", return_value=broker):
+            response = await self.async_client.get("/events/board/", headers={"Last-Event-ID": str(first)})
+            self.assertEqual(response["Content-Type"], "text/event-stream")
+            chunks = response.streaming_content
+            await anext(chunks)
+            event = (await anext(chunks)).decode()
+
+        self.assertEqual(event, f'id: {second}\nevent: post\ndata: {{"id":2,"title":"둘째 글"}}\n\n')
+
+    def test_wsgi_requests_are_told_to_stop_reconnecting(self):
+        self.assertEqual(self.client.get("/events/board/").status_code, 204)
+        self.assertEqual(self.client.get("/events/unknown/").status_code, 404)
+
+    def test_new_posts_and_scores_are_published_after_commit(self):
+        match = SoccerMatch.objects.create(
+            match_id="live", match_date=timezone.now(), league="EPL", home_team="Home", away_team="Away",
+        )
+        with patch("board.signals.publish_event") as publish, self.captureOnCommitCallbacks(execute=True):
+            post = Post.objects.create(title="새 글", content="본문", author="작성자")
+            match.score = "2:1"
+            match.result = SoccerMatch.OUTCOME_HOME_WIN
+            match.save(update_fields=["score", "result"])
+            match.save(update_fields=["is_recommended"])
+
+        self.assertEqual(publish.call_args_list[0].args, (
+            "post:common", "post", {"id": post.id, "title": "새 글", "author": "작성자"},
+        ))
+        channel, event_type, data = publish.call_args_list[1].args
+        self.assertEqual((channel, event_type, data["score"]), ("match", "score", "2:1"))
+        self.assertEqual(publish.call_count, 2)
+
+
+class MatchListFragmentTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.finished = SoccerMatch.objects.create(
+            match_id="2027-001", match_date=timezone.now(), league="프리미어리그",
+            home_team="Arsenal", away_team="Chelsea", score="2:1", year=2027,
+        )
+        self.upcoming = SoccerMatch.objects.create(
+            match_id="2027-002", match_date=timezone.now(), league="프리미어리그",
+            home_team="Liverpool", away_team="Everton", year=2027, bet=1,
+        )
+
+    def test_only_the_active_tab_is_rendered(self):
+        response = self.client.get("/matches/")
+
+        self.assertContains(response, "Liverpool vs Everton")
+        self.assertNotContains(response, "Arsenal vs Chelsea")
+        self.assertContains(response, 'data-fragment-url="/matches/fragments/results/?year=2027')
+        self.assertContains(response, 'data-fragment-url="/matches/fragments/bets/"')
+
+    def test_fragments_are_cached_until_matches_change(self):
+        response = self.client.get("/matches/fragments/results/?year=2027")
+        self.assertContains(response, "Arsenal vs Chelsea")
+        self.assertNotContains(response, "<html")
+        self.assertEqual(response["X-Board-Cache"], "miss")
+
+        response = self.client.get("/matches/fragments/bets/")
+        self.assertContains(response, 'id="bet-match-list"')
+        self.assertContains(response, "Liverpool vs Everton")
+        self.assertEqual(self.client.get("/matches/fragments/bets/")["X-Board-Cache"], "hit")
+
+        self.upcoming.bet = None
+        self.upcoming.save()
+        response = self.client.get("/matches/fragments/bets/")
+        self.assertEqual(response["X-Board-Cache"], "miss")
+        self.assertContains(response, "베팅된 경기가 없습니다.")
+        self.assertEqual(self.client.get("/matches/fragments/unknown/").status_code, 404)
+
+
+class MatchScoreColumnTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def _match(self, match_id, days, score=None):
+        return SoccerMatch.objects.create(
+            match_id=match_id, match_date=timezone.now() - timedelta(days=days), league="프리미어리그",
+            home_team=f"Home {match_id}", away_team=f"Away {match_id}", score=score, year=2027,
+        )
+
+    def _columns(self, match):
+        return SoccerMatch.objects.filter(id=match.id).values_list("status", "home_goals", "away_goals").get()
+
+    def test_save_derives_columns_from_score(self):
+        match = self._match("c-1", 0)
+        self.assertEqual(self._columns(match), (SoccerMatch.STATUS_SCHEDULED, None, None))
+
+        match.score = "2 - 1"
+        match.save(update_fields=["score"])
+        self.assertEqual(self._columns(match), (SoccerMatch.STATUS_FINISHED, 2, 1))
+
+        match.score = "연기"
+        match.save(update_fields=["score"])
+        self.assertEqual(self._columns(match), (SoccerMatch.STATUS_FINISHED, None, None))
+
+    def test_sync_fixes_rows_written_without_save(self):
+        finished = self._match("c-1", 0)
+        reopened = self._match("c-2", 0, "1:1")
+        SoccerMatch.objects.filter(id=finished.id).update(score="3:0")
+        SoccerMatch.objects.filter(id=reopened.id).update(score=None)
+
+        self.assertEqual(sync_score_columns(), 2)
+        self.assertEqual(sync_score_columns(), 0)
+        self.assertEqual(self._columns(finished), (SoccerMatch.STATUS_FINISHED, 3, 0))
+        self.assertEqual(self._columns(reopened), (SoccerMatch.STATUS_SCHEDULED, None, None))
+
+    def test_status_follows_raw_score_updates(self):
+        match = self._match("c-1", 0)
+        SoccerMatch.objects.filter(id=match.id).update(score="2:0")
+        self.assertEqual(self._columns(match), (SoccerMatch.STATUS_FINISHED, None, None))
+        SoccerMatch.objects.filter(id=match.id).update(score="")
+        self.assertEqual(self._columns(match), (SoccerMatch.STATUS_SCHEDULED, None, None))
+
+    def test_tabs_split_by_status_in_date_order(self):
+        self._match("c-3", 3, "1:0")
+        self._match("c-1", 1, "0:0")
+        self._match("c-2", 2)
+        self._match("c-4", 0)
+
+        response = self.client.get("/matches/?year=2027&tab=results")
+        self.assertEqual(
+            [match.match_id for match in response.context["result_page_obj"]], ["c-1", "c-3"],
+        )
+        response = self.client.get("/matches/?year=2027")
+        self.assertEqual(
+            [match.match_id for match in response.context["schedule_page_obj"]], ["c-2", "c-4"],
+        )
+
+
+class LeagueStandingsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def _match(self, match_id, home_team, away_team, score=None):
+        return SoccerMatch.objects.create(
+            match_id=match_id, match_date=timezone.now(), league="프리미어리그",
+            home_team=home_team, away_team=away_team, score=score, year=2027,
+        )
+
+    def _table(self):
+        return [
+            (row.team.name, row.played, row.won, row.drawn, row.lost, row.goal_difference, row.points)
+            for row in league_table("프리미어리그", 2027)
+        ]
+
+    def test_parse_score(self):
+        self.assertEqual(parse_score("2:1"), (2, 1))
+        self.assertEqual(parse_score(" 0 - 3 "), (0, 3))
+        self.assertIsNone(parse_score("연기"))
+        self.assertIsNone(parse_score(None))
+
+    def test_results_are_applied_and_corrected_incrementally(self):
+        first = self._match("s-1", "Arsenal", "Chelsea", "2:1")
+        self._match("s-2", "Chelsea", "Everton", "1:1")
+        upcoming = self._match("s-3", "Everton", "Arsenal")
+        self.assertEqual(self._table(), [
+            ("Arsenal", 1, 1, 0, 0, 1, 3),
+            ("Everton", 1, 0, 1, 0, 0, 1),
+            ("Chelsea", 2, 0, 1, 1, -1, 1),
+        ])
+
+        first.score = "0:3"
+        first.save(update_fields=["score"])
+        upcoming.score = "1:0"
+        upcoming.save()
+        self.assertEqual(self._table(), [
+            ("Chelsea", 2, 1, 1, 0, 3, 4),
+            ("Everton", 2, 1, 1, 0, 1, 4),
+            ("Arsenal", 2, 0, 0, 2, -4, 0),
+        ])
+
+        first.delete()
+        upcoming.save(update_fields=["score"])
+        self.assertEqual(self._table(), [
+            ("Everton", 2, 1, 1, 0, 1, 4),
+            ("Chelsea", 1, 0, 1, 0, 0, 1),
+            ("Arsenal", 1, 0, 0, 1, -1, 0),
+        ])
+
+    def test_sync_picks_up_rows_written_without_signals(self):
+        match = self._match("s-1", "Arsenal", "Chelsea")
+        SoccerMatch.objects.filter(id=match.id).update(score="1:0")
+        self.assertEqual(sync_standings(), 1)
+        self.assertEqual(sync_standings(), 0)
+        SoccerMatch.objects.filter(id=match.id).update(score="")
+        self.assertEqual(sync_standings(), 1)
+        self.assertEqual(self._table(), [])
+
+        SoccerMatch.objects.filter(id=match.id).update(score="3:3")
+        rebuild_standings()
+        self.assertEqual(self._table(), [("Arsenal", 1, 0, 1, 0, 0, 1), ("Chelsea", 1, 0, 1, 0, 0, 1)])
+
+    def test_standings_fragment(self):
+        self._match("s-1", "Arsenal", "Chelsea", "2:1")
+        response = self.client.get("/matches/fragments/standings/?year=2027")
+        self.assertContains(response, "Arsenal")
+        response = self.client.get("/matches/?tab=standings&year=2027")
+        self.assertContains(response, 'id="standings-tab-pane"')
+        self.assertContains(response, "Chelsea")
+
+
+class TeamRatingTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.kickoff = timezone.now() - timedelta(days=30)
+
+    def _match(self, match_id, round_index, home_team, away_team, score=None):
+        return SoccerMatch.objects.create(
+            match_id=match_id, round_num=f"{round_index}R", league="프리미어리그", year=2027,
+            match_date=self.kickoff + timedelta(days=7 * round_index),
+            home_team=home_team, away_team=away_team, score=score,
+        )
+
+    def _elo(self):
+        latest = TeamRating.objects.order_by("-sequence").values_list("sequence", flat=True).first()
+        return dict(TeamRating.objects.filter(sequence=latest).values_list("team__name", "elo"))
+
+    def test_rounds_are_applied_incrementally(self):
+        self._match("r-1", 1, "Arsenal", "Chelsea", "3:0")
+        self._match("r-2", 1, "Everton", "Fulham", "1:1")
+        second = self._match("r-3", 2, "Chelsea", "Everton", "2:1")
+        self.assertEqual(update_ratings(), 2)
+        self.assertEqual(update_ratings(), 0)
+        elo = self._elo()
+        self.assertGreater(elo["Arsenal"], elo["Fulham"])
+        self.assertAlmostEqual(sum(elo.values()), 4 * ELO_START)
+
+        self._match("r-4", 3, "Fulham", "Arsenal", "0:2")
+        self.assertEqual(update_ratings(), 1)
+        incremental = self._elo()
+        update_ratings(rebuild=True)
+        for team, value in self._elo().items():
+            self.assertAlmostEqual(incremental[team], value)
+
+        second.score = "0:1"
+        second.save()
+        self.assertEqual(update_ratings(), 2)
+        self.assertEqual(TeamRating.objects.values("sequence").distinct().count(), 3)
+
+    def test_schedule_shows_outcome_probabilities(self):
+        self._match("r-1", 1, "Arsenal", "Chelsea", "3:0")
+        upcoming = self._match("r-2", 2, "Chelsea", "Arsenal")
+        update_ratings()
+
+        attach_probabilities([upcoming], league_ratings("프리미어리그"))
+        probabilities = upcoming.probabilities
+        self.assertEqual(sum(probabilities.values()), 100)
+        self.assertGreater(probabilities["loss"], probabilities["win"])
+
+        unrated = self._match("r-3", 2, "Everton", "Arsenal")
+        attach_probabilities([unrated], league_ratings("프리미어리그"))
+        self.assertIsNone(unrated.probabilities)
+
+        response = self.client.get("/matches/?year=2027")
+        self.assertContains(response, f"승 {probabilities['win']}% · 무 {probabilities['draw']}%")
+
+    def test_goalless_round_keeps_ratings_finite(self):
+        self._match("r-1", 1, "Arsenal", "Chelsea", "0:0")
+        self._match("r-2", 1, "Everton", "Fulham", "0:0")
+        upcoming = self._match("r-3", 2, "Chelsea", "Arsenal")
+        update_ratings()
+
+        for attack, defense in TeamRating.objects.values_list("attack", "defense"):
+            self.assertTrue(math.isfinite(attack))
+            self.assertTrue(math.isfinite(defense))
+        ratings = league_ratings("프리미어리그")
+        self.assertEqual(ratings.average_goals, DEFAULT_GOALS)
+        attach_probabilities([upcoming], ratings)
+        self.assertEqual(sum(upcoming.probabilities.values()), 100)
+
+
+class TeamIndexTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def _match(self, match_id, home_team, away_team, score=None, days=0):
+        return SoccerMatch.objects.create(
+            match_id=match_id, match_date=timezone.now() + timedelta(days=days), league="프리미어리그",
+            home_team=home_team, away_team=away_team, score=score, year=2027,
+        )
+
+    def test_matches_are_linked_through_aliases(self):
+        first = self._match("t-1", "맨시티", "Arsenal", "2:0")
+        city = Team.objects.get(name="맨시티")
+        self.assertEqual(first.home_club, city)
+
+        english = self._match("t-2", "Arsenal", "Man City", "1:1", days=7)
+        self.assertNotEqual(english.away_club_id, city.id)
+        TeamAlias.objects.filter(name="Man City").update(team=city)
+        TeamAlias.objects.get(name="Man City").save()
+        english.refresh_from_db()
+        self.assertEqual(english.away_club_id, city.id)
+        # 순위표도 팀 FK 로 세므로 두 표기의 경기가 한 줄로 합쳐진다.
+        self.assertEqual(
+            [(row.team.name, row.played) for row in league_table("프리미어리그", 2027)],
+            [("맨시티", 2), ("Arsenal", 2)],
+        )
+
+        SoccerMatch.objects.filter(id=english.id).update(home_club=None)
+        self.assertEqual(sync_match_teams(), 1)
+        english.refresh_from_db()
+        self.assertEqual(english.home_club.name, "Arsenal")
+
+        # 수집기가 처음 보는 이름으로 넣은 경기는 별칭을 만들면서 이어지고, 이은 수를 그대로 센다.
+        SoccerMatch.objects.bulk_create([
+            SoccerMatch(
+                match_id="t-3", match_date=timezone.now(), league="프리미어리그",
+                home_team="Leeds", away_team="Burnley", year=2027,
+            ),
+        ])
+        self.assertEqual(sync_match_teams(), 2)
+        self.assertEqual(SoccerMatch.objects.get(match_id="t-3").away_club.name, "Burnley")
+
+    def test_team_and_head_to_head_endpoints(self):
+        self._match("t-1", "Arsenal", "Chelsea", "2:0")
+        self._match("t-2", "Chelsea", "Arsenal", "1:1", days=7)
+        self._match("t-3", "Everton", "Arsenal", days=14)
+        arsenal = Team.objects.get(name="Arsenal")
+        chelsea = Team.objects.get(name="Chelsea")
+
+        data = self.client.get(f"/teams/{arsenal.id}/json/").json()
+        self.assertEqual([match["home_team"] for match in data["matches"]], ["Everton", "Chelsea", "Arsenal"])
+        self.assertEqual(data["team"]["name"], "Arsenal")
+
+        with patch("board.views.HEAD_TO_HEAD_LIMIT", 1):
+            data = self.client.get(f"/teams/{chelsea.id}/vs/{arsenal.id}/json/").json()
+        # 목록은 최근 경기만 잘라도 전적은 두 팀의 모든 경기를 센다.
+        self.assertEqual(len(data["matches"]), 1)
+        self.assertEqual(data["summary"], {
+            "played": 2, "won": 0, "drawn": 1, "lost": 1, "goals_for": 1, "goals_against": 3,
+        })
+        response = self.client.get(f"/teams/{arsenal.id}/vs/{chelsea.id}/")
+        self.assertContains(response, "2경기 1승 1무 0패")
+        self.assertContains(self.client.get(f"/teams/{arsenal.id}/"), f'href="/teams/{arsenal.id}/vs/{chelsea.id}/"')
+        self.assertEqual(self.client.get("/teams/999999/json/").status_code, 404)
+
+
+class MatchFacetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def _match(self, match_id, league="프리미어리그", year=2027, score=None):
+        return SoccerMatch.objects.create(
+            match_id=match_id, match_date=timezone.now(), league=league,
+            home_team="Home", away_team="Away", score=score, year=year,
+        )
+
+    def _facets(self):
+        return [facet[:4] for facet in match_facets()]
+
+    def test_facets_follow_match_saves_and_deletes(self):
+        upcoming = self._match("f-1")
+        self._match("f-2", score="1:0")
+        self._match("f-3", league="세리에A", year=2028)
+        self.assertEqual(self._facets(), [("세리에A", 2028, 1, 0), ("프리미어리그", 2027, 1, 1)])
+
+        upcoming.score = "2:2"
+        upcoming.save(update_fields=["score"])
+        self.assertEqual(self._facets()[1], ("프리미어리그", 2027, 0, 2))
+        upcoming.delete()
+        self.assertEqual(self._facets()[1], ("프리미어리그", 2027, 0, 1))
+
+        SoccerMatch.objects.filter(match_id="f-3").update(year=2027)
+        rebuild_facets()
+        self.assertEqual(self._facets(), [("세리에A", 2027, 1, 0), ("프리미어리그", 2027, 0, 1)])
+
+    def test_collector_rows_fix_pagination_and_stale_facets(self):
+        self._match("f-1", score="1:0")
+        self.assertEqual(self._facets(), [("프리미어리그", 2027, 0, 1)])
+        # 수집기는 시그널 없이 쓴다.
+        SoccerMatch.objects.bulk_create(
+            SoccerMatch(
+                match_id=f"raw-{index}", match_date=timezone.now(), league="프리미어리그",
+                home_team="Home", away_team="Away", score="2:1", year=2027,
+            )
+            for index in range(25)
+        )
+        generations = get_board_generations([BOARD_MATCH])
+        response = self.client.get("/matches/?year=2027&tab=results")
+        self.assertEqual(response.context["result_page_obj"].paginator.num_pages, 2)
+        # GET 은 어긋난 (리그, 연도) 한 칸만 고치고 페이지 캐시 세대는 건드리지 않는다.
+        self.assertEqual(get_board_generations([BOARD_MATCH]), generations)
+        self.assertEqual(self._facets(), [("프리미어리그", 2027, 0, 26)])
+
+        SoccerMatch.objects.bulk_create([
+            SoccerMatch(
+                match_id="raw-new", match_date=timezone.now(), league="세리에A",
+                home_team="Home", away_team="Away", year=2027,
+            ),
+        ])
+        cache.delete(FACET_CACHE_KEY)
+        self.assertEqual(self._facets(), [("세리에A", 2027, 1, 0), ("프리미어리그", 2027, 0, 26)])
+
+    def test_filter_bar_is_data_driven(self):
+        self._match("f-1", league="대표", year=2030)
+        self._match("f-2", league="세리에A", year=2030)
+        self._match("f-3", year=2029)
+
+        response = self.client.get("/matches/")
+        self.assertEqual(response.context["selected_year"], 2030)
+        self.assertEqual(response.context["selected_league"], "대표")
+        self.assertEqual(response.context["match_years"], [2030, 2029])
+        self.assertEqual(
+            [league["label"] for league in response.context["match_leagues"]], ["대표팀", "세리에A"],
+        )
+        response = self.client.get("/matches/?year=2029&league=대표")
+        self.assertEqual(response.context["selected_league"], "프리미어리그")
+        self.assertEqual(response.context["schedule_page_obj"].paginator.count, 1)
+
+
+class BoardExportTests(TestCase):
+    def setUp(self):
+        self.posts = [Post.objects.create(title=f"글 {i}", content="내용", author="익명") for i in range(5)]
+
+    def test_rows_are_read_in_id_batches(self):
+        rows = export_rows(Post, since_id=self.posts[0].id, batch_size=2)
+        self.assertEqual([row[0] for row in rows], [post.id for post in self.posts[1:]])
+
+    def test_command_writes_gzipped_jsonl_since_id(self):
+        with tempfile.TemporaryDirectory() as output_dir:
+            call_command(
+                "export_board", "posts", "--gzip", "--since-id", str(self.posts[2].id),
+                "--output-dir", output_dir, "--batch-size", "1", stdout=Mock(),
+            )
+            with gzip.open(f"{output_dir}/posts.jsonl.gz", "rt", encoding="utf-8") as exported:
+                lines = [json.loads(line) for line in exported]
+        self.assertEqual([line["id"] for line in lines], [post.id for post in self.posts[3:]])
+        self.assertEqual(lines[0]["title"], "글 3")
+
+    def test_command_since_id_is_per_table(self):
+        comment = Comment.objects.create(post=self.posts[0], content="댓글", author="익명")
+        with tempfile.TemporaryDirectory() as output_dir:
+            with self.assertRaises(CommandError):
+                call_command(
+                    "export_board", "posts", "comments", "--since-id", str(self.posts[2].id),
+                    "--output-dir", output_dir, stdout=Mock(),
+                )
+            with self.assertRaises(CommandError):
+                call_command("export_board", "posts", "--since-id", "links=1", "--output-dir", output_dir, stdout=Mock())
+            call_command(
+                "export_board", "posts", "comments", "--since-id", f"posts={self.posts[2].id}",
+                "--output-dir", output_dir, stdout=Mock(),
+            )
+            with open(f"{output_dir}/posts.jsonl", encoding="utf-8") as exported:
+                self.assertEqual([json.loads(line)["id"] for line in exported], [post.id for post in self.posts[3:]])
+            with open(f"{output_dir}/comments.jsonl", encoding="utf-8") as exported:
+                self.assertEqual([json.loads(line)["id"] for line in exported], [comment.id])
+
+    def test_endpoint_streams_sync_iterator_under_wsgi(self):
+        self.client.force_login(User.objects.create_user("admin@example.com", password="pw", is_staff=True))
+        response = self.client.get(f"/exports/posts/?since_id={self.posts[3].id}")
+        self.assertFalse(response.is_async)
+        lines = b"".join(response.streaming_content).decode("utf-8").splitlines()
+        self.assertEqual([json.loads(line)["id"] for line in lines], [self.posts[4].id])
+
+    async def _streamed(self, response):
+        self.assertTrue(response.streaming)
+        self.assertTrue(response.is_async)
+        return b"".join([chunk async for chunk in response.streaming_content])
+
+    async def test_endpoint_streams_csv_to_staff_only(self):
+        admin = await User.objects.acreate_user("admin@example.com", password="pw", is_staff=True)
+        self.assertEqual((await self.async_client.get("/exports/posts/")).status_code, 403)
+        await self.async_client.aforce_login(admin)
+        self.assertEqual((await self.async_client.get("/exports/unknown/")).status_code, 404)
+        self.assertEqual((await self.async_client.get("/exports/posts/?since_id=x")).status_code, 400)
+
+        response = await self.async_client.get("/exports/posts/?format=csv")
+        rows = list(csv.reader((await self._streamed(response)).decode("utf-8").splitlines()))
+        self.assertEqual(rows[0][:2], ["id", "title"])
+        self.assertEqual(len(rows), 6)
+
+        response = await self.async_client.get(f"/exports/posts/?gzip=1&since_id={self.posts[1].id}")
+        lines = gzip.decompress(await self._streamed(response)).decode("utf-8").splitlines()
+        self.assertEqual([json.loads(line)["id"] for line in lines], [post.id for post in self.posts[2:]])
+
+        response = await self.async_client.get(f"/exports/posts/?format=csv&since_id={self.posts[4].id}")
+        self.assertEqual((await self._streamed(response)).decode("utf-8").splitlines(), [",".join(rows[0])])
@@ -10,6 +10,7 @@ urlpatterns = [
     path("board/", views.post_list, name="post_list"),
     path("board/new/", views.post_create, name="post_create"),
     path("board/<int:post_id>/", views.post_detail, name="post_detail"),
+    path("board/<int:post_id>/comments/json/", views.post_comments_json, name="post_comments_json"),
     path("board/<int:post_id>/edit/", views.post_edit, name="post_edit"),
     path("board/<int:post_id>/delete/", views.post_delete, name="post_delete"),
     path("board/<int:post_id>/images/<int:image_id>/delete/", views.post_image_delete, name="post_image_delete"),
@@ -26,6 +27,11 @@ urlpatterns = [
     path("ai-news/new/", views.ai_create, name="ai_create"),
     path("api/ai-news/new/", views.ai_create_api, name="ai_create_api"),
     path("matches/", views.match_list, name="match_list"),
+    path("matches/fragments/<str:fragment>/", views.match_fragment, name="match_fragment"),
+    path("teams/<int:team_id>/", views.team_detail, name="team_detail"),
+    path("teams/<int:team_id>/json/", views.team_detail_json, name="team_detail_json"),
+    path("teams/<int:team_id>/vs/<int:opponent_id>/", views.head_to_head, name="head_to_head"),
+    path("teams/<int:team_id>/vs/<int:opponent_id>/json/", views.head_to_head_json, name="head_to_head_json"),
     path("popular/", views.popular_list, name="popular_list"),
     path("menu4/", views.menu4, name="menu4"),
     path("menu5/", views.menu5, name="menu5"),
@@ -52,6 +58,9 @@ urlpatterns = [
     path("password/reset/", views.password_reset, name="password_reset"),
     path("password/change/", views.password_change, name="password_change"),
     path("profile/", views.profile, name="profile"),
+    path("metrics/", views.metrics, name="metrics"),
+    path("events/<str:stream>/", views.board_events, name="board_events"),
+    path("exports/<str:table>/", views.export_table, name="export_table"),
     path('manifest.json', TemplateView.as_view(template_name='board/manifest.json', content_type='application/json'), name='manifest'),
     path('service-worker.js', TemplateView.as_view(template_name='board/service-worker.js', content_type='application/javascript'), name='service-worker'),
     
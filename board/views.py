@@ -2,26 +2,94 @@
 from urllib.parse import quote_plus
 from zoneinfo import ZoneInfo
 
-from django.contrib.auth import authenticate, login, logout
+from asgiref.sync import sync_to_async
+from django.contrib.auth import alogin, logout
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.models import User
 from django.core.paginator import Paginator
 from django.shortcuts import get_object_or_404, redirect, render
-from django.http import JsonResponse
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import Http404, HttpResponse, JsonResponse, StreamingHttpResponse
 from django.views.decorators.http import require_POST
 from django.views.decorators.csrf import csrf_exempt
 from django.db import transaction
 from django.db import connection
-from django.db.models import Count, F, Q
+from django.db.models import Count, Exists, F, OuterRef, Q
 from django.utils.crypto import get_random_string
 from django.utils import timezone
+from .caching import (
+    BOARD_AI,
+    BOARD_LINK,
+    BOARD_MATCH,
+    BOARD_POST,
+    BOARD_SECRET,
+    BOARD_THREAD,
+    SIDEBAR_BOARDS,
+    cache_anonymous_page,
+)
+from .comments import comment_page, comment_payload, resolve_parent
+from .counters import (
+    LIKED_COMMON_POSTS,
+    POPULAR_LINK_CATEGORIES,
+    RECOMMENDED_LINKS,
+    CountedPaginator,
+    info_counter,
+    link_counter,
+    post_counter,
+)
+from .events import event_stream, get_broker, parse_last_event_id
+from .exports import (
+    EXPORT_FORMATS,
+    EXPORT_TABLES,
+    aexport_batches,
+    aexport_stream,
+    export_filename,
+    export_rows,
+    export_stream,
+    parse_since,
+)
+from .facets import check_facet_count, facet_filters, match_facets
 from .forms import CommentForm, LinkPostForm, PostForm, SignUpForm, LoginForm, PasswordResetForm, PasswordChangeForm, InfoPostForm, ThreadPostForm
-from .models import Comment, LinkPost, Post, PostImage, Profile, InfoPost, SoccerMatch
+from .hashing import HashingBusy, aauthenticate_member, amake_password
+from .likes import (
+    afavorite_count,
+    aset_match_bet,
+    atoggle_info_like,
+    atoggle_link_recommendation,
+    atoggle_match_favorite,
+    atoggle_post_like,
+    mark_liked,
+)
+from .metrics import registry as metrics_registry
+from .models import Comment, LinkPost, MatchFavoriteSlot, Post, PostImage, Profile, InfoPost, SoccerMatch, Team
+from .queries import top_n_by_filter, top_n_per_group
+from .rankings import ranked_posts
+from .ratings import attach_probabilities, league_ratings
+from .standings import league_table
+from .teams import head_to_head_matches, head_to_head_summary, match_payload, team_matches, team_payload
 
 
 MAX_FAVORITE_MATCHES = 10
+POPULAR_LINKS_BLOCK = (Q(category__in=POPULAR_LINK_CATEGORIES, is_recommended=True), ["-created_at"], 5)
 TOP_MATCH_LIST_LIMIT = 7
 MATCH_BET_VALUES = {0, 1, 2}
+HASHING_BUSY_MESSAGE = "로그인 요청이 많습니다. 잠시 후 다시 시도해 주세요."
+# 실시간 스트림 이름 -> 이벤트 채널(캐시 세대와 같은 게시판 이름)
+EVENT_STREAMS = {
+    "board": BOARD_POST,
+    "menu3": BOARD_THREAD,
+    "ai-news": BOARD_AI,
+    "matches": BOARD_MATCH,
+}
+# 목록의 이미지 아이콘용. 글마다 images.exists() 를 부르지 않고 목록 쿼리에 EXISTS 로 붙인다.
+_HAS_IMAGES = Exists(PostImage.objects.filter(post=OuterRef("pk")))
+_IS_FAVORITE = Exists(MatchFavoriteSlot.objects.filter(match=OuterRef("pk")))
+
+
+def _sidebar_blocks():
+    recent_popular = top_n_by_filter(LinkPost.objects.all(), {"popular": POPULAR_LINKS_BLOCK})["popular"]
+    return ranked_posts('common')[:5], recent_popular
 
 
 def _get_display_name(user):
@@ -114,14 +182,20 @@ def _match_bet_accuracy_stats():
     }
 
 
+@cache_anonymous_page(BOARD_POST, BOARD_SECRET, BOARD_THREAD, BOARD_AI, BOARD_LINK)
 def home(request):
     recent_posts = Post.objects.order_by("-created_at")[:5]
-    recent_links = InfoPost.objects.filter(category='thread').order_by("-created_at")[:5]
-    recent_ai_news = InfoPost.objects.filter(category='ai').order_by("-created_at")[:5]
-    recent_recommended = Post.objects.filter(category='common').annotate(like_count=Count('likes')).filter(like_count__gt=0).order_by("-like_count", "-id")[:5]
-    target_categories = ['best', 'xart', 'movie', 'itnews', 'ground', 'stock']
-    recent_popular = LinkPost.objects.filter(category__in=target_categories, is_recommended=True).order_by("-created_at")[:5]
-    recent_best = LinkPost.objects.filter(category='best').order_by("-id")[:7]
+    # 정보 게시판 두 곳과 링크 블록 두 개를 각각 한 번의 쿼리로 읽는다.
+    info_blocks = top_n_per_group(InfoPost.objects.all(), "category", ["-created_at"], 5, groups=['thread', 'ai'])
+    link_blocks = top_n_by_filter(LinkPost.objects.all(), {
+        "popular": POPULAR_LINKS_BLOCK,
+        "best": (Q(category='best'), ["-id"], 7),
+    })
+    recent_links = info_blocks['thread']
+    recent_ai_news = info_blocks['ai']
+    recent_recommended = ranked_posts('common')[:5]
+    recent_popular = link_blocks["popular"]
+    recent_best = link_blocks["best"]
     return render(
         request,
         "board/home.html",
@@ -136,8 +210,9 @@ def home(request):
     )
 
 
+@cache_anonymous_page(*SIDEBAR_BOARDS)
 def post_list(request):
-    posts = Post.objects.filter(category='common').order_by("-id")
+    posts = Post.objects.filter(category='common').annotate(has_images=_HAS_IMAGES).order_by("-id")
     query = request.GET.get("q", "").strip()
     if query:
         posts = posts.filter(
@@ -145,13 +220,12 @@ def post_list(request):
             | Q(content__icontains=query)
             | Q(author__icontains=query)
         )
-    paginator = Paginator(posts, 20)
+    paginator = CountedPaginator(posts, 20, counter=None if query else post_counter("common"))
     page_number = request.GET.get("page")
     page_obj = paginator.get_page(page_number)
+    mark_liked(page_obj, "post", request.user)
 
-    recent_recommended = Post.objects.filter(category='common').annotate(like_count=Count('likes')).filter(like_count__gt=0).order_by("-like_count", "-id")[:5]
-    target_categories = ['best', 'xart', 'movie', 'itnews', 'ground', 'stock']
-    recent_popular = LinkPost.objects.filter(category__in=target_categories, is_recommended=True).order_by("-created_at")[:5]
+    recent_recommended, recent_popular = _sidebar_blocks()
 
     return render(
         request,
@@ -196,8 +270,9 @@ def post_create(request):
 
 def post_detail(request, post_id):
     post = get_object_or_404(Post, id=post_id)
+    # 조회수는 캐시 무효화 대상이 아니므로 시그널 없이 UPDATE 한 번으로 올린다.
+    Post.objects.filter(id=post.id).update(views=F("views") + 1)
     post.views += 1
-    post.save()
     if request.method == "POST":
         if not request.user.is_authenticated:
             return redirect("board:login")
@@ -205,6 +280,7 @@ def post_detail(request, post_id):
         if form.is_valid():
             comment = form.save(commit=False)
             comment.post = post
+            comment.parent = resolve_parent(post, request.POST.get("parent"))
             comment.author = _get_display_name(request.user)
             comment.save()
             if hasattr(request.user, "profile"):
@@ -217,14 +293,36 @@ def post_detail(request, post_id):
 
     previous_post = Post.objects.filter(category=post.category, id__lt=post.id).order_by('-id').first()
     next_post = Post.objects.filter(category=post.category, id__gt=post.id).order_by('id').first()
+    comments, next_comment_cursor = comment_page(post)
+    mark_liked([post], "post", request.user)
 
     return render(
         request,
         "board/post_detail.html",
-        {"post": post, "form": form, "is_author": is_author, "previous_post": previous_post, "next_post": next_post},
+        {
+            "post": post,
+            "form": form,
+            "is_author": is_author,
+            "previous_post": previous_post,
+            "next_post": next_post,
+            "comments": comments,
+            "next_comment_cursor": next_comment_cursor,
+        },
     )
 
 
+def post_comments_json(request, post_id):
+    post = get_object_or_404(Post, id=post_id)
+    if post.category == 'secret' and not request.user.is_authenticated:
+        return JsonResponse({'error': 'Login required'}, status=403)
+    comments, next_cursor = comment_page(post, request.GET.get("cursor"))
+    show_author = post.category != 'secret'
+    return JsonResponse({
+        'comments': [comment_payload(comment, show_author) for comment in comments],
+        'next_cursor': next_cursor,
+    })
+
+
 @login_required
 def post_edit(request, post_id):
     post = get_object_or_404(Post, id=post_id)
@@ -295,20 +393,13 @@ def link_list(request):
             Q(title__icontains=query)
             | Q(author__icontains=query)
         )
-    paginator = Paginator(links, 20)
+    paginator = CountedPaginator(links, 20, counter=None if query else info_counter("thread"))
     page_number = request.GET.get("page")
     page_obj = paginator.get_page(page_number)
 
-    for link in page_obj:
-        link.like_count = link.likes.count()
-        if request.user.is_authenticated:
-            link.is_liked = link.likes.filter(id=request.user.id).exists()
-        else:
-            link.is_liked = False
+    mark_liked(page_obj, "info", request.user)
 
-    recent_recommended = Post.objects.filter(category='common').annotate(like_count=Count('likes')).filter(like_count__gt=0).order_by("-like_count", "-id")[:5]
-    target_categories = ['best', 'xart', 'movie', 'itnews', 'ground', 'stock']
-    recent_popular = LinkPost.objects.filter(category__in=target_categories, is_recommended=True).order_by("-created_at")[:5]
+    recent_recommended, recent_popular = _sidebar_blocks()
 
     return render(
         request,
@@ -368,20 +459,13 @@ def ai_list(request):
             Q(title__icontains=query)
             | Q(author__icontains=query)
         )
-    paginator = Paginator(links, 20)
+    paginator = CountedPaginator(links, 20, counter=None if query else info_counter("ai"))
     page_number = request.GET.get("page")
     page_obj = paginator.get_page(page_number)
 
-    for link in page_obj:
-        link.like_count = link.likes.count()
-        if request.user.is_authenticated:
-            link.is_liked = link.likes.filter(id=request.user.id).exists()
-        else:
-            link.is_liked = False
+    mark_liked(page_obj, "info", request.user)
 
-    recent_recommended = Post.objects.filter(category='common').annotate(like_count=Count('likes')).filter(like_count__gt=0).order_by("-like_count", "-id")[:5]
-    target_categories = ['best', 'xart', 'movie', 'itnews', 'ground', 'stock']
-    recent_popular = LinkPost.objects.filter(category__in=target_categories, is_recommended=True).order_by("-created_at")[:5]
+    recent_recommended, recent_popular = _sidebar_blocks()
 
     return render(
         request,
@@ -445,70 +529,53 @@ def link_create(request):
 
 
 @require_POST
-def link_like(request, link_id):
-    link = get_object_or_404(LinkPost, id=link_id)
-    link.is_recommended = not link.is_recommended
-    link.save()
-    return JsonResponse({'like_count': 0, 'is_liked': link.is_recommended})
+async def link_like(request, link_id):
+    is_recommended = await atoggle_link_recommendation(link_id)
+    if is_recommended is None:
+        raise Http404
+    return JsonResponse({'like_count': 0, 'is_liked': is_recommended})
 
 @require_POST
-def match_like(request, match_id):
+async def match_like(request, match_id):
     try:
         payload = json.loads(request.body.decode("utf-8") or "{}")
     except json.JSONDecodeError:
         payload = {}
     replace_oldest = bool(payload.get("replace_oldest"))
 
-    with transaction.atomic():
-        match = get_object_or_404(SoccerMatch.objects.select_for_update(), id=match_id)
-
-        if match.is_recommended:
-            match.is_recommended = False
-            match.liked_at = None
-            match.save(update_fields=["is_recommended", "liked_at"])
-            return JsonResponse({
-                'is_liked': False,
-                'favorite_count': SoccerMatch.objects.filter(is_recommended=True).count(),
-            })
-
-        favorite_matches = (
-            SoccerMatch.objects.select_for_update()
-            .filter(is_recommended=True)
-            .exclude(id=match.id)
-            .order_by("liked_at", "id")
-        )
-        favorite_count = favorite_matches.count()
-        if favorite_count >= MAX_FAVORITE_MATCHES and not replace_oldest:
-            return JsonResponse({
-                'requires_confirmation': True,
-                'is_liked': False,
-                'message': '즐겨찾기 10게임입니다. 오래된 경기를 삭제할까요?',
-            })
-
-        removed_match_id = None
-        if favorite_count >= MAX_FAVORITE_MATCHES:
-            oldest_match = favorite_matches.first()
-            if oldest_match:
-                removed_match_id = oldest_match.id
-                oldest_match.is_recommended = False
-                oldest_match.liked_at = None
-                oldest_match.save(update_fields=["is_recommended", "liked_at"])
-
-        match.is_recommended = True
-        match.liked_at = timezone.now()
-        match.save(update_fields=["is_recommended", "liked_at"])
-
+    match = await SoccerMatch.objects.filter(id=match_id).afirst()
+    if match is None:
+        raise Http404
+    state, removed_match_id = await atoggle_match_favorite(match, replace_oldest, MAX_FAVORITE_MATCHES)
+
+    if state == "full":
+        return JsonResponse({
+            'requires_confirmation': True,
+            'is_liked': False,
+            'message': '즐겨찾기 10게임입니다. 오래된 경기를 삭제할까요?',
+        })
+    if state == "busy":
+        return JsonResponse({
+            'error': 'Busy',
+            'is_liked': False,
+            'message': '즐겨찾기 요청이 몰렸습니다. 잠시 후 다시 시도해 주세요.',
+        }, status=409)
+    if state == "removed":
+        return JsonResponse({
+            'is_liked': False,
+            'favorite_count': await afavorite_count(),
+        })
     return JsonResponse({
         'is_liked': True,
         'removed_match_id': removed_match_id,
-        'favorite_count': SoccerMatch.objects.filter(is_recommended=True).count(),
+        'favorite_count': await afavorite_count(),
         'match': _match_favorite_payload(match),
     })
 
 
 @require_POST
-def match_bet(request, match_id):
-    if not _can_set_match_bet(request.user):
+async def match_bet(request, match_id):
+    if not await sync_to_async(_can_set_match_bet)(await request.auser()):
         return JsonResponse({'error': 'Permission denied'}, status=403)
 
     try:
@@ -524,22 +591,16 @@ def match_bet(request, match_id):
     if bet not in MATCH_BET_VALUES:
         return JsonResponse({'error': 'Invalid bet'}, status=400)
 
-    with transaction.atomic():
-        match = get_object_or_404(SoccerMatch.objects.select_for_update(), id=match_id)
-        if match.result is not None:
-            return JsonResponse({
-                'error': 'Match already finished',
-                'match': _match_bet_payload(match),
-            }, status=409)
-
-        if match.bet is not None:
-            return JsonResponse({
-                'error': 'Bet already set',
-                'match': _match_bet_payload(match),
-            }, status=409)
-
-        match.bet = bet
-        match.save(update_fields=["bet"])
+    updated = await aset_match_bet(match_id, bet)
+    match = await SoccerMatch.objects.filter(id=match_id).afirst()
+    if match is None:
+        raise Http404
+    if not updated:
+        error = 'Match already finished' if match.result is not None else 'Bet already set'
+        return JsonResponse({
+            'error': error,
+            'match': _match_bet_payload(match),
+        }, status=409)
 
     return JsonResponse({
         'message': 'success',
@@ -548,17 +609,17 @@ def match_bet(request, match_id):
 
 
 @require_POST
-def info_like(request, info_id):
-    post = get_object_or_404(InfoPost, id=info_id)
-    if not request.user.is_authenticated:
+async def info_like(request, info_id):
+    user = await request.auser()
+    if not user.is_authenticated:
+        if not await InfoPost.objects.filter(id=info_id).aexists():
+            raise Http404
         return JsonResponse({'error': 'Login required'}, status=403)
-    if post.likes.filter(id=request.user.id).exists():
-        post.likes.remove(request.user)
-        is_liked = False
-    else:
-        post.likes.add(request.user)
-        is_liked = True
-    return JsonResponse({'like_count': post.likes.count(), 'is_liked': is_liked})
+    result = await atoggle_info_like(info_id, user.id)
+    if result is None:
+        raise Http404
+    is_liked, like_count = result
+    return JsonResponse({'like_count': like_count, 'is_liked': is_liked})
 
 def post_like(request, post_id):
     post = get_object_or_404(Post, id=post_id)
@@ -568,16 +629,15 @@ def post_like(request, post_id):
 
 @login_required
 @require_POST
-def post_like_json(request, post_id):
-    post = get_object_or_404(Post, id=post_id)
-    if post.likes.filter(id=request.user.id).exists():
-        post.likes.remove(request.user)
-        is_liked = False
-    else:
-        post.likes.add(request.user)
-        is_liked = True
-    return JsonResponse({'like_count': post.likes.count(), 'is_liked': is_liked})
-
+async def post_like_json(request, post_id):
+    user = await request.auser()
+    result = await atoggle_post_like(post_id, user.id)
+    if result is None:
+        raise Http404
+    is_liked, like_count = result
+    return JsonResponse({'like_count': like_count, 'is_liked': is_liked})
+
+@cache_anonymous_page(BOARD_LINK)
 def popular_list(request):
     target_categories = ['best', 'xart', 'movie', 'itnews', 'ground', 'stock']
     links = LinkPost.objects.filter(category__in=target_categories, is_recommended=True).order_by("-created_at")
@@ -589,7 +649,7 @@ def popular_list(request):
             | Q(url__icontains=query)
             | Q(author__icontains=query)
         )
-    paginator = Paginator(links, 20)
+    paginator = CountedPaginator(links, 20, counter=None if query else RECOMMENDED_LINKS)
     page_number = request.GET.get("page")
     page_obj = paginator.get_page(page_number)
 
@@ -603,7 +663,10 @@ def popular_list(request):
     )
 
 def menu4(request):
-    posts = Post.objects.filter(category='common').annotate(like_count=Count('likes')).filter(like_count__gt=0).order_by("-like_count", "-id")
+    sort = request.GET.get("sort")
+    if sort != "trending":
+        sort = "likes"
+    posts = ranked_posts('common', sort).annotate(has_images=_HAS_IMAGES)
     query = request.GET.get("q", "").strip()
     if query:
         posts = posts.filter(
@@ -611,13 +674,19 @@ def menu4(request):
             | Q(content__icontains=query)
             | Q(author__icontains=query)
         )
-    paginator = Paginator(posts, 20)
+    paginator = CountedPaginator(posts, 20, counter=None if query else LIKED_COMMON_POSTS)
     page_number = request.GET.get("page")
     page_obj = paginator.get_page(page_number)
+    mark_liked(page_obj, "post", request.user)
     return render(
         request,
         "board/menu4.html",
-        {"page_obj": page_obj, "query": query},
+        {
+            "page_obj": page_obj,
+            "query": query,
+            "sort": sort,
+            "sort_param": "&sort=trending" if sort == "trending" else "",
+        },
     )
 
 
@@ -631,23 +700,13 @@ def menu5(request):
             | Q(url__icontains=query)
             | Q(author__icontains=query)
         )
-    paginator = Paginator(links, 20) # links 변수명을 그대로 사용했지만 실제로는 Post 객체입니다
+    paginator = CountedPaginator(links, 20, counter=None if query else post_counter("secret")) # links 변수명을 그대로 사용했지만 실제로는 Post 객체입니다
     page_number = request.GET.get("page")
     page_obj = paginator.get_page(page_number)
 
-    for post in page_obj:
-        post.like_count = post.likes.count()
-        if request.user.is_authenticated:
-            post.is_liked = post.likes.filter(id=request.user.id).exists()
-        else:
-            post.is_liked = False
+    mark_liked(page_obj, "post", request.user)
 
-    recent_popular = (
-        Post.objects.filter(category='secret')
-        .annotate(like_count=Count('likes'))
-        .filter(like_count__gt=0)
-        .order_by("-like_count", "-id")[:5]
-    )
+    recent_popular = ranked_posts('secret')[:5]
 
     return render(
         request,
@@ -691,13 +750,15 @@ def secret_detail(request, post_id):
     if post.category != 'secret':
         return redirect("board:post_detail", post_id=post.id)
     
+    # 조회수는 캐시 무효화 대상이 아니므로 시그널 없이 UPDATE 한 번으로 올린다.
+    Post.objects.filter(id=post.id).update(views=F("views") + 1)
     post.views += 1
-    post.save()
     if request.method == "POST":
         form = CommentForm(request.POST)
         if form.is_valid():
             comment = form.save(commit=False)
             comment.post = post
+            comment.parent = resolve_parent(post, request.POST.get("parent"))
             comment.author = _get_display_name(request.user)
             comment.save()
             if hasattr(request.user, "profile"):
@@ -710,11 +771,21 @@ def secret_detail(request, post_id):
 
     previous_post = Post.objects.filter(category=post.category, id__lt=post.id).order_by('-id').first()
     next_post = Post.objects.filter(category=post.category, id__gt=post.id).order_by('id').first()
+    comments, next_comment_cursor = comment_page(post)
+    mark_liked([post], "post", request.user)
 
     return render(
         request,
         "board/post_detail.html",
-        {"post": post, "form": form, "is_author": is_author, "previous_post": previous_post, "next_post": next_post},
+        {
+            "post": post,
+            "form": form,
+            "is_author": is_author,
+            "previous_post": previous_post,
+            "next_post": next_post,
+            "comments": comments,
+            "next_comment_cursor": next_comment_cursor,
+        },
     )
 
 @login_required
@@ -760,6 +831,7 @@ def secret_delete(request, post_id):
         return redirect("board:menu5")
     return redirect("board:secret_detail", post_id=post.id)
 
+@cache_anonymous_page(*SIDEBAR_BOARDS)
 def menu6(request):
     links = LinkPost.objects.filter(category='best').order_by("-id")
     query = request.GET.get("q", "").strip()
@@ -769,16 +841,14 @@ def menu6(request):
             | Q(url__icontains=query)
             | Q(author__icontains=query)
         )
-    paginator = Paginator(links, 20)
+    paginator = CountedPaginator(links, 20, counter=None if query else link_counter("best"))
     page_number = request.GET.get("page")
     page_obj = paginator.get_page(page_number)
 
     for link in page_obj:
         link.is_liked = link.is_recommended
 
-    recent_recommended = Post.objects.filter(category='common').annotate(like_count=Count('likes')).filter(like_count__gt=0).order_by("-like_count", "-id")[:5]
-    target_categories = ['best', 'xart', 'movie', 'itnews', 'ground', 'stock']
-    recent_popular = LinkPost.objects.filter(category__in=target_categories, is_recommended=True).order_by("-created_at")[:5]
+    recent_recommended, recent_popular = _sidebar_blocks()
 
     return render(
         request,
@@ -791,6 +861,7 @@ def menu6(request):
         },
     )
 
+@cache_anonymous_page(*SIDEBAR_BOARDS)
 def menu7(request):
     links = LinkPost.objects.filter(category='xart').order_by("-id")
     query = request.GET.get("q", "").strip()
@@ -800,16 +871,14 @@ def menu7(request):
             | Q(url__icontains=query)
             | Q(author__icontains=query)
         )
-    paginator = Paginator(links, 20)
+    paginator = CountedPaginator(links, 20, counter=None if query else link_counter("xart"))
     page_number = request.GET.get("page")
     page_obj = paginator.get_page(page_number)
 
     for link in page_obj:
         link.is_liked = link.is_recommended
 
-    recent_recommended = Post.objects.filter(category='common').annotate(like_count=Count('likes')).filter(like_count__gt=0).order_by("-like_count", "-id")[:5]
-    target_categories = ['best', 'xart', 'movie', 'itnews', 'ground', 'stock']
-    recent_popular = LinkPost.objects.filter(category__in=target_categories, is_recommended=True).order_by("-created_at")[:5]
+    recent_recommended, recent_popular = _sidebar_blocks()
 
     return render(
         request,
@@ -849,6 +918,7 @@ def menu7_create_api(request):
     except json.JSONDecodeError:
         return JsonResponse({'error': 'Invalid JSON'}, status=400)
 
+@cache_anonymous_page(*SIDEBAR_BOARDS)
 def menu8(request):
     links = LinkPost.objects.filter(category='movie').order_by("-id")
     query = request.GET.get("q", "").strip()
@@ -858,16 +928,14 @@ def menu8(request):
             | Q(url__icontains=query)
             | Q(author__icontains=query)
         )
-    paginator = Paginator(links, 20)
+    paginator = CountedPaginator(links, 20, counter=None if query else link_counter("movie"))
     page_number = request.GET.get("page")
     page_obj = paginator.get_page(page_number)
 
     for link in page_obj:
         link.is_liked = link.is_recommended
 
-    recent_recommended = Post.objects.filter(category='common').annotate(like_count=Count('likes')).filter(like_count__gt=0).order_by("-like_count", "-id")[:5]
-    target_categories = ['best', 'xart', 'movie', 'itnews', 'ground', 'stock']
-    recent_popular = LinkPost.objects.filter(category__in=target_categories, is_recommended=True).order_by("-created_at")[:5]
+    recent_recommended, recent_popular = _sidebar_blocks()
 
     return render(
         request,
@@ -892,6 +960,7 @@ def menu8_create(request):
         form = LinkPostForm(initial={'category': 'movie'})
     return render(request, "board/link_form.html", {"form": form})
 
+@cache_anonymous_page(*SIDEBAR_BOARDS)
 def menu9(request):
     links = LinkPost.objects.filter(category='itnews').order_by("-id")
     query = request.GET.get("q", "").strip()
@@ -901,16 +970,14 @@ def menu9(request):
             | Q(url__icontains=query)
             | Q(author__icontains=query)
         )
-    paginator = Paginator(links, 20)
+    paginator = CountedPaginator(links, 20, counter=None if query else link_counter("itnews"))
     page_number = request.GET.get("page")
     page_obj = paginator.get_page(page_number)
 
     for link in page_obj:
         link.is_liked = link.is_recommended
 
-    recent_recommended = Post.objects.filter(category='common').annotate(like_count=Count('likes')).filter(like_count__gt=0).order_by("-like_count", "-id")[:5]
-    target_categories = ['best', 'xart', 'movie', 'itnews', 'ground', 'stock']
-    recent_popular = LinkPost.objects.filter(category__in=target_categories, is_recommended=True).order_by("-created_at")[:5]
+    recent_recommended, recent_popular = _sidebar_blocks()
 
     return render(
         request,
@@ -935,6 +1002,7 @@ def menu9_create(request):
         form = LinkPostForm(initial={'category': 'itnews'})
     return render(request, "board/link_form.html", {"form": form})
 
+@cache_anonymous_page(*SIDEBAR_BOARDS)
 def menu10(request):
     links = LinkPost.objects.filter(category='stock').order_by("-id")
     query = request.GET.get("q", "").strip()
@@ -944,16 +1012,14 @@ def menu10(request):
             | Q(url__icontains=query)
             | Q(author__icontains=query)
         )
-    paginator = Paginator(links, 20)
+    paginator = CountedPaginator(links, 20, counter=None if query else link_counter("stock"))
     page_number = request.GET.get("page")
     page_obj = paginator.get_page(page_number)
 
     for link in page_obj:
         link.is_liked = link.is_recommended
 
-    recent_recommended = Post.objects.filter(category='common').annotate(like_count=Count('likes')).filter(like_count__gt=0).order_by("-like_count", "-id")[:5]
-    target_categories = ['best', 'xart', 'movie', 'itnews', 'ground', 'stock']
-    recent_popular = LinkPost.objects.filter(category__in=target_categories, is_recommended=True).order_by("-created_at")[:5]
+    recent_recommended, recent_popular = _sidebar_blocks()
 
     return render(
         request,
@@ -978,6 +1044,7 @@ def menu10_create(request):
         form = LinkPostForm(initial={'category': 'stock'})
     return render(request, "board/link_form.html", {"form": form})
 
+@cache_anonymous_page(*SIDEBAR_BOARDS)
 def menu11(request):
     links = LinkPost.objects.filter(category='ground').order_by("-id")
     query = request.GET.get("q", "").strip()
@@ -987,16 +1054,14 @@ def menu11(request):
             | Q(url__icontains=query)
             | Q(author__icontains=query)
         )
-    paginator = Paginator(links, 20)
+    paginator = CountedPaginator(links, 20, counter=None if query else link_counter("ground"))
     page_number = request.GET.get("page")
     page_obj = paginator.get_page(page_number)
 
     for link in page_obj:
         link.is_liked = link.is_recommended
 
-    recent_recommended = Post.objects.filter(category='common').annotate(like_count=Count('likes')).filter(like_count__gt=0).order_by("-like_count", "-id")[:5]
-    target_categories = ['best', 'xart', 'movie', 'itnews', 'ground', 'stock']
-    recent_popular = LinkPost.objects.filter(category__in=target_categories, is_recommended=True).order_by("-created_at")[:5]
+    recent_recommended, recent_popular = _sidebar_blocks()
 
     return render(
         request,
@@ -1022,41 +1087,58 @@ def menu11_create(request):
     return render(request, "board/link_form.html", {"form": form})
 
 
-def signup(request):
+async def signup(request):
     if request.method == "POST":
         form = SignUpForm(request.POST)
-        if form.is_valid():
-            user = form.save()
-            if hasattr(user, "profile"):
-                user.profile.points += 10
-                user.profile.save()
-            login(request, user)
+        if await sync_to_async(form.is_valid)():
+            try:
+                password_hash = await amake_password(form.cleaned_data['password'])
+            except HashingBusy:
+                form.add_error(None, HASHING_BUSY_MESSAGE)
+                return await sync_to_async(render)(request, "board/signup.html", {"form": form}, status=503)
+            user = await sync_to_async(_create_member)(form, password_hash)
+            await alogin(request, user)
             return redirect("board:home")
     else:
         form = SignUpForm()
-    return render(request, "board/signup.html", {"form": form})
+    return await sync_to_async(render)(request, "board/signup.html", {"form": form})
 
 
-def login_view(request):
+def _create_member(form, password_hash):
+    with transaction.atomic():
+        user = form.save(password_hash=password_hash)
+        if hasattr(user, "profile"):
+            user.profile.points += 10
+            user.profile.save()
+    return user
+
+
+async def login_view(request):
     next_url = request.POST.get("next") or request.GET.get("next")
+    status = 200
     if request.method == "POST":
         form = LoginForm(request.POST)
         if form.is_valid():
             email = form.cleaned_data['email']
             password = form.cleaned_data['password']
-            user = authenticate(request, username=email, password=password)
-            if user is not None:
-                login(request, user)
-                if hasattr(user, 'profile') and user.profile.is_temporary_password:
-                    return redirect("board:password_change")
-                if next_url:
-                    return redirect(next_url)
-                return redirect("board:home")
+            try:
+                user = await aauthenticate_member(request, email, password)
+            except HashingBusy:
+                form.add_error(None, HASHING_BUSY_MESSAGE)
+                status = 503
             else:
-                form.add_error(None, "이메일 또는 비밀번호가 올바르지 않습니다.")
+                if user is not None:
+                    await alogin(request, user)
+                    if hasattr(user, 'profile') and user.profile.is_temporary_password:
+                        return redirect("board:password_change")
+                    if next_url:
+                        return redirect(next_url)
+                    return redirect("board:home")
+                else:
+                    form.add_error(None, "이메일 또는 비밀번호가 올바르지 않습니다.")
     else:
         form = LoginForm()
-    return render(request, "board/login.html", {"form": form, "next": next_url})
+    return await sync_to_async(render)(request, "board/login.html", {"form": form, "next": next_url}, status=status)
 
 
 def logout_view(request):
@@ -1064,44 +1146,63 @@ def logout_view(request):
     return redirect("board:home")
 
 
-def password_reset(request):
+async def password_reset(request):
     temp_password = None
+    status = 200
     if request.method == "POST":
         form = PasswordResetForm(request.POST)
         if form.is_valid():
             email = form.cleaned_data['email']
             nickname = form.cleaned_data['nickname']
-            try:
-                user = User.objects.get(username=email)
-                if user.profile.nickname == nickname:
-                    temp_password = get_random_string(10)
-                    user.set_password(temp_password)
-                    user.save(update_fields=["password"])
-                    user.profile.is_temporary_password = True
-                    user.profile.save()
-                else:
-                    form.add_error(None, "이메일 또는 닉네임이 일치하지 않습니다.")
-            except User.DoesNotExist:
+            user = await User.objects.select_related("profile").filter(
+                username=email, profile__nickname=nickname,
+            ).afirst()
+            if user is None:
                 form.add_error(None, "이메일 또는 닉네임이 일치하지 않습니다.")
+            else:
+                candidate = get_random_string(10)
+                try:
+                    password_hash = await amake_password(candidate)
+                except HashingBusy:
+                    form.add_error(None, HASHING_BUSY_MESSAGE)
+                    status = 503
+                else:
+                    await sync_to_async(_store_password)(user, password_hash, is_temporary=True)
+                    temp_password = candidate
     else:
         form = PasswordResetForm()
-    return render(request, "board/password_reset.html", {"form": form, "temp_password": temp_password})
+    return await sync_to_async(render)(
+        request, "board/password_reset.html", {"form": form, "temp_password": temp_password}, status=status,
+    )
 
 
 @login_required
-def password_change(request):
+async def password_change(request):
+    status = 200
     if request.method == "POST":
         form = PasswordChangeForm(request.POST)
         if form.is_valid():
-            request.user.set_password(form.cleaned_data['new_password'])
-            request.user.save(update_fields=["password"])
-            request.user.profile.is_temporary_password = False
-            request.user.profile.save()
-            login(request, request.user)  # 비밀번호 변경 후 세션 유지
-            return redirect("board:profile")
+            user = await request.auser()
+            try:
+                password_hash = await amake_password(form.cleaned_data['new_password'])
+            except HashingBusy:
+                form.add_error(None, HASHING_BUSY_MESSAGE)
+                status = 503
+            else:
+                await sync_to_async(_store_password)(user, password_hash, is_temporary=False)
+                await alogin(request, user)  # 비밀번호 변경 후 세션 유지
+                return redirect("board:profile")
     else:
         form = PasswordChangeForm()
-    return render(request, "board/password_change.html", {"form": form})
+    return await sync_to_async(render)(request, "board/password_change.html", {"form": form}, status=status)
+
+
+def _store_password(user, password_hash, is_temporary):
+    with transaction.atomic():
+        user.password = password_hash
+        user.save(update_fields=["password"])
+        user.profile.is_temporary_password = is_temporary
+        user.profile.save()
 
 
 @login_required
@@ -1120,63 +1221,70 @@ def profile(request):
         },
     )
 
-def match_list(request):
-    match_years = [2027, 2026]
-    match_leagues = [
-        {"label": "프리미어리그", "value": "프리미어리그"},
-        {"label": "라리가", "value": "라리가"},
-        {"label": "분데스리가", "value": "분데스리가"},
-        {"label": "대표팀", "value": "대표"},
-    ]
-    league_values = [league["value"] for league in match_leagues]
-    selected_year = request.GET.get("year")
-    try:
-        selected_year = int(selected_year)
-    except (TypeError, ValueError):
-        selected_year = match_years[0]
-    if selected_year not in match_years:
-        selected_year = match_years[0]
+MATCH_TABS = ["schedule", "results", "standings"]
 
-    selected_league = request.GET.get("league")
-    if selected_league not in league_values:
-        selected_league = league_values[0]
 
-    scheduled_matches = SoccerMatch.objects.filter(
-        Q(score__isnull=True) | Q(score=''),
-        league=selected_league,
-        year=selected_year,
-    ).order_by('match_id')
-    result_matches = (
-        SoccerMatch.objects.filter(
+def _match_filters(request):
+    # 리그/연도 목록은 MatchFacet 캐시에서 만든다. 반환값은 facet_filters 참고.
+    try:
+        selected_year = int(request.GET.get("year"))
+    except (TypeError, ValueError):
+        selected_year = None
+    return facet_filters(match_facets(), selected_year, request.GET.get("league"))
+
+
+def _match_tab_context(request, tab, selected_year, selected_league, facet=None):
+    # 페이지네이션은 (league, year, status) 인덱스 범위의 실제 COUNT 를 쓴다. facet 과 다르면 check_facet_count 가 다시 센다.
+    if tab == "standings":
+        return {"standings": league_table(selected_league, selected_year)}
+    matches = SoccerMatch.objects.annotate(is_favorite=_IS_FAVORITE)
+    # 두 탭 모두 (league, year, status, match_date) 인덱스를 순서대로 읽는다.
+    if tab == "schedule":
+        matches = matches.filter(
             league=selected_league,
             year=selected_year,
-        )
-        .exclude(score__isnull=True)
-        .exclude(score='')
-        .order_by('-match_id')
-    )
-    schedule_paginator = Paginator(scheduled_matches, 20)
-    result_paginator = Paginator(result_matches, 20)
-    schedule_page_obj = schedule_paginator.get_page(request.GET.get("schedule_page"))
-    result_page_obj = result_paginator.get_page(request.GET.get("result_page"))
-    active_tab = request.GET.get("tab")
-    if active_tab not in ["schedule", "results"]:
-        active_tab = "schedule"
-    recent_liked_matches = SoccerMatch.objects.filter(is_recommended=True).order_by("match_date", "id")[:TOP_MATCH_LIST_LIMIT]
-    pending_bet_matches = (
+            status=SoccerMatch.STATUS_SCHEDULED,
+        ).order_by('match_date', 'id')
+        paginator = Paginator(matches, 20)
+        page_obj = paginator.get_page(request.GET.get("schedule_page"))
+        check_facet_count(facet, False, paginator.count)
+        page_obj.object_list = attach_probabilities(list(page_obj.object_list), league_ratings(selected_league))
+        return {"schedule_page_obj": page_obj}
+
+    matches = matches.filter(
+        league=selected_league,
+        year=selected_year,
+        status=SoccerMatch.STATUS_FINISHED,
+    ).order_by('-match_date', '-id')
+    paginator = Paginator(matches, 20)
+    page_obj = paginator.get_page(request.GET.get("result_page"))
+    check_facet_count(facet, True, paginator.count)
+    return {"result_page_obj": page_obj}
+
+
+def _pending_bet_matches():
+    return (
         SoccerMatch.objects.filter(
-            Q(score__isnull=True) | Q(score=''),
+            status=SoccerMatch.STATUS_SCHEDULED,
             bet__isnull=False,
             result__isnull=True,
         )
         .order_by("match_date", "id")[:TOP_MATCH_LIST_LIMIT]
     )
+
+
+def match_list(request):
+    # 보이는 탭(경기 일정/결과 중 active_tab, 즐겨찾기)만 그리고, 숨은 탭은 match_fragment 로 눌렀을 때 읽는다.
+    selected_year, selected_league, match_years, match_leagues, facet = _match_filters(request)
+    active_tab = request.GET.get("tab")
+    if active_tab not in MATCH_TABS:
+        active_tab = "schedule"
+    recent_liked_matches = (
+        SoccerMatch.objects.filter(favorite_slot__isnull=False).order_by("match_date", "id")[:TOP_MATCH_LIST_LIMIT]
+    )
     match_bet_accuracy_stats = _match_bet_accuracy_stats()
     context = {
-        'schedule_page_obj': schedule_page_obj,
-        'result_page_obj': result_page_obj,
         'recent_liked_matches': recent_liked_matches,
-        'pending_bet_matches': pending_bet_matches,
         'can_set_match_bet': _can_set_match_bet(request.user),
         'match_bet_count': match_bet_accuracy_stats['completed_bet_count'],
         'match_bet_accuracy': match_bet_accuracy_stats['accuracy'],
@@ -1186,4 +1294,163 @@ def match_list(request):
         'match_leagues': match_leagues,
         'selected_league': selected_league,
     }
+    context.update(_match_tab_context(request, active_tab, selected_year, selected_league, facet))
     return render(request, 'board/match_list.html', context)
+
+
+MATCH_FRAGMENT_TEMPLATES = {
+    "schedule": "board/includes/match_schedule_tab.html",
+    "results": "board/includes/match_results_tab.html",
+    "standings": "board/includes/match_standings_tab.html",
+    "bets": "board/includes/match_bet_block.html",
+}
+
+
+@cache_anonymous_page(BOARD_MATCH)
+def match_fragment(request, fragment):
+    template_name = MATCH_FRAGMENT_TEMPLATES.get(fragment)
+    if template_name is None:
+        raise Http404
+    if fragment == "bets":
+        return render(request, template_name, {"pending_bet_matches": _pending_bet_matches()})
+
+    selected_year, selected_league, _, _, facet = _match_filters(request)
+    context = {
+        'can_set_match_bet': _can_set_match_bet(request.user),
+        'selected_year': selected_year,
+        'selected_league': selected_league,
+    }
+    context.update(_match_tab_context(request, fragment, selected_year, selected_league, facet))
+    return render(request, template_name, context)
+
+
+TEAM_MATCHES_PER_PAGE = 20
+HEAD_TO_HEAD_LIMIT = 50
+
+
+def _team_page(request, team):
+    return Paginator(team_matches(team), TEAM_MATCHES_PER_PAGE).get_page(request.GET.get("page"))
+
+
+def _head_to_head(team_id, opponent_id):
+    team = get_object_or_404(Team, id=team_id)
+    opponent = get_object_or_404(Team, id=opponent_id)
+    # 목록은 최근 HEAD_TO_HEAD_LIMIT 경기만 보여 주고, 전적은 두 팀의 모든 경기를 집계한다.
+    matches = list(head_to_head_matches(team, opponent)[:HEAD_TO_HEAD_LIMIT])
+    return team, opponent, matches, head_to_head_summary(team, opponent)
+
+
+@cache_anonymous_page(BOARD_MATCH)
+def team_detail(request, team_id):
+    team = get_object_or_404(Team, id=team_id)
+    return render(request, 'board/team_matches.html', {
+        'team': team,
+        'aliases': team.aliases.order_by('name').values_list('name', flat=True),
+        'page_obj': _team_page(request, team),
+    })
+
+
+@cache_anonymous_page(BOARD_MATCH)
+def team_detail_json(request, team_id):
+    team = get_object_or_404(Team, id=team_id)
+    page_obj = _team_page(request, team)
+    return JsonResponse({
+        'team': team_payload(team),
+        'matches': [match_payload(match) for match in page_obj],
+        'page': page_obj.number,
+        'num_pages': page_obj.paginator.num_pages,
+        'has_next': page_obj.has_next(),
+    })
+
+
+@cache_anonymous_page(BOARD_MATCH)
+def head_to_head(request, team_id, opponent_id):
+    team, opponent, matches, summary = _head_to_head(team_id, opponent_id)
+    return render(request, 'board/team_matches.html', {
+        'team': team,
+        'opponent': opponent,
+        'summary': summary,
+        'page_obj': matches,
+        'match_limit': HEAD_TO_HEAD_LIMIT,
+    })
+
+
+@cache_anonymous_page(BOARD_MATCH)
+def head_to_head_json(request, team_id, opponent_id):
+    team, opponent, matches, summary = _head_to_head(team_id, opponent_id)
+    return JsonResponse({
+        'team': team_payload(team),
+        'opponent': team_payload(opponent),
+        'summary': summary,
+        'matches': [match_payload(match) for match in matches],
+        'match_limit': HEAD_TO_HEAD_LIMIT,
+    })
+
+
+async def board_events(request, stream):
+    channel = EVENT_STREAMS.get(stream)
+    if channel is None:
+        raise Http404
+    if not isinstance(request, ASGIRequest):
+        # WSGI 에서는 연결 하나가 워커 스레드 하나를 계속 붙잡는다. 204 는 EventSource 의 재연결도 멈춘다.
+        return HttpResponse(status=204)
+
+    last_event_id = parse_last_event_id(
+        request.headers.get("Last-Event-ID") or request.GET.get("last_event_id")
+    )
+    broker = get_broker()
+    subscription = broker.subscribe(channel, last_event_id)
+    if subscription is None:
+        return HttpResponse(status=503, headers={"Retry-After": "30"})
+
+    response = StreamingHttpResponse(event_stream(broker, subscription), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
+def metrics(request):
+    token = getattr(settings, "BOARD_METRICS_TOKEN", "")
+    authorized = request.user.is_staff or (
+        token and request.headers.get("Authorization") == f"Bearer {token}"
+    )
+    if not authorized:
+        return HttpResponse(status=403)
+    return HttpResponse(
+        metrics_registry.render(),
+        content_type="text/plain; version=0.0.4; charset=utf-8",
+    )
+
+
+async def export_table(request, table):
+    # 관리자 전용 덤프. 행을 batch 단위로 읽어 바로 흘려보내므로 테이블이 커져도 메모리는 그대로다.
+    # async 이터레이터라 ASGI 에서는 batch 마다 바로 나가고, 덤프하는 동안 워커 스레드를 붙잡지 않는다.
+    user = await request.auser()
+    if not user.is_staff:
+        return HttpResponse(status=403)
+    model = EXPORT_TABLES.get(table)
+    if model is None:
+        raise Http404
+    export_format = request.GET.get("format", "jsonl")
+    compress = request.GET.get("gzip") == "1"
+    try:
+        since_id = int(request.GET["since_id"]) if request.GET.get("since_id") else None
+        since = parse_since(request.GET["since"]) if request.GET.get("since") else None
+    except ValueError:
+        return HttpResponse("since_id/since 값을 읽을 수 없습니다.", status=400)
+    if export_format not in EXPORT_FORMATS:
+        return HttpResponse("format 은 jsonl 또는 csv 입니다.", status=400)
+
+    if isinstance(request, ASGIRequest):
+        chunks = aexport_stream(model, aexport_batches(model, since_id, since), export_format, compress)
+    else:
+        # WSGI 는 async 이터레이터를 끝까지 모은 뒤에 보내므로 워커 스레드에서 도는 동기 스트림을 쓴다.
+        chunks = export_stream(model, export_rows(model, since_id, since), export_format, compress)
+    response = StreamingHttpResponse(
+        chunks,
+        content_type="application/gzip" if compress else f"{EXPORT_FORMATS[export_format]}; charset=utf-8",
+    )
+    response["Content-Disposition"] = f'attachment; filename="{export_filename(table, export_format, compress)}"'
+    response["Cache-Control"] = "no-store"
+    response["X-Accel-Buffering"] = "no"
+    return response